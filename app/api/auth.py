@@ -1,16 +1,22 @@
 import reflex as rx
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import APIKeyHeader
 import jwt
 from datetime import datetime, timedelta, timezone
 import os
 import logging
+from typing import Optional
 from app.utils import supabase_client
+from app.utils.encryption import hash_api_key
+from app.utils.rate_limiter import api_rate_limiter, plan_limits, rate_limit_headers
+from app.utils.single_flight import single_flight
+from app.utils.ttl_cache import api_key_cache
 
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
 SECRET_KEY = os.getenv("ENCRYPTION_SECRET", "default-secret-for-dev")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+API_KEY_PREFIX = "apk"
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -24,21 +30,93 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
-async def get_current_org_from_api_key(api_key: str = Depends(API_KEY_HEADER)) -> str:
+def _is_expired(record: dict) -> bool:
+    expires_at = record.get("expires_at")
+    if not expires_at:
+        return False
+    return datetime.fromisoformat(expires_at) <= datetime.now(timezone.utc)
+
+
+async def authenticate_api_key(api_key: str) -> Optional[dict]:
+    """The api_keys record for a valid key, or None.
+
+    Verified keys are cached by hash for a few minutes and unknown keys for
+    a few seconds, so steady-state requests make no database call.
+    revoke_api_key drops a key from the cache immediately.
+    """
+    if not api_key or not api_key.startswith(f"{API_KEY_PREFIX}_"):
+        return None
+    key_hash = hash_api_key(api_key)
+    record = api_key_cache.get("api_key", key_hash)
+    if record is None:
+        if api_key_cache.get("api_key_invalid", key_hash):
+            return None
+        record = await single_flight.do(
+            "api_key",
+            key_hash,
+            lambda: supabase_client.get_api_key_record(api_key, key_hash),
+        )
+        if record is None:
+            api_key_cache.set("api_key_invalid", key_hash, True)
+            return None
+        api_key_cache.set("api_key", key_hash, record)
+    if _is_expired(record):
+        api_key_cache.invalidate("api_key", key_hash)
+        return None
+    return record
+
+
+async def get_current_api_key(api_key: str = Depends(API_KEY_HEADER)) -> dict:
     if not api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing API Key"
         )
     try:
-        org_id = await supabase_client.get_org_id_from_api_key(api_key)
-        if not org_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API Key"
-            )
-        return org_id
+        record = await authenticate_api_key(api_key)
     except Exception as e:
         logging.exception(f"API Key validation error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during authentication",
-        )
\ No newline at end of file
+        )
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API Key"
+        )
+    return record
+
+
+async def _plan_for_org(organization_id: str) -> Optional[str]:
+    organization = await supabase_client.get_organization_details(organization_id)
+    return (organization or {}).get("subscription_tier")
+
+
+async def get_rate_limited_api_key(
+    request: Request, api_key_record: dict = Depends(get_current_api_key)
+) -> dict:
+    """The caller's api_keys record, once the request fits the key's rate limits.
+
+    Limits come from the organization's plan tier, with the key's own
+    rate_limit as the hourly figure when set. The record and the decision
+    are left on request.state for usage metering and response headers.
+    """
+    plan = await _plan_for_org(api_key_record["organization_id"])
+    decision = await api_rate_limiter.hit_async(
+        str(api_key_record["id"]),
+        plan_limits(plan, api_key_record.get("rate_limit")),
+    )
+    request.state.api_key_record = api_key_record
+    request.state.rate_limit = decision
+    if not decision["allowed"]:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers=rate_limit_headers(decision),
+        )
+    return api_key_record
+
+
+async def get_current_org_from_api_key(
+    api_key_record: dict = Depends(get_rate_limited_api_key),
+) -> str:
+    return api_key_record["organization_id"]
@@ -1,46 +1,190 @@
-import reflex as rx
-from fastapi import Depends, HTTPException
-from typing import Optional
+import base64
+import binascii
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel
 from app.api.auth import get_current_org_from_api_key
 from app.utils import supabase_client
+from app.services.kev_catalog import kev_catalog
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+SEVERITIES = {"CRITICAL", "HIGH", "MEDIUM", "LOW", "NONE"}
+MAX_BATCH_CVES = 10000
+CVE_ID_PATTERN = re.compile(r"^CVE-\d{4}-\d{4,}$")
 
-@rx.page(route="/api/v1/health")
+router = APIRouter(prefix="/api/v1")
+
+
+def encode_cursor(row: dict) -> str:
+    """Opaque cursor pointing just past row in risk-score order."""
+    raw = json.dumps([row["sort_score"], row["cve_id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, cve_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), str(cve_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _public_row(row: dict) -> dict:
+    return {k: v for k, v in row.items() if k != "sort_score"}
+
+
+def etag_response(request: Request, payload: Any) -> Response:
+    """JSON response with a strong ETag; 304 when the client already has this body."""
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/health")
 def health_check():
     """API Health Check Endpoint."""
-    return {"status": "ok", "timestamp": "2024-07-29T12:00:00Z"}
+    return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
 
 
-@rx.page(route="/api/v1/vulnerabilities")
+@router.get("/vulnerabilities")
 async def list_vulnerabilities(
+    request: Request,
     organization_id: str = Depends(get_current_org_from_api_key),
     severity: Optional[str] = None,
     is_kev: Optional[bool] = None,
-    limit: int = 100,
-    offset: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
 ):
-    """List vulnerabilities for the organization."""
-    return {
-        "data": [
-            {
-                "cve_id": "CVE-2024-1234",
-                "severity": "CRITICAL",
-                "universal_risk_score": 95.5,
-            }
-        ],
-        "total": 1,
-        "limit": limit,
-        "offset": offset,
-    }
+    """List the organization's vulnerabilities, highest risk first.
 
+    Pages are keyset-paginated: pass next_cursor from one response as cursor
+    to get the next page. next_cursor is null on the last page.
+    """
+    if severity is not None:
+        severity = severity.upper()
+        if severity not in SEVERITIES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"severity must be one of {sorted(SEVERITIES)}",
+            )
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = await supabase_client.list_api_vulnerabilities(
+        organization_id,
+        severity=severity,
+        is_kev=is_kev,
+        cursor=decode_cursor(cursor) if cursor else None,
+        limit=limit + 1,
+    )
+    if rows is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Vulnerability store unavailable",
+        )
+    page = rows[:limit]
+    return etag_response(
+        request,
+        {
+            "data": [_public_row(row) for row in page],
+            "limit": limit,
+            "next_cursor": encode_cursor(page[-1]) if len(rows) > limit else None,
+        },
+    )
 
-@rx.page(route="/api/v1/vulnerabilities/{cve_id}")
+
+@router.get("/vulnerabilities/{cve_id}")
 async def get_vulnerability(
-    cve_id: str, organization_id: str = Depends(get_current_org_from_api_key)
+    request: Request,
+    cve_id: str,
+    organization_id: str = Depends(get_current_org_from_api_key),
 ):
     """Get details for a single CVE."""
+    rows = await supabase_client.list_api_vulnerabilities(
+        organization_id, cve_id=cve_id.upper(), limit=1
+    )
+    if rows is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Vulnerability store unavailable",
+        )
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CVE not found")
+    return etag_response(request, _public_row(rows[0]))
+
+
+class BatchLookupRequest(BaseModel):
+    cve_ids: list[str]
+
+
+def _apply_kev(result: dict, kev_entry: Optional[dict]):
+    if kev_entry:
+        result["is_kev"] = True
+        result["kev_date_added"] = kev_entry.get("date_added")
+        result["kev_due_date"] = kev_entry.get("due_date")
+    else:
+        result["is_kev"] = bool(result.get("is_kev"))
+
+
+@router.post("/vulnerabilities:batch")
+async def batch_lookup_vulnerabilities(
+    body: BatchLookupRequest,
+    organization_id: str = Depends(get_current_org_from_api_key),
+):
+    """Scores, CVSS/EPSS/KEV data and inference results for up to 10,000 CVEs.
+
+    Stored data comes back from concurrent database calls of up to 1,000
+    CVEs each; KEV status comes from the shared KEV catalog, refetched when
+    it has expired. If the catalog cannot be loaded, kev_available is false
+    and only stored KEV flags are returned. CVEs no store knows are listed
+    in not_found and malformed IDs in invalid.
+    """
+    if len(body.cve_ids) > MAX_BATCH_CVES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BATCH_CVES} CVE IDs per request",
+        )
+    cve_ids: dict[str, None] = {}
+    invalid = []
+    for raw in body.cve_ids:
+        cve_id = raw.strip().upper()
+        if CVE_ID_PATTERN.match(cve_id):
+            cve_ids[cve_id] = None
+        else:
+            invalid.append(raw)
+    rows = (
+        await supabase_client.get_api_vulnerabilities_batch(organization_id, list(cve_ids))
+        if cve_ids
+        else []
+    )
+    if rows is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Vulnerability store unavailable",
+        )
+    catalog = await kev_catalog.get()
+    found = {row["cve_id"]: row for row in rows}
+    data, not_found = [], []
+    for cve_id in cve_ids:
+        row = found.get(cve_id)
+        kev_entry = catalog.get(cve_id) if catalog else None
+        if row is None and kev_entry is None:
+            not_found.append(cve_id)
+            continue
+        result = dict(row) if row else {"cve_id": cve_id, "tracked": False}
+        _apply_kev(result, kev_entry)
+        data.append(result)
     return {
-        "cve_id": cve_id,
-        "universal_risk_score": 95.5,
-        "scores": {"cvss": 9.8, "epss": 0.95, "is_kev": True},
-    }
\ No newline at end of file
+        "data": data,
+        "not_found": not_found,
+        "invalid": invalid,
+        "kev_available": catalog is not None,
+    }
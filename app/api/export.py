@@ -0,0 +1,130 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.api.auth import get_current_org_from_api_key
+from app.utils import supabase_client
+
+# PostgREST caps every response at max-rows (1000 on Supabase by default),
+# so a larger batch would come back short.
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    "cve_id",
+    "last_updated",
+    "severity",
+    "universal_risk_score",
+    "cvss_v3_score",
+    "cvss_v3_vector",
+    "epss_score",
+    "epss_percentile",
+    "is_kev",
+    "kev_date_added",
+    "kev_due_date",
+    "ssvc_decision",
+    "lev_score",
+    "recommended_action",
+    "predicted_severity",
+    "exploitation_likelihood",
+    "risk_category",
+    "inference_confidence",
+]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+router = APIRouter(prefix="/api/v1")
+
+
+async def iter_finding_batches(
+    org_id: str, since: Optional[str], batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[list[dict]]:
+    """Yield an organization's findings batch by batch in change order.
+
+    The next batch is fetched while the current one is being sent, and at
+    most those two are held in memory whatever the size of the export. Only
+    an empty batch ends the export, so a short page from a server row cap
+    cannot truncate it.
+    """
+    cursor = None
+    pending = asyncio.ensure_future(
+        supabase_client.export_findings_batch(org_id, since, cursor, batch_size)
+    )
+    try:
+        while True:
+            batch = await pending
+            if not batch:
+                return
+            cursor = (batch[-1]["last_updated"], batch[-1]["cve_id"])
+            pending = asyncio.ensure_future(
+                supabase_client.export_findings_batch(org_id, since, cursor, batch_size)
+            )
+            yield batch
+    finally:
+        if not pending.done():
+            pending.cancel()
+
+
+def format_ndjson(batch: list[dict]) -> str:
+    return "".join(json.dumps(row, separators=(",", ":"), default=str) + "\n" for row in batch)
+
+
+def format_csv(batch: list[dict], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(batch)
+    return buffer.getvalue()
+
+
+async def stream_export(org_id: str, since: Optional[str], export_format: str) -> AsyncIterator[str]:
+    started = time.monotonic()
+    rows = 0
+    if export_format == "csv":
+        yield format_csv([], header=True)
+    try:
+        async for batch in iter_finding_batches(org_id, since):
+            rows += len(batch)
+            yield format_ndjson(batch) if export_format == "ndjson" else format_csv(batch)
+    except Exception as e:
+        # Headers are already sent, so the only signal left is a truncated body.
+        logging.exception(f"Findings export for org {org_id} failed after {rows} rows: {e}")
+        raise
+    seconds = time.monotonic() - started
+    logging.info(
+        f"Exported {rows} findings for org {org_id} as {export_format} in {seconds:.1f}s ({rows / seconds if seconds else 0:.0f} rows/s)"
+    )
+
+
+@router.get("/export/findings")
+async def export_findings(
+    organization_id: str = Depends(get_current_org_from_api_key),
+    format: str = "ndjson",
+    since: Optional[datetime] = None,
+):
+    """Stream every finding for the organization as NDJSON or CSV.
+
+    Rows come in last_updated order. For incremental pulls, pass the
+    largest last_updated already received as since; it is inclusive, so
+    rows at exactly that time are sent again and should be de-duplicated
+    on cve_id.
+    """
+    export_format = format.lower()
+    if export_format not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of {sorted(MEDIA_TYPES)}",
+        )
+    since_value = since.isoformat() if since else None
+    return StreamingResponse(
+        stream_export(organization_id, since_value, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="findings.{export_format}"',
+            "Cache-Control": "no-store",
+        },
+    )
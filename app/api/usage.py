@@ -0,0 +1,37 @@
+import logging
+import time
+from fastapi import Request
+from app.utils.rate_limiter import rate_limit_headers
+from app.utils.supabase_client import usage_meter
+
+
+async def meter_api_usage(request: Request, call_next):
+    """Meter each API-key request and add X-RateLimit-* headers to its response.
+
+    Requests are metered by route template, so /vulnerabilities/{cve_id}
+    is one endpoint however many CVEs are looked up. Latency is time to
+    response headers; a streamed export's body is not included. Requests
+    that never authenticated are not metered.
+    """
+    started = time.perf_counter()
+    response = await call_next(request)
+    api_key_record = getattr(request.state, "api_key_record", None)
+    if api_key_record is None:
+        return response
+    decision = getattr(request.state, "rate_limit", None)
+    if decision is not None:
+        for header, value in rate_limit_headers(decision).items():
+            response.headers.setdefault(header, value)
+    route = request.scope.get("route")
+    try:
+        usage_meter.record(
+            api_key_record["organization_id"],
+            api_key_record.get("id"),
+            getattr(route, "path", request.url.path),
+            request.method,
+            response.status_code,
+            round((time.perf_counter() - started) * 1000),
+        )
+    except Exception as e:
+        logging.exception(f"Failed to meter API request to {request.url.path}: {e}")
+    return response
@@ -0,0 +1,114 @@
+"""Load test for the public vulnerabilities API.
+
+    python -m app.api.vulnerabilities_load --base-url http://localhost:8000 --api-key apk_...
+
+Runs a mix of first pages, cursor walks, filtered pages and ETag
+revalidations with the given concurrency, prints latency percentiles, and
+exits non-zero if p99 is above the target or any request failed.
+
+The public API rate-limits each key per minute and per hour, and the
+default run is sized to fit inside one minute of the enterprise plan
+(3,000/min), far above free (60/min) or pro (600/min). Use a key of an
+enterprise organization; an api_keys.rate_limit override raises only the
+hourly limit, so larger --requests values must also fit the plan's
+minute limit. Rate-limited (429) responses are left out of the latency
+samples and fail the run, since they measure the limiter rather than
+the endpoint.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+P99_TARGET_MS = 250.0
+FILTERS = [{}, {"severity": "CRITICAL"}, {"severity": "HIGH"}, {"is_kev": "true"}]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    requests: int,
+    latencies: list[float],
+    statuses: Counter,
+    etags: dict[str, str],
+):
+    cursor = None
+    for _ in range(requests):
+        params = dict(random.choice(FILTERS), limit="100")
+        if cursor and random.random() < 0.7:
+            params["cursor"] = cursor
+        cache_key = str(sorted(params.items()))
+        headers = {}
+        if cache_key in etags and random.random() < 0.3:
+            headers["If-None-Match"] = etags[cache_key]
+        started = time.perf_counter()
+        response = await client.get("/api/v1/vulnerabilities", params=params, headers=headers)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        statuses[response.status_code] += 1
+        if response.status_code == 429:
+            continue
+        latencies.append(elapsed_ms)
+        if response.status_code == 200:
+            etags[cache_key] = response.headers.get("etag", "")
+            cursor = response.json().get("next_cursor")
+
+
+async def run(args) -> int:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    etags: dict[str, str] = {}
+    per_worker = max(1, args.requests // args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers={"X-API-Key": args.api_key, "Accept-Encoding": "gzip"},
+        timeout=30,
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                worker(client, per_worker, latencies, statuses, etags)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+    p99 = percentile(latencies, 99)
+    total = sum(statuses.values())
+    print(f"requests: {total} in {elapsed:.1f}s ({total / elapsed:.0f} req/s), {len(latencies)} timed")
+    print(f"statuses: {dict(statuses)}")
+    if statuses[429]:
+        print(
+            f"{statuses[429]} requests were rate limited; use an enterprise or override key "
+            "whose limits cover this run."
+        )
+    print(
+        f"latency ms: p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+        f"p99={p99:.1f} max={max(latencies, default=0):.1f} (target p99 <= {args.p99_target_ms:.0f})"
+    )
+    failed = sum(n for code, n in statuses.items() if code >= 500 or code == 429)
+    return 0 if latencies and p99 <= args.p99_target_ms and not failed else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--api-key", required=True)
+    parser.add_argument("--requests", type=int, default=2500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--p99-target-ms", type=float, default=P99_TARGET_MS)
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
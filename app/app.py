@@ -138,7 +138,21 @@ def recommendations() -> rx.Component:
     return create_page(recommendations_page())
 
 
+from app.utils.state_metrics import StateDeltaMiddleware
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from app.api.endpoints import router as public_api_router
+from app.api.export import router as export_api_router
+from app.api.usage import meter_api_usage
+
+public_api = FastAPI(title="Aperture Public API")
+public_api.add_middleware(GZipMiddleware, minimum_size=1024)
+public_api.middleware("http")(meter_api_usage)
+public_api.include_router(public_api_router)
+public_api.include_router(export_api_router)
+
 app = rx.App(
+    api_transformer=public_api,
     theme=rx.theme(appearance="light"),
     head_components=[
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
@@ -149,6 +163,7 @@ app = rx.App(
         ),
     ],
 )
+app.add_middleware(StateDeltaMiddleware())
 app.add_page(index, route="/")
 app.add_page(analytics_page_route, route="/analytics")
 app.add_page(settings, route="/settings")
@@ -212,6 +227,18 @@ from app.utils.exploit_intelligence_migration import (
     get_exploit_intelligence_migration_script,
 )
 from app.utils.validation_migration import get_validation_migration_script
+from app.utils.backlog_migration import get_backlog_migration_script
+from app.utils.scoring_components_migration import (
+    get_scoring_components_migration_script,
+)
+from app.utils.framework_store_migration import get_framework_store_migration_script
+from app.utils.lev_migration import get_lev_migration_script
+from app.utils.admin_metrics_migration import get_admin_metrics_migration_script
+from app.utils.log_partitioning_migration import get_log_partitioning_migration_script
+from app.utils.credit_ledger_migration import get_credit_ledger_migration_script
+from app.utils.api_key_hashing_migration import get_api_key_hashing_migration_script
+from app.utils.api_findings_migration import get_api_findings_migration_script
+from app.utils.api_metering_migration import get_api_metering_migration_script
 
 
 async def on_app_startup():
@@ -221,5 +248,15 @@ async def on_app_startup():
     await temp_state.fetch_kev_catalog()
 
 
+def on_app_shutdown():
+    """Stops the scheduler, writes metered usage and buffered telemetry and settles local credit blocks."""
+    from app.utils.supabase_client import credit_ledger, telemetry_writer, usage_meter
+
+    shutdown_scheduler()
+    usage_meter.close()
+    telemetry_writer.close()
+    credit_ledger.close()
+
+
 app.on_startup = on_app_startup
-app.on_shutdown = shutdown_scheduler
\ No newline at end of file
+app.on_shutdown = on_app_shutdown
\ No newline at end of file
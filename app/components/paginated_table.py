@@ -0,0 +1,57 @@
+import reflex as rx
+from app.states.pagination import PAGE_SIZE_OPTIONS
+
+
+def virtualized_table(
+    header: rx.Component, body: rx.Component, max_height: str = "70vh"
+) -> rx.Component:
+    """A fixed-height scroll container with a sticky header for one page of rows."""
+    return rx.el.div(
+        rx.el.table(
+            rx.el.thead(header, class_name="sticky top-0 bg-white z-10 shadow-sm"),
+            body,
+            class_name="w-full",
+        ),
+        class_name="overflow-auto rounded-lg border border-gray-200 bg-white",
+        style={"maxHeight": max_height},
+    )
+
+
+def _page_button(icon: str, on_click, disabled: rx.Var[bool]) -> rx.Component:
+    return rx.el.button(
+        rx.icon(icon, class_name="h-4 w-4"),
+        on_click=on_click,
+        disabled=disabled,
+        class_name="p-1.5 rounded-md border border-gray-200 hover:bg-gray-100 disabled:opacity-40 disabled:cursor-not-allowed",
+    )
+
+
+def pagination_controls(state) -> rx.Component:
+    """Cursor controls for a state using PaginationMixin."""
+    return rx.el.div(
+        rx.el.p(state.page_range_label, class_name="text-sm text-gray-600"),
+        rx.el.div(
+            rx.el.select(
+                *[
+                    rx.el.option(f"{size} / page", value=size)
+                    for size in PAGE_SIZE_OPTIONS
+                ],
+                value=state.page_size.to_string(),
+                on_change=state.set_page_size,
+                class_name="text-sm border border-gray-200 rounded-md px-2 py-1",
+            ),
+            _page_button("chevrons-left", state.first_page, ~state.has_prev_page),
+            _page_button("chevron-left", state.prev_page, ~state.has_prev_page),
+            rx.el.span(
+                "Page "
+                + state.page_number.to_string()
+                + " of "
+                + state.page_count.to_string(),
+                class_name="text-sm text-gray-600 px-2",
+            ),
+            _page_button("chevron-right", state.next_page, ~state.has_next_page),
+            _page_button("chevrons-right", state.last_page, ~state.has_next_page),
+            class_name="flex items-center gap-2",
+        ),
+        class_name="flex items-center justify-between mt-3",
+    )
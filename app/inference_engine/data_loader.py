@@ -1,12 +1,17 @@
 import httpx
 import asyncio
 from app.inference_engine import config, utils
+from app.utils.single_flight import single_flight
 
 logger = utils.setup_logger(__name__)
 
 
 async def fetch_nvd_data(cve_id: str) -> dict:
-    """Fetch raw CVE data from the NVD API."""
+    """Fetch raw CVE data from the NVD API, sharing in-flight requests per CVE."""
+    return await single_flight.do("nvd", cve_id, lambda: _request_nvd_data(cve_id))
+
+
+async def _request_nvd_data(cve_id: str) -> dict:
     if not config.NVD_API_KEY:
         logger.warning("NVD_API_KEY not set. NVD fetch will be limited.")
     headers = {"apiKey": config.NVD_API_KEY} if config.NVD_API_KEY else {}
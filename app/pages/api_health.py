@@ -71,6 +71,319 @@ def log_row(log: dict) -> rx.Component:
     )
 
 
+def cache_metric_row(metric: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(metric["name"], class_name="px-4 py-2 font-medium"),
+        rx.el.td(metric["size"], class_name="px-4 py-2"),
+        rx.el.td(metric["hits"], class_name="px-4 py-2"),
+        rx.el.td(metric["misses"], class_name="px-4 py-2"),
+        rx.el.td(metric["evictions"], class_name="px-4 py-2"),
+        rx.el.td(f"{metric['hit_rate']}%", class_name="px-4 py-2"),
+        class_name="border-b border-gray-200 bg-white",
+    )
+
+
+def cache_metrics_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "Process Caches", class_name="text-lg font-semibold text-gray-700 mb-2"
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        ["Cache", "Entries", "Hits", "Misses", "Evictions", "Hit Rate"],
+                        lambda header: rx.el.th(
+                            header,
+                            class_name="text-left px-4 py-2 font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    )
+                )
+            ),
+            rx.el.tbody(rx.foreach(AdminState.cache_metrics, cache_metric_row)),
+            class_name="w-full text-sm text-gray-700",
+        ),
+        class_name="overflow-x-auto rounded-lg border border-gray-200 shadow-sm mb-6",
+    )
+
+
+def coalescing_metric_row(metric: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(metric["source"], class_name="px-4 py-2 font-medium"),
+        rx.el.td(metric["upstream_calls"], class_name="px-4 py-2"),
+        rx.el.td(metric["coalesced"], class_name="px-4 py-2"),
+        rx.el.td(metric["in_flight"], class_name="px-4 py-2"),
+        class_name="border-b border-gray-200 bg-white",
+    )
+
+
+def coalescing_metrics_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "Request Coalescing", class_name="text-lg font-semibold text-gray-700 mb-2"
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        ["Source", "Upstream Calls", "Calls Saved", "In Flight"],
+                        lambda header: rx.el.th(
+                            header,
+                            class_name="text-left px-4 py-2 font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    )
+                )
+            ),
+            rx.el.tbody(
+                rx.foreach(AdminState.coalescing_metrics, coalescing_metric_row)
+            ),
+            class_name="w-full text-sm text-gray-700",
+        ),
+        class_name="overflow-x-auto rounded-lg border border-gray-200 shadow-sm mb-6",
+    )
+
+
+def state_delta_metric_row(metric: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(metric["event"], class_name="px-4 py-2 font-mono text-xs"),
+        rx.el.td(metric["count"], class_name="px-4 py-2"),
+        rx.el.td(metric["avg_bytes"], class_name="px-4 py-2"),
+        rx.el.td(metric["max_bytes"], class_name="px-4 py-2"),
+        class_name="border-b border-gray-200 bg-white",
+    )
+
+
+def state_delta_metrics_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "State Delta Size per Event",
+            class_name="text-lg font-semibold text-gray-700 mb-2",
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        ["Event", "Count", "Avg Bytes", "Max Bytes"],
+                        lambda header: rx.el.th(
+                            header,
+                            class_name="text-left px-4 py-2 font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    )
+                )
+            ),
+            rx.el.tbody(
+                rx.foreach(AdminState.state_delta_metrics, state_delta_metric_row)
+            ),
+            class_name="w-full text-sm text-gray-700",
+        ),
+        class_name="overflow-x-auto rounded-lg border border-gray-200 shadow-sm mb-6",
+    )
+
+
+def dataset_memory_metric_row(metric: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(metric["scope"], class_name="px-4 py-2 font-mono text-xs"),
+        rx.el.td(metric["datasets"], class_name="px-4 py-2"),
+        rx.el.td(metric["rows"], class_name="px-4 py-2"),
+        rx.el.td(f"{metric['approx_mb']} MB", class_name="px-4 py-2"),
+        class_name="border-b border-gray-200 bg-white",
+    )
+
+
+def dataset_memory_metrics_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "Dataset Memory per Session",
+            class_name="text-lg font-semibold text-gray-700 mb-2",
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        ["Scope", "Datasets", "Rows", "Memory"],
+                        lambda header: rx.el.th(
+                            header,
+                            class_name="text-left px-4 py-2 font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    )
+                )
+            ),
+            rx.el.tbody(
+                rx.foreach(AdminState.dataset_memory_metrics, dataset_memory_metric_row)
+            ),
+            class_name="w-full text-sm text-gray-700",
+        ),
+        class_name="overflow-x-auto rounded-lg border border-gray-200 shadow-sm mb-6",
+    )
+
+
+def api_health_summary_row(summary: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(summary["api_name"], class_name="px-4 py-2"),
+        rx.el.td(summary["calls"], class_name="px-4 py-2"),
+        rx.el.td(f"{summary['failure_rate']}%", class_name="px-4 py-2"),
+        rx.el.td(f"{summary['avg_ms']} ms", class_name="px-4 py-2"),
+        rx.el.td(f"{summary['worst_p95_ms']} ms", class_name="px-4 py-2"),
+        class_name="border-b border-gray-200 bg-white",
+    )
+
+
+def api_health_summary_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "API Health (Last 24 Hours)",
+            class_name="text-lg font-semibold text-gray-700 mb-2",
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        ["API", "Calls", "Failure Rate", "Avg Duration", "Worst Hourly p95"],
+                        lambda header: rx.el.th(
+                            header,
+                            class_name="text-left px-4 py-2 font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    )
+                )
+            ),
+            rx.el.tbody(rx.foreach(AdminState.api_health_summary, api_health_summary_row)),
+            class_name="w-full text-sm text-gray-700",
+        ),
+        class_name="overflow-x-auto rounded-lg border border-gray-200 shadow-sm mb-6",
+    )
+
+
+def bulk_write_metric_row(metric: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(metric["table"], class_name="px-4 py-2 font-mono text-xs"),
+        rx.el.td(metric["batches"], class_name="px-4 py-2"),
+        rx.el.td(metric["written"], class_name="px-4 py-2"),
+        rx.el.td(metric["failed"], class_name="px-4 py-2"),
+        rx.el.td(metric["retries"], class_name="px-4 py-2"),
+        rx.el.td(metric["rows_per_second"], class_name="px-4 py-2"),
+        class_name="border-b border-gray-200 bg-white",
+    )
+
+
+def bulk_write_metrics_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "Bulk Write Throughput",
+            class_name="text-lg font-semibold text-gray-700 mb-2",
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        ["Table", "Batches", "Rows Written", "Rows Failed", "Retries", "Rows/s"],
+                        lambda header: rx.el.th(
+                            header,
+                            class_name="text-left px-4 py-2 font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    )
+                )
+            ),
+            rx.el.tbody(rx.foreach(AdminState.bulk_write_metrics, bulk_write_metric_row)),
+            class_name="w-full text-sm text-gray-700",
+        ),
+        class_name="overflow-x-auto rounded-lg border border-gray-200 shadow-sm mb-6",
+    )
+
+
+def telemetry_metric_row(metric: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(metric["enqueued"], class_name="px-4 py-2"),
+        rx.el.td(metric["written"], class_name="px-4 py-2"),
+        rx.el.td(metric["buffered"], class_name="px-4 py-2"),
+        rx.el.td(metric["spilled"], class_name="px-4 py-2"),
+        rx.el.td(metric["replayed"], class_name="px-4 py-2"),
+        rx.el.td(metric["rejected"], class_name="px-4 py-2"),
+        rx.el.td(metric["dropped"], class_name="px-4 py-2"),
+        rx.el.td(metric["flushes"], class_name="px-4 py-2"),
+        class_name="border-b border-gray-200 bg-white",
+    )
+
+
+def telemetry_metrics_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "Telemetry Write-Behind Buffer",
+            class_name="text-lg font-semibold text-gray-700 mb-2",
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        [
+                            "Enqueued",
+                            "Written",
+                            "Buffered",
+                            "Spilled",
+                            "Replayed",
+                            "Rejected",
+                            "Dropped",
+                            "Flushes",
+                        ],
+                        lambda header: rx.el.th(
+                            header,
+                            class_name="text-left px-4 py-2 font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    )
+                )
+            ),
+            rx.el.tbody(rx.foreach(AdminState.telemetry_metrics, telemetry_metric_row)),
+            class_name="w-full text-sm text-gray-700",
+        ),
+        class_name="overflow-x-auto rounded-lg border border-gray-200 shadow-sm mb-6",
+    )
+
+
+def api_usage_metric_row(metric: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(metric["allowed"], class_name="px-4 py-2"),
+        rx.el.td(metric["limited"], class_name="px-4 py-2"),
+        rx.el.td(metric["tracked_keys"], class_name="px-4 py-2"),
+        rx.el.td(metric["store_errors"], class_name="px-4 py-2"),
+        rx.el.td(metric["requests"], class_name="px-4 py-2"),
+        rx.el.td(metric["rows_flushed"], class_name="px-4 py-2"),
+        rx.el.td(metric["pending_rows"], class_name="px-4 py-2"),
+        class_name="border-b border-gray-200 bg-white",
+    )
+
+
+def api_usage_metrics_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "Public API Rate Limits & Metering",
+            class_name="text-lg font-semibold text-gray-700 mb-2",
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        [
+                            "Allowed",
+                            "Limited",
+                            "Tracked Keys",
+                            "Store Errors",
+                            "Metered",
+                            "Rows Flushed",
+                            "Pending Rows",
+                        ],
+                        lambda header: rx.el.th(
+                            header,
+                            class_name="text-left px-4 py-2 font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    )
+                )
+            ),
+            rx.el.tbody(rx.foreach(AdminState.api_usage_metrics, api_usage_metric_row)),
+            class_name="w-full text-sm text-gray-700",
+        ),
+        class_name="overflow-x-auto rounded-lg border border-gray-200 shadow-sm mb-6",
+    )
+
+
 def api_health_page() -> rx.Component:
     """The API Health Monitoring page content."""
     return rx.el.div(
@@ -86,6 +399,14 @@ def api_health_page() -> rx.Component:
             ),
             class_name="flex justify-between items-center mb-6",
         ),
+        api_health_summary_table(),
+        cache_metrics_table(),
+        coalescing_metrics_table(),
+        state_delta_metrics_table(),
+        dataset_memory_metrics_table(),
+        bulk_write_metrics_table(),
+        telemetry_metrics_table(),
+        api_usage_metrics_table(),
         rx.cond(
             AdminState.is_loading & (AdminState.api_health_logs.length() == 0),
             rx.el.div(
@@ -2,6 +2,7 @@ import reflex as rx
 from app.states.dashboard_state import DashboardState, SEVERITY_COLORS
 from app.state import AppState
 from app.components.upgrade_prompts import pro_badge, locked_feature
+from app.components.paginated_table import virtualized_table, pagination_controls
 from typing import Any
 
 
@@ -360,32 +361,27 @@ def cve_table() -> rx.Component:
             ),
             class_name="flex items-center justify-between mb-4",
         ),
-        rx.el.div(
-            rx.el.table(
-                rx.el.thead(
-                    rx.el.tr(
-                        rx.el.th(
-                            rx.el.input(
-                                type="checkbox",
-                                on_change=DashboardState.toggle_select_all,
-                                class_name="h-4 w-4 rounded border-gray-300 text-blue-600 focus:ring-blue-500",
-                            ),
-                            class_name="p-3",
-                        ),
-                        rx.el.th("", class_name="p-3"),
-                        header_cell("CVE ID", "id"),
-                        header_cell("Severity", "severity"),
-                        header_cell("Time Gap", "time_gap"),
-                        header_cell("Tech Match", "tech_match"),
-                        header_cell("Universal Risk", "universal_risk_score"),
-                        header_cell("Published", "published_date"),
-                    )
-                ),
-                rx.el.tbody(rx.foreach(DashboardState.filtered_cves, cve_table_row)),
-                class_name="w-full",
+        virtualized_table(
+            rx.el.tr(
+                rx.el.th(
+                    rx.el.input(
+                        type="checkbox",
+                        on_change=DashboardState.toggle_select_all,
+                        class_name="h-4 w-4 rounded border-gray-300 text-blue-600 focus:ring-blue-500",
+                    ),
+                    class_name="p-3",
+                ),
+                rx.el.th("", class_name="p-3"),
+                header_cell("CVE ID", "id"),
+                header_cell("Severity", "severity"),
+                header_cell("Time Gap", "time_gap"),
+                header_cell("Tech Match", "tech_match"),
+                header_cell("Universal Risk", "universal_risk_score"),
+                header_cell("Published", "published_date"),
             ),
-            class_name="overflow-x-auto rounded-lg border border-gray-200 bg-white",
+            rx.el.tbody(rx.foreach(DashboardState.page_cves, cve_table_row)),
         ),
+        pagination_controls(DashboardState),
     )
 
 
@@ -89,6 +89,40 @@ def score_preview() -> rx.Component:
     )
 
 
+def what_if_metric(label: str, key: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.p(label, class_name="text-sm text-gray-500"),
+        rx.el.p(
+            (FrameworkConfigState.what_if.get(key, 0) * 100).to_string() + "%",
+            class_name="text-2xl font-bold text-gray-800",
+        ),
+        class_name="flex-1 text-center",
+    )
+
+
+def what_if_panel() -> rx.Component:
+    return rx.cond(
+        FrameworkConfigState.what_if,
+        rx.el.div(
+            rx.el.h3(
+                "Historical Outcome Replay",
+                class_name="text-xl font-semibold text-gray-800 mb-2",
+            ),
+            rx.el.p(
+                "How these weights would have ranked your past findings against exploited and KEV-listed outcomes.",
+                class_name="text-sm text-gray-500 mb-4",
+            ),
+            rx.el.div(
+                what_if_metric("Precision@50", "precision_at_k"),
+                what_if_metric("Recall@50", "recall"),
+                what_if_metric("Rank Churn vs. Recommended", "rank_churn"),
+                class_name="flex items-center justify-between gap-4",
+            ),
+            class_name="bg-white p-6 rounded-lg shadow-sm border border-gray-200 mt-8",
+        ),
+    )
+
+
 def ai_suggestion_card() -> rx.Component:
     return rx.el.div(
         rx.el.div(
@@ -156,6 +190,7 @@ def framework_config_page() -> rx.Component:
             score_preview(),
             class_name="grid grid-cols-1 lg:grid-cols-2 gap-8",
         ),
+        what_if_panel(),
         ai_suggestion_card(),
         ai_suggestion_card(),
         rx.el.div(
@@ -1,5 +1,6 @@
 import reflex as rx
 from app.states.gap_analysis_state import GapAnalysisState
+from app.components.paginated_table import virtualized_table, pagination_controls
 
 
 def metric_card(
@@ -57,7 +58,7 @@ def filter_panel() -> rx.Component:
                 ),
                 rx.el.input(
                     placeholder="CVE ID, vendor...",
-                    on_change=GapAnalysisState.set_search_term,
+                    on_change=GapAnalysisState.set_search_term.debounce(300),
                     default_value=GapAnalysisState.filters["search_term"],
                     class_name="w-full p-2 border rounded-md text-sm",
                 ),
@@ -171,6 +172,62 @@ def visualizations() -> rx.Component:
     )
 
 
+def header_cell(title: str, key: str) -> rx.Component:
+    return rx.el.th(
+        rx.el.button(
+            rx.el.span(title),
+            rx.cond(
+                GapAnalysisState.sort_by[0] == key,
+                rx.icon(
+                    rx.cond(
+                        GapAnalysisState.sort_by[1] == "asc", "arrow-up", "arrow-down"
+                    ),
+                    class_name="h-4 w-4 ml-1",
+                ),
+                None,
+            ),
+            on_click=lambda: GapAnalysisState.set_sort(key),
+            class_name="flex items-center font-semibold text-gray-600 hover:text-gray-900 transition-colors",
+        ),
+        class_name="p-3 text-left text-sm",
+    )
+
+
+def gap_table_row(gap: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(gap["cve_id"], class_name="p-3 font-mono text-sm"),
+        rx.el.td(gap["vendor"], class_name="p-3 text-sm"),
+        rx.el.td(gap["time_gap_days"].to_string() + " days", class_name="p-3 text-sm"),
+        rx.el.td(gap["cvss_gap_score"].to_string(), class_name="p-3 text-sm"),
+        rx.el.td(gap["cpe_gap_score"].to_string(), class_name="p-3 text-sm"),
+        rx.el.td(
+            gap["overall_gap_severity"].to_string(), class_name="p-3 text-sm font-bold"
+        ),
+        class_name="border-b hover:bg-gray-50 transition-colors",
+    )
+
+
+def gap_table() -> rx.Component:
+    return rx.el.div(
+        rx.el.h3(
+            "Gap Register", class_name="text-lg font-semibold text-gray-800 mb-4"
+        ),
+        virtualized_table(
+            rx.el.tr(
+                header_cell("CVE ID", "cve_id"),
+                header_cell("Vendor", "vendor"),
+                header_cell("Time Gap", "time_gap_days"),
+                header_cell("CVSS Gap", "cvss_gap_score"),
+                header_cell("CPE Gap", "cpe_gap_score"),
+                header_cell("Overall", "overall_gap_severity"),
+            ),
+            rx.el.tbody(rx.foreach(GapAnalysisState.page_gaps, gap_table_row)),
+        ),
+        pagination_controls(GapAnalysisState),
+        class_name="mt-8",
+    )
+
+
 def gap_analysis_page() -> rx.Component:
     """The Gap Intelligence Dashboard page content."""
     return rx.el.div(
@@ -216,6 +273,7 @@ def gap_analysis_page() -> rx.Component:
             class_name="grid grid-cols-1 md:grid-cols-3 gap-6",
         ),
         visualizations(),
+        gap_table(),
         filter_panel(),
         class_name="p-8",
         on_mount=GapAnalysisState.load_initial_data,
@@ -1,7 +1,9 @@
 import reflex as rx
 from app.states.risk_intelligence_state import RiskIntelligenceState
+from app.states.framework_state import FrameworkState
 from app.states.finding_detail_state import FindingDetailState
 from app.components.finding_detail_panel import finding_detail_panel
+from app.components.paginated_table import virtualized_table, pagination_controls
 
 
 def score_badge(score: rx.Var[float]) -> rx.Component:
@@ -212,9 +214,18 @@ def cve_detail_modal() -> rx.Component:
 
 def risk_intelligence_page() -> rx.Component:
     return rx.el.div(
-        rx.el.h1(
-            "Risk Intelligence Dashboard",
-            class_name="text-3xl font-bold text-gray-800 mb-6",
+        rx.el.div(
+            rx.el.h1(
+                "Risk Intelligence Dashboard",
+                class_name="text-3xl font-bold text-gray-800",
+            ),
+            rx.el.button(
+                "Refresh Framework Data",
+                on_click=RiskIntelligenceState.refresh_frameworks,
+                disabled=FrameworkState.is_fetching | RiskIntelligenceState.is_loading,
+                class_name="bg-teal-400 text-white px-4 py-2 rounded-lg font-semibold hover:bg-teal-500 transition disabled:opacity-50",
+            ),
+            class_name="flex justify-between items-center mb-6",
         ),
         rx.el.div(
             rx.el.div(
@@ -231,26 +242,19 @@ def risk_intelligence_page() -> rx.Component:
             ),
             class_name="grid grid-cols-1 md:grid-cols-2 gap-6 mb-8",
         ),
-        rx.el.div(
-            rx.el.table(
-                rx.el.thead(
-                    rx.el.tr(
-                        header_cell("CVE ID", "cve_id"),
-                        header_cell("Universal Risk", "universal_risk_score"),
-                        header_cell("CVSS", "cvss_score"),
-                        header_cell("EPSS", "epss_score"),
-                        header_cell("KEV", "is_kev"),
-                        header_cell("Agreement", "agreement"),
-                        rx.el.th("Actions", class_name="p-3"),
-                    )
-                ),
-                rx.el.tbody(
-                    rx.foreach(RiskIntelligenceState.filtered_cves, cve_table_row)
-                ),
-                class_name="w-full",
+        virtualized_table(
+            rx.el.tr(
+                header_cell("CVE ID", "cve_id"),
+                header_cell("Universal Risk", "universal_risk_score"),
+                header_cell("CVSS", "cvss_score"),
+                header_cell("EPSS", "epss_score"),
+                header_cell("KEV", "is_kev"),
+                header_cell("Agreement", "agreement"),
+                rx.el.th("Actions", class_name="p-3"),
             ),
-            class_name="overflow-x-auto rounded-lg border border-gray-200 bg-white",
+            rx.el.tbody(rx.foreach(RiskIntelligenceState.page_cves, cve_table_row)),
         ),
+        pagination_controls(RiskIntelligenceState),
         cve_detail_modal(),
         finding_detail_panel(),
         rx.cond(
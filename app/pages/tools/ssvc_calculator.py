@@ -114,6 +114,129 @@ def result_card() -> rx.Component:
     )
 
 
+def bulk_count_badge(decision: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.p(
+            SsvcCalculatorState.bulk_counts.get(decision, 0),
+            class_name="text-3xl font-bold "
+            + SsvcCalculatorState.decision_colors[decision].to_string(),
+        ),
+        rx.el.p(decision, class_name="text-sm text-gray-400"),
+        class_name="text-center",
+    )
+
+
+def bulk_result_row(row: dict) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(row["cve_id"], class_name="px-4 py-2 font-mono"),
+        rx.el.td(row["exploitation"], class_name="px-4 py-2"),
+        rx.el.td(row["technical_impact"], class_name="px-4 py-2"),
+        rx.el.td(row["automatable"], class_name="px-4 py-2"),
+        rx.el.td(row["mission_impact"], class_name="px-4 py-2"),
+        rx.el.td(
+            rx.cond(row["decision"] != "", row["decision"], "Invalid row"),
+            class_name="px-4 py-2 font-semibold",
+        ),
+        class_name="border-b border-gray-700",
+    )
+
+
+def bulk_mode_card() -> rx.Component:
+    """CSV bulk mode for scoring many vulnerabilities at once."""
+    return rx.el.div(
+        rx.el.h2("Bulk Mode", class_name="text-2xl font-bold text-white mb-2"),
+        rx.el.p(
+            "Upload a CSV with exploitation, technical_impact, automatable and mission_impact columns (cve_id optional) to score thousands of rows at once.",
+            class_name="text-gray-400 mb-4",
+        ),
+        rx.upload.root(
+            rx.el.div(
+                rx.icon("file-up", class_name="w-8 h-8 text-gray-400"),
+                rx.el.p(
+                    "Drag & drop or click to upload a CSV file",
+                    class_name="text-sm text-gray-400",
+                ),
+                class_name="flex flex-col items-center justify-center p-6 border-2 border-dashed border-gray-600 rounded-lg",
+            ),
+            id="ssvc_bulk_upload",
+            accept={"text/csv": [".csv"]},
+            max_files=1,
+            class_name="w-full",
+        ),
+        rx.foreach(
+            rx.selected_files("ssvc_bulk_upload"),
+            lambda file: rx.el.div(file, class_name="text-sm text-gray-300 mt-2"),
+        ),
+        rx.el.button(
+            "Score CSV",
+            on_click=SsvcCalculatorState.handle_bulk_upload(
+                rx.upload_files(upload_id="ssvc_bulk_upload")
+            ),
+            is_loading=SsvcCalculatorState.is_processing_bulk,
+            class_name="mt-4 bg-teal-500 text-white px-6 py-2 rounded-lg font-semibold hover:bg-teal-600 transition",
+        ),
+        rx.cond(
+            SsvcCalculatorState.bulk_total > 0,
+            rx.el.div(
+                rx.el.div(
+                    bulk_count_badge("Act"),
+                    bulk_count_badge("Attend"),
+                    bulk_count_badge("Track*"),
+                    bulk_count_badge("Track"),
+                    class_name="grid grid-cols-4 gap-4 my-6",
+                ),
+                rx.el.p(
+                    f"{SsvcCalculatorState.bulk_file_name}: {SsvcCalculatorState.bulk_total} rows, {SsvcCalculatorState.bulk_invalid} invalid. Showing the first rows below.",
+                    class_name="text-sm text-gray-400 mb-2",
+                ),
+                rx.el.div(
+                    rx.el.table(
+                        rx.el.thead(
+                            rx.el.tr(
+                                rx.foreach(
+                                    [
+                                        "CVE",
+                                        "Exploitation",
+                                        "Technical Impact",
+                                        "Automatable",
+                                        "Mission Impact",
+                                        "Decision",
+                                    ],
+                                    lambda header: rx.el.th(
+                                        header,
+                                        class_name="text-left px-4 py-2 font-semibold text-gray-300",
+                                    ),
+                                )
+                            )
+                        ),
+                        rx.el.tbody(
+                            rx.foreach(
+                                SsvcCalculatorState.bulk_preview, bulk_result_row
+                            )
+                        ),
+                        class_name="w-full text-sm text-gray-200",
+                    ),
+                    class_name="overflow-x-auto max-h-96 overflow-y-auto rounded-lg border border-gray-700",
+                ),
+                rx.el.div(
+                    rx.el.button(
+                        "Clear",
+                        on_click=SsvcCalculatorState.clear_bulk_results,
+                        class_name="bg-gray-600 text-white px-6 py-2 rounded-lg font-semibold hover:bg-gray-500 transition",
+                    ),
+                    rx.el.button(
+                        "Download Results",
+                        on_click=SsvcCalculatorState.download_bulk_results,
+                        class_name="bg-teal-500 text-white px-6 py-2 rounded-lg font-semibold hover:bg-teal-600 transition",
+                    ),
+                    class_name="flex justify-end gap-4 mt-4",
+                ),
+            ),
+        ),
+        class_name="w-full max-w-4xl mt-16 bg-gray-800/50 p-6 rounded-lg border border-gray-700",
+    )
+
+
 def ssvc_calculator_page() -> rx.Component:
     """The SSVC Calculator tool page."""
     return tools_layout(
@@ -132,6 +255,7 @@ def ssvc_calculator_page() -> rx.Component:
             rx.el.div(
                 progress_indicator(),
                 rx.cond(SsvcCalculatorState.decision, result_card(), question_card()),
+                bulk_mode_card(),
                 class_name="flex flex-col items-center px-4",
             ),
             class_name="container mx-auto px-4 md:px-6 py-12",
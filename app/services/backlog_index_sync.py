@@ -0,0 +1,138 @@
+import logging
+import asyncio
+import os
+import httpx
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.utils import supabase_client
+
+logger = logging.getLogger(__name__)
+
+NVD_API_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+NVD_MAX_RANGE_DAYS = 120
+INITIAL_LOOKBACK_DAYS = 365
+RESULTS_PER_PAGE = 2000
+
+
+def nvd_mirror_row(cve: dict) -> Optional[dict]:
+    """Project a raw NVD CVE record onto a CVSS mirror row."""
+    cve_id = cve.get("id")
+    if not cve_id:
+        return None
+    metrics = cve.get("metrics", {})
+    version = None
+    cvss_data = {}
+    for key, label in (("cvssMetricV31", "3.1"), ("cvssMetricV30", "3.0")):
+        if metrics.get(key):
+            cvss_data = metrics[key][0].get("cvssData", {})
+            version = label
+            break
+    return {
+        "cve_id": cve_id,
+        "cvss_score": cvss_data.get("baseScore"),
+        "severity": cvss_data.get("baseSeverity"),
+        "vector": cvss_data.get("vectorString"),
+        "cvss_version": version,
+        "published_at": cve.get("published"),
+        "last_modified_at": cve.get("lastModified"),
+    }
+
+
+class BacklogIndexSync:
+    """Incrementally mirrors NVD CVE statuses and CVSS data into local tables."""
+
+    def __init__(self):
+        nvd_api_key = os.getenv("NVD_API_KEY")
+        self.headers = {"apiKey": nvd_api_key} if nvd_api_key else {}
+        self.page_delay = 0.6 if nvd_api_key else 6.0
+
+    def _to_index_row(self, cve: dict) -> Optional[dict]:
+        """Project a raw NVD CVE record onto a backlog index row."""
+        cve_id = cve.get("id")
+        if not cve_id:
+            return None
+        published_str = cve.get("published")
+        published_month = None
+        if published_str:
+            try:
+                published_month = datetime.fromisoformat(
+                    published_str.replace("Z", "+00:00")
+                ).strftime("%Y-%m")
+            except ValueError as e:
+                logger.warning(f"Unparseable publish date for {cve_id}: {e}")
+        return {
+            "cve_id": cve_id,
+            "vuln_status": cve.get("vulnStatus", "Unknown"),
+            "published_at": published_str,
+            "published_month": published_month,
+            "last_modified_at": cve.get("lastModified"),
+            "is_kev": bool(cve.get("cisaExploitAdd")),
+            "kev_date_added": cve.get("cisaExploitAdd"),
+        }
+
+    async def _sync_window(
+        self, client: httpx.AsyncClient, start: datetime, end: datetime
+    ) -> int:
+        """Page through every CVE modified inside one NVD date window."""
+        start_index = 0
+        processed = 0
+        while True:
+            url = (
+                f"{NVD_API_URL}?lastModStartDate={start.strftime('%Y-%m-%dT%H:%M:%S')}"
+                f"&lastModEndDate={end.strftime('%Y-%m-%dT%H:%M:%S')}"
+                f"&resultsPerPage={RESULTS_PER_PAGE}&startIndex={start_index}"
+            )
+            response = await client.get(url, headers=self.headers, timeout=60.0)
+            response.raise_for_status()
+            data = response.json()
+            vulnerabilities = data.get("vulnerabilities", [])
+            rows = [
+                row
+                for row in (self._to_index_row(v.get("cve", {})) for v in vulnerabilities)
+                if row
+            ]
+            if rows and not await supabase_client.upsert_backlog_index_entries(rows):
+                raise Exception(f"Failed to store backlog page at index {start_index}.")
+            mirror_rows = [
+                row
+                for row in (nvd_mirror_row(v.get("cve", {})) for v in vulnerabilities)
+                if row
+            ]
+            if mirror_rows and not await supabase_client.upsert_nvd_mirror_entries(
+                mirror_rows
+            ):
+                raise Exception(f"Failed to mirror NVD page at index {start_index}.")
+            processed += len(vulnerabilities)
+            start_index += len(vulnerabilities)
+            if start_index >= data.get("totalResults", 0) or not vulnerabilities:
+                return processed
+            await asyncio.sleep(self.page_delay)
+
+    async def sync(self) -> int:
+        """Index every CVE modified since the last successful run and refresh the monthly rollup."""
+        end = datetime.now(timezone.utc)
+        cursor = await supabase_client.get_backlog_sync_cursor()
+        start = cursor or end - timedelta(days=INITIAL_LOOKBACK_DAYS)
+        total = 0
+        async with httpx.AsyncClient() as client:
+            window_start = start
+            while window_start < end:
+                window_end = min(window_start + timedelta(days=NVD_MAX_RANGE_DAYS), end)
+                total += await self._sync_window(client, window_start, window_end)
+                window_start = window_end
+        await supabase_client.refresh_backlog_monthly_counts()
+        await supabase_client.set_backlog_sync_cursor(end, total)
+        logger.info(f"Backlog index sync processed {total} CVEs modified since {start}.")
+        return total
+
+
+backlog_index_sync = BacklogIndexSync()
+
+
+async def scheduled_backlog_index_sync():
+    """Scheduled job to keep the NVD backlog index current."""
+    logger.info("Starting scheduled backlog index sync...")
+    try:
+        await backlog_index_sync.sync()
+    except Exception as e:
+        logger.exception(f"Scheduled backlog index sync failed: {e}")
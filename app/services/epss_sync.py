@@ -0,0 +1,75 @@
+import logging
+import csv
+import gzip
+import io
+import httpx
+from typing import Optional
+from app.utils import supabase_client
+from app.services.lev_engine import lev_engine
+
+logger = logging.getLogger(__name__)
+
+EPSS_BULK_URL = "https://epss.cyentia.com/epss_scores-current.csv.gz"
+UPSERT_CHUNK_SIZE = 1000
+
+
+class EpssBulkSync:
+    """Loads the daily FIRST EPSS bulk file into the local epss_scores table.
+
+    Each day's scores are also appended to epss_history, the input series for LEV.
+    """
+
+    def _parse(self, payload: bytes) -> tuple[Optional[str], list[dict]]:
+        """Parse the gzipped CSV, whose first line carries the model version and score date."""
+        text = gzip.decompress(payload).decode("utf-8")
+        lines = text.splitlines()
+        score_date = None
+        if lines and lines[0].startswith("#"):
+            for part in lines[0].lstrip("#").split(","):
+                key, _, value = part.partition(":")
+                if key.strip() == "score_date":
+                    score_date = value.strip()[:10]
+            lines = lines[1:]
+        rows = []
+        for record in csv.DictReader(io.StringIO("\n".join(lines))):
+            rows.append(
+                {
+                    "cve_id": record["cve"],
+                    "epss_score": float(record["epss"]),
+                    "percentile": float(record["percentile"]),
+                    "score_date": score_date,
+                }
+            )
+        return score_date, rows
+
+    async def sync(self) -> tuple[Optional[str], list[dict]]:
+        """Download today's EPSS scores, upsert them in chunks and return them."""
+        async with httpx.AsyncClient() as client:
+            response = await client.get(EPSS_BULK_URL, timeout=120.0)
+            response.raise_for_status()
+        score_date, rows = self._parse(response.content)
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[start : start + UPSERT_CHUNK_SIZE]
+            if not await supabase_client.upsert_epss_scores(chunk):
+                raise Exception(f"Failed to store EPSS chunk starting at row {start}.")
+            history = [
+                {k: row[k] for k in ("cve_id", "score_date", "epss_score")}
+                for row in chunk
+            ]
+            if score_date and not await supabase_client.insert_epss_history(history):
+                raise Exception(f"Failed to store EPSS history chunk starting at row {start}.")
+        logger.info(f"EPSS bulk sync stored {len(rows)} scores for {score_date}.")
+        return score_date, rows
+
+
+epss_bulk_sync = EpssBulkSync()
+
+
+async def scheduled_epss_bulk_sync():
+    """Scheduled job to refresh the local EPSS table from the daily bulk file, then LEV."""
+    logger.info("Starting scheduled EPSS bulk sync...")
+    try:
+        score_date, rows = await epss_bulk_sync.sync()
+        await lev_engine.refresh_daily(rows, score_date)
+    except Exception as e:
+        logger.exception(f"Scheduled EPSS bulk sync failed: {e}")
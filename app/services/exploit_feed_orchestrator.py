@@ -3,6 +3,7 @@ import asyncio
 from app.integrations.exploit_feeds.otx import OTXFeedConnector
 from app.integrations.exploit_feeds.vulncheck import VulnCheckConnector
 from app.utils import supabase_client
+from app.utils.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +17,40 @@ class ExploitFeedOrchestrator:
 
     async def ingest_all_feeds(self, cve_id: str):
         """Fetches data from all configured feeds for a given CVE ID."""
+        await self.ingest_feeds([cve_id])
+
+    async def ingest_feeds(self, cve_ids: list[str]):
+        """Fetches feeds for many CVEs and writes their exploit proofs in one bulk upsert.
+
+        Concurrent ingests of the same CVE share one feed fetch.
+        """
+        results = await asyncio.gather(
+            *(
+                single_flight.do(
+                    "exploit_feeds", cve_id, lambda cve_id=cve_id: self._ingest_feeds(cve_id)
+                )
+                for cve_id in cve_ids
+            ),
+            return_exceptions=True,
+        )
+        proofs = []
+        for cve_id, result in zip(cve_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Exploit feed ingest failed for {cve_id}: {result}")
+                continue
+            proofs.extend(result)
+        if proofs:
+            await supabase_client.upsert_exploit_proofs(proofs)
+
+    async def _ingest_feeds(self, cve_id: str) -> list[dict]:
+        """Stores raw feed data for a CVE and returns the exploit proofs derived from it."""
         tasks = {
             "otx": self.otx.fetch_pulse_indicators(cve_id),
             "vulncheck": self.vulncheck.fetch_exploit_by_cve(cve_id),
         }
         results = await asyncio.gather(*tasks.values(), return_exceptions=True)
         raw_feed_data = dict(zip(tasks.keys(), results))
+        proofs = []
         for source, data in raw_feed_data.items():
             if isinstance(data, Exception):
                 logger.error(f"Failed to fetch from {source} for {cve_id}: {data}")
@@ -37,10 +66,11 @@ class ExploitFeedOrchestrator:
             if normalized:
                 feed_id = await supabase_client.store_exploit_feed_data(normalized)
                 if feed_id:
-                    await self.normalize_to_exploit_proof(normalized, feed_id)
+                    proofs.append(self.normalize_to_exploit_proof(normalized, feed_id))
+        return proofs
 
-    async def normalize_to_exploit_proof(self, feed_data: dict, feed_id: int):
-        """Creates a standardized exploit_proofs record from normalized feed data."""
+    def normalize_to_exploit_proof(self, feed_data: dict, feed_id: int) -> dict:
+        """Builds a standardized exploit_proofs record from normalized feed data."""
         raw = feed_data.get("raw_data", {})
         maturity = "poc"
         if "weaponized" in feed_data.get("title", "").lower():
@@ -57,7 +87,7 @@ class ExploitFeedOrchestrator:
                 p.get("product") for p in raw.get("affected_products", [])
             ],
         }
-        await supabase_client.upsert_exploit_proof(proof_data)
+        return proof_data
 
     def calculate_exploit_confidence(self, feed_data: dict) -> float:
         source_reliability = {"otx": 0.7, "vulncheck": 0.9}.get(
@@ -1,5 +1,4 @@
 import logging
-import asyncio
 from app.services.exploit_feed_orchestrator import ExploitFeedOrchestrator
 from app.utils import supabase_client
 
@@ -11,6 +10,5 @@ async def scheduled_exploit_feed_sync():
     logger.info("Starting scheduled exploit feed sync...")
     orchestrator = ExploitFeedOrchestrator()
     cves_to_check = await supabase_client.get_high_priority_cves_for_exploit_check()
-    tasks = [orchestrator.ingest_all_feeds(cve_id) for cve_id in cves_to_check]
-    await asyncio.gather(*tasks, return_exceptions=True)
+    await orchestrator.ingest_feeds(cves_to_check)
     logger.info("Exploit feed sync complete.")
\ No newline at end of file
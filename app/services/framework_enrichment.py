@@ -0,0 +1,160 @@
+import logging
+import asyncio
+import os
+import httpx
+from typing import Optional
+from app.utils import supabase_client
+from app.utils.ttl_cache import framework_cache
+from app.services.backlog_index_sync import NVD_API_URL, nvd_mirror_row
+
+logger = logging.getLogger(__name__)
+
+EPSS_API_URL = "https://api.first.org/data/v1/epss"
+EPSS_BATCH_SIZE = 100
+NVD_MISS_TTL_SECONDS = 6 * 3600
+
+
+class BatchFrameworkEnricher:
+    """Resolves CVSS and EPSS for many CVEs from local stores, fetching only misses.
+
+    The process-wide framework cache is consulted first and warmed with every
+    result. Network results are written back to the local stores so the next
+    batch resolves them locally, and CVEs NVD does not know are remembered for
+    NVD_MISS_TTL_SECONDS so they are not fetched again on every batch.
+    """
+
+    def __init__(self):
+        nvd_api_key = os.getenv("NVD_API_KEY")
+        self.headers = {"apiKey": nvd_api_key} if nvd_api_key else {}
+        self.nvd_concurrency = asyncio.Semaphore(5 if nvd_api_key else 1)
+        self.nvd_delay = 0.6 if nvd_api_key else 6.0
+
+    async def _fetch_nvd(
+        self, client: httpx.AsyncClient, cve_id: str
+    ) -> Optional[dict]:
+        async with self.nvd_concurrency:
+            try:
+                response = await client.get(
+                    f"{NVD_API_URL}?cveId={cve_id}", headers=self.headers, timeout=15.0
+                )
+                response.raise_for_status()
+                vulns = response.json().get("vulnerabilities", [])
+                if not vulns:
+                    framework_cache.set(
+                        "nvd_miss", cve_id, True, ttl=NVD_MISS_TTL_SECONDS
+                    )
+                    return None
+                return nvd_mirror_row(vulns[0].get("cve", {}))
+            except Exception as e:
+                logger.warning(f"NVD fallback fetch failed for {cve_id}: {e}")
+                return None
+            finally:
+                await asyncio.sleep(self.nvd_delay)
+
+    async def _fetch_epss(
+        self, client: httpx.AsyncClient, cve_ids: list[str]
+    ) -> list[dict]:
+        """Fetch EPSS for up to EPSS_BATCH_SIZE CVEs in one FIRST API call."""
+        try:
+            response = await client.get(
+                EPSS_API_URL,
+                params={"cve": ",".join(cve_ids), "limit": len(cve_ids)},
+                timeout=15.0,
+            )
+            response.raise_for_status()
+            return [
+                {
+                    "cve_id": item["cve"],
+                    "epss_score": float(item.get("epss", 0.0)),
+                    "percentile": float(item.get("percentile", 0.0)),
+                    "score_date": item.get("date"),
+                }
+                for item in response.json().get("data", [])
+            ]
+        except Exception as e:
+            logger.warning(f"EPSS fallback fetch failed for {len(cve_ids)} CVEs: {e}")
+            return []
+
+    async def _resolve_misses(
+        self, nvd_misses: list[str], epss_misses: list[str]
+    ) -> tuple[list[dict], list[dict]]:
+        async with httpx.AsyncClient() as client:
+            nvd_results, epss_batches = await asyncio.gather(
+                asyncio.gather(*(self._fetch_nvd(client, c) for c in nvd_misses)),
+                asyncio.gather(
+                    *(
+                        self._fetch_epss(
+                            client, epss_misses[start : start + EPSS_BATCH_SIZE]
+                        )
+                        for start in range(0, len(epss_misses), EPSS_BATCH_SIZE)
+                    )
+                ),
+            )
+        nvd_rows = [row for row in nvd_results if row]
+        epss_rows = [row for batch in epss_batches for row in batch]
+        if nvd_rows:
+            await supabase_client.upsert_nvd_mirror_entries(nvd_rows)
+        if epss_rows:
+            await supabase_client.upsert_epss_scores(epss_rows)
+        return nvd_rows, epss_rows
+
+    async def enrich(self, cve_ids: list[str]) -> dict[str, dict]:
+        """Return CVSS/EPSS framework data keyed by CVE ID for every requested CVE."""
+        unique_ids = list(dict.fromkeys(cve_ids))
+        cvss = {}
+        epss = {}
+        for cve_id in unique_ids:
+            cached_cvss = framework_cache.get("cvss", cve_id)
+            if cached_cvss:
+                cvss[cve_id] = cached_cvss
+            cached_epss = framework_cache.get("epss", cve_id)
+            if cached_epss:
+                epss[cve_id] = cached_epss
+        nvd, epss_rows = await asyncio.gather(
+            supabase_client.get_nvd_mirror_batch(
+                [c for c in unique_ids if c not in cvss]
+            ),
+            supabase_client.get_epss_scores_batch(
+                [c for c in unique_ids if c not in epss]
+            ),
+        )
+        nvd_misses = [
+            c
+            for c in unique_ids
+            if c not in cvss
+            and c not in nvd
+            and not framework_cache.get("nvd_miss", c)
+        ]
+        epss_misses = [c for c in unique_ids if c not in epss and c not in epss_rows]
+        if nvd_misses or epss_misses:
+            fetched_nvd, fetched_epss = await self._resolve_misses(
+                nvd_misses, epss_misses
+            )
+            nvd.update({row["cve_id"]: row for row in fetched_nvd})
+            epss_rows.update({row["cve_id"]: row for row in fetched_epss})
+        logger.info(
+            f"Batch enrichment resolved {len(unique_ids)} CVEs with {len(nvd_misses)} NVD and {len(epss_misses)} EPSS network fallbacks."
+        )
+        for cve_id, row in nvd.items():
+            cvss[cve_id] = {
+                "cvss_score": float(row["cvss_score"])
+                if row.get("cvss_score") is not None
+                else None,
+                "severity": row.get("severity"),
+                "vector": row.get("vector"),
+                "version": row.get("cvss_version"),
+            }
+            framework_cache.set("cvss", cve_id, cvss[cve_id])
+        for cve_id, row in epss_rows.items():
+            epss[cve_id] = {
+                "epss_score": float(row["epss_score"]),
+                "percentile": float(row.get("percentile") or 0.0),
+            }
+            framework_cache.set("epss", cve_id, epss[cve_id])
+        return {
+            cve_id: {**cvss.get(cve_id, {}), **epss.get(cve_id, {})}
+            for cve_id in unique_ids
+        }
+
+
+batch_framework_enricher = BatchFrameworkEnricher()
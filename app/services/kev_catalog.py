@@ -0,0 +1,74 @@
+import logging
+import time
+from typing import Optional
+import httpx
+from app.utils.single_flight import single_flight
+from app.utils.ttl_cache import framework_cache
+
+logger = logging.getLogger(__name__)
+
+KEV_FEED_URL = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
+RETRY_SECONDS = 300
+
+
+class KevCatalog:
+    """The CISA KEV catalog, shared through the framework cache and refetched once it expires.
+
+    Any process can call get(): a cached catalog is returned as is, and a miss
+    downloads the feed once however many callers are waiting. After a failed
+    download, get() returns None without retrying for retry_seconds so an
+    outage does not turn every request into a feed fetch.
+    """
+
+    def __init__(self, retry_seconds: int = RETRY_SECONDS):
+        self.retry_seconds = retry_seconds
+        self._failed_at: Optional[float] = None
+
+    async def _download(self) -> dict[str, dict]:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(KEV_FEED_URL, timeout=30.0)
+            response.raise_for_status()
+            data = response.json()
+        return {
+            item["cveID"]: {
+                "date_added": item.get("dateAdded"),
+                "due_date": item.get("dueDate"),
+                "required_action": item.get("requiredAction"),
+                "vuln_name": item.get("vulnerabilityName"),
+            }
+            for item in data.get("vulnerabilities", [])
+        }
+
+    async def get(self) -> Optional[dict[str, dict]]:
+        """CVE ID to KEV entry, or None when the catalog cannot be loaded."""
+        catalog = framework_cache.get("kev", "catalog")
+        if catalog is not None:
+            return catalog
+        if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_seconds:
+            return None
+        try:
+            catalog = await single_flight.do("kev", "catalog", self._download)
+        except Exception as e:
+            self._failed_at = time.monotonic()
+            logger.warning(f"Failed to fetch KEV catalog: {e}")
+            return None
+        self._failed_at = None
+        framework_cache.set("kev", "catalog", catalog)
+        return catalog
+
+
+def kev_status(catalog: dict[str, dict], cve_id: str) -> dict:
+    """KEV fields for one CVE in the shape FrameworkState merges into framework data."""
+    kev_data = catalog.get(cve_id)
+    if kev_data is None:
+        return {"is_kev": False}
+    return {
+        "is_kev": True,
+        "date_added": kev_data.get("date_added"),
+        "due_date": kev_data.get("due_date"),
+        "action": kev_data.get("required_action"),
+        "name": kev_data.get("vuln_name"),
+    }
+
+
+kev_catalog = KevCatalog()
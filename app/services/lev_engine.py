@@ -0,0 +1,135 @@
+import logging
+from typing import Optional
+import numpy as np
+from app.utils import supabase_client
+from app.utils.ttl_cache import framework_cache
+
+logger = logging.getLogger(__name__)
+
+EPSS_WINDOW_DAYS = 30
+UPSERT_CHUNK_SIZE = 1000
+
+
+def daily_log_survival(epss: np.ndarray) -> np.ndarray:
+    """ln(1 - epss/30): one day's share of a 30-day EPSS probability, in log space."""
+    return np.log1p(-np.clip(epss, 0.0, 1.0) / EPSS_WINDOW_DAYS)
+
+
+def lev_from_log_survival(log_survival: np.ndarray) -> np.ndarray:
+    """LEV = 1 - prod(1 - epss_d/30), recovered from the summed log terms."""
+    return np.round(-np.expm1(log_survival), 5)
+
+
+class LevEngine:
+    """Computes NIST CSWP 41 LEV2 scores from daily EPSS history.
+
+    LEV2 is 1 - prod_d(1 - epss_d / 30) over every day a CVE has been scored.
+    The product is kept per CVE as a running sum of log terms, so the daily
+    refresh adds one vectorized term per CVE instead of re-reading history.
+    """
+
+    def score_series(self, epss_series: list[float]) -> float:
+        """LEV for a single CVE's daily EPSS series."""
+        if not epss_series:
+            return 0.0
+        terms = daily_log_survival(np.asarray(epss_series, dtype=np.float64))
+        return float(lev_from_log_survival(terms.sum()))
+
+    def apply_day(
+        self, states: list[dict], rows: list[dict], score_date: str
+    ) -> list[dict]:
+        """Fold one day of EPSS scores into the stored LEV accumulators.
+
+        CVEs whose accumulator already includes score_date are skipped, so
+        re-running a day is a no-op. Returns the lev_scores rows to upsert.
+        """
+        if not rows:
+            return []
+        n = len(rows)
+        cve_ids = [r["cve_id"] for r in rows]
+        epss = np.fromiter((r["epss_score"] for r in rows), dtype=np.float64, count=n)
+        state_index = {s["cve_id"]: i for i, s in enumerate(states)}
+        positions = np.fromiter(
+            (state_index.get(c, -1) for c in cve_ids), dtype=np.int64, count=n
+        )
+        known = positions >= 0
+        known_positions = positions[known]
+        state_log = np.fromiter(
+            (s["log_survival"] for s in states), dtype=np.float64, count=len(states)
+        )
+        state_days = np.fromiter(
+            (s["days_observed"] for s in states), dtype=np.int64, count=len(states)
+        )
+        state_first = np.array([s["first_score_date"] for s in states], dtype="U10")
+        state_last = np.array([s["last_score_date"] for s in states], dtype="U10")
+        log_survival = np.zeros(n)
+        days = np.zeros(n, dtype=np.int64)
+        first_dates = np.full(n, score_date, dtype="U10")
+        fresh = np.ones(n, dtype=bool)
+        log_survival[known] = state_log[known_positions]
+        days[known] = state_days[known_positions]
+        first_dates[known] = state_first[known_positions]
+        fresh[known] = state_last[known_positions] < score_date
+        log_survival[fresh] += daily_log_survival(epss[fresh])
+        days[fresh] += 1
+        lev = lev_from_log_survival(log_survival)
+        updated = np.flatnonzero(fresh)
+        return [
+            {
+                "cve_id": cve_ids[i],
+                "log_survival": float(log_survival[i]),
+                "days_observed": int(days[i]),
+                "first_score_date": str(first_dates[i]),
+                "last_score_date": score_date,
+                "lev_score": float(lev[i]),
+            }
+            for i in updated.tolist()
+        ]
+
+    async def refresh_daily(self, rows: list[dict], score_date: Optional[str]) -> int:
+        """Apply a day's EPSS scores to every CVE's LEV and push it to framework scores."""
+        if not score_date:
+            raise ValueError("EPSS rows have no score date; cannot advance LEV.")
+        states = await supabase_client.get_all_lev_states()
+        updates = self.apply_day(states, rows, score_date)
+        for start in range(0, len(updates), UPSERT_CHUNK_SIZE):
+            chunk = updates[start : start + UPSERT_CHUNK_SIZE]
+            if not await supabase_client.upsert_lev_scores(chunk):
+                raise Exception(f"Failed to store LEV chunk starting at row {start}.")
+        synced = await supabase_client.sync_framework_lev_scores()
+        logger.info(
+            f"LEV refresh for {score_date} updated {len(updates)} CVEs and {synced or 0} framework scores."
+        )
+        return len(updates)
+
+    async def lookup(self, cve_ids: list[str]) -> dict[str, float]:
+        """Stored LEV scores for many CVEs, served from the framework cache when warm."""
+        scores = {}
+        misses = []
+        for cve_id in dict.fromkeys(cve_ids):
+            cached = framework_cache.get("lev", cve_id)
+            if cached is not None:
+                scores[cve_id] = cached
+            else:
+                misses.append(cve_id)
+        if misses:
+            stored = await supabase_client.get_lev_scores_batch(misses)
+            for cve_id, score in stored.items():
+                framework_cache.set("lev", cve_id, score)
+            scores.update(stored)
+        return scores
+
+    async def score_cve(self, cve_id: str) -> Optional[float]:
+        """LEV for one CVE, rebuilt from its EPSS history if not yet accumulated."""
+        scores = await self.lookup([cve_id])
+        if cve_id in scores:
+            return scores[cve_id]
+        history = await supabase_client.get_epss_history(cve_id)
+        if not history:
+            return None
+        score = self.score_series([float(row["epss_score"]) for row in history])
+        framework_cache.set("lev", cve_id, score)
+        return score
+
+
+lev_engine = LevEngine()
@@ -0,0 +1,97 @@
+"""Parity and speed benchmark for PortfolioRiskScorer against the per-CVE scorer.
+
+    python -m app.services.risk_scoring_benchmark --findings 100000
+
+Scores a random portfolio with universal_score, the scalar scorer behind
+RiskScoringState.compute_universal_score, and with the vectorized portfolio
+scorer, then prints both timings and the number of findings whose result
+dicts differ. Exits non-zero on any mismatch.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from app.services.risk_scoring_engine import portfolio_risk_scorer, universal_score
+
+SSVC_DECISIONS = (None, "Act", "Attend", "Track*", "Track")
+
+
+def random_portfolio(size: int, seed: int = 1) -> list[dict]:
+    """Framework dicts shaped like FrameworkState output, with gaps in every input."""
+    rng = random.Random(seed)
+    portfolio = []
+    for i in range(size):
+        record = {
+            "cve_id": f"CVE-2024-{i:06}",
+            "cvss_score": rng.choice([None, round(rng.uniform(0, 10), 1)]),
+            "epss_score": rng.choice([None, round(rng.random(), 4), rng.random()]),
+            "is_kev": rng.random() < 0.1,
+            "decision": rng.choice(SSVC_DECISIONS),
+        }
+        if rng.random() < 0.5:
+            record["percentile"] = rng.random()
+        if rng.random() < 0.3:
+            record["lev_score"] = rng.random()
+        portfolio.append(record)
+    return portfolio
+
+
+def random_weights(seed: int = 1) -> dict[str, float]:
+    """Slider-like weights with two decimals, as set on the framework config page."""
+    rng = random.Random(seed)
+    return {name: round(rng.uniform(0, 0.5), 2) for name in ("cvss", "epss", "kev", "ssvc", "lev")}
+
+
+def mismatches(portfolio: list[dict], weights: dict[str, float]) -> int:
+    """Findings whose batch result differs from the scalar scorer's."""
+    batch = portfolio_risk_scorer.to_results(portfolio_risk_scorer.score_records(portfolio, weights))
+    return sum(
+        1 for record, result in zip(portfolio, batch) if universal_score(record, weights) != result
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--findings", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    portfolio = random_portfolio(args.findings, args.seed)
+    weights = random_weights(args.seed)
+    started = time.perf_counter()
+    scalar = [universal_score(record, weights) for record in portfolio]
+    scalar_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    scored = portfolio_risk_scorer.score_records(portfolio, weights)
+    batch_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    batch = portfolio_risk_scorer.to_results(scored)
+    expand_seconds = time.perf_counter() - started
+    columns = portfolio_risk_scorer.columns_from_records(portfolio)
+    started = time.perf_counter()
+    portfolio_risk_scorer.score(
+        columns["cvss"],
+        columns["epss"],
+        columns["is_kev"],
+        columns["ssvc_points"],
+        weights,
+        columns["framework_counts"],
+        columns["lev"],
+    )
+    column_seconds = time.perf_counter() - started
+    mismatched = sum(1 for a, b in zip(scalar, batch) if a != b)
+
+    print(f"findings: {args.findings}, weights: {weights}")
+    print(f"scalar: {scalar_seconds:.3f}s")
+    print(
+        f"batch: {batch_seconds:.3f}s from records ({column_seconds:.4f}s from columns), "
+        f"{expand_seconds:.3f}s to expand into result dicts"
+    )
+    print(f"mismatches: {mismatched}")
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import logging
+from typing import Any, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SSVC_POINTS = {"Act": 100, "Attend": 70, "Track*": 50, "Track": 20}
+KEV_BONUS = 20
+CONFLICT_LABELS = (
+    "High CVSS, Low EPSS",
+    "Low CVSS, High EPSS",
+    "KEV with non-High CVSS",
+)
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Round to 2 decimals exactly like Python's round(x, 2).
+
+    np.round scales by 100 before rounding, which can land on the other side of
+    a .5 tie than Python's correctly-rounded implementation. Those near-ties are
+    rare, so they are re-rounded individually.
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+
+def universal_score(framework_data: dict, weights: dict[str, float]) -> dict[str, Any]:
+    """Universal risk score (0-100) for one CVE's framework data.
+
+    The scalar reference behind RiskScoringState.compute_universal_score;
+    PortfolioRiskScorer reproduces it exactly for whole portfolios.
+    """
+    cvss_score = framework_data.get("cvss_score", 0.0) or 0.0
+    epss_score = framework_data.get("epss_score", 0.0) or 0.0
+    is_kev = framework_data.get("is_kev", False)
+    lev_score = framework_data.get("lev_score", 0.0) or 0.0
+    cvss_normalized = cvss_score * 100 / 10
+    epss_normalized = epss_score * 100
+    ssvc_numeric = SSVC_POINTS.get(framework_data.get("decision"), 0)
+    lev_normalized = lev_score * 100
+    kev_bonus = KEV_BONUS if is_kev else 0
+    universal = (
+        cvss_normalized * weights["cvss"]
+        + epss_normalized * weights["epss"]
+        + ssvc_numeric * weights["ssvc"]
+        + lev_normalized * weights.get("lev", 0.0)
+    )
+    final_score = min(100, universal + kev_bonus)
+    mean = (cvss_normalized + epss_normalized) / 2
+    variance = ((cvss_normalized - mean) ** 2 + (epss_normalized - mean) ** 2) / 2
+    agreement = max(0.0, min(1.0, 1 - variance / 2500))
+    framework_count = len([k for k in framework_data if framework_data.get(k) is not None])
+    base_confidence = 0.5 + (framework_count - 1) * 0.5 / 10
+    confidence = min(1.0, base_confidence * (0.8 + agreement * 0.2))
+    conflicts = [
+        label
+        for label, flagged in zip(
+            CONFLICT_LABELS,
+            (
+                cvss_score >= 7.0 and epss_score < 0.02,
+                cvss_score < 5.0 and epss_score > 0.5,
+                bool(is_kev) and cvss_score < 7.0,
+            ),
+        )
+        if flagged
+    ]
+    return {
+        "universal_risk_score": round(final_score, 2),
+        "breakdown": {
+            "cvss_points": round(cvss_normalized * weights["cvss"], 2),
+            "epss_points": round(epss_normalized * weights["epss"], 2),
+            "ssvc_points": round(ssvc_numeric * weights["ssvc"], 2),
+            "lev_points": round(lev_normalized * weights.get("lev", 0.0), 2),
+            "kev_bonus": kev_bonus,
+        },
+        "framework_agreement": round(agreement, 2),
+        "scoring_confidence": round(confidence, 2),
+        "conflict_flags": conflicts,
+    }
+
+
+class PortfolioRiskScorer:
+    """Vectorized counterpart of universal_score for whole portfolios."""
+
+    def encode_ssvc(self, decisions: Sequence[Optional[str]]) -> np.ndarray:
+        """Map SSVC decision labels to their numeric scoring points."""
+        return np.fromiter(
+            (SSVC_POINTS.get(d, 0) for d in decisions),
+            dtype=np.float64,
+            count=len(decisions),
+        )
+
+    def columns_from_records(self, records: Sequence[dict]) -> dict[str, np.ndarray]:
+        """Build scoring columns from framework dicts as passed to the scalar scorer."""
+        n = len(records)
+        return {
+            "cvss": np.fromiter(
+                (r.get("cvss_score", 0.0) or 0.0 for r in records),
+                dtype=np.float64,
+                count=n,
+            ),
+            "epss": np.fromiter(
+                (r.get("epss_score", 0.0) or 0.0 for r in records),
+                dtype=np.float64,
+                count=n,
+            ),
+            "is_kev": np.fromiter(
+                (bool(r.get("is_kev")) for r in records), dtype=bool, count=n
+            ),
+            "ssvc_points": self.encode_ssvc([r.get("decision") for r in records]),
+            "lev": np.fromiter(
+                (r.get("lev_score", 0.0) or 0.0 for r in records),
+                dtype=np.float64,
+                count=n,
+            ),
+            "framework_counts": np.fromiter(
+                (sum((1 for v in r.values() if v is not None)) for r in records),
+                dtype=np.float64,
+                count=n,
+            ),
+        }
+
+    def components(self, framework_data: dict) -> dict[str, float]:
+        """Normalized 0-100 inputs persisted per finding so weight changes can re-rank without refetching."""
+        return {
+            "cvss_component": round((framework_data.get("cvss_score", 0.0) or 0.0) * 10, 3),
+            "epss_component": round((framework_data.get("epss_score", 0.0) or 0.0) * 100, 3),
+            "ssvc_component": float(SSVC_POINTS.get(framework_data.get("decision"), 0)),
+        }
+
+    def score(
+        self,
+        cvss: np.ndarray,
+        epss: np.ndarray,
+        is_kev: np.ndarray,
+        ssvc_points: np.ndarray,
+        weights: dict[str, float],
+        framework_counts: Optional[np.ndarray] = None,
+        lev: Optional[np.ndarray] = None,
+    ) -> dict[str, np.ndarray]:
+        """Score a portfolio given column arrays; missing CVSS/EPSS/LEV may be NaN.
+
+        framework_counts is the number of populated framework fields per finding and
+        drives scoring confidence. When omitted it is derived from the four inputs.
+        """
+        cvss = np.asarray(cvss, dtype=np.float64)
+        epss = np.asarray(epss, dtype=np.float64)
+        is_kev = np.asarray(is_kev, dtype=bool)
+        ssvc_points = np.asarray(ssvc_points, dtype=np.float64)
+        if framework_counts is None:
+            framework_counts = (
+                (~np.isnan(cvss)).astype(np.float64)
+                + (~np.isnan(epss))
+                + 1.0
+                + (ssvc_points > 0)
+            )
+        cvss = np.nan_to_num(cvss, nan=0.0)
+        epss = np.nan_to_num(epss, nan=0.0)
+        lev = (
+            np.zeros_like(cvss)
+            if lev is None
+            else np.nan_to_num(np.asarray(lev, dtype=np.float64), nan=0.0)
+        )
+        cvss_normalized = cvss * 100 / 10
+        epss_normalized = epss * 100
+        cvss_points = cvss_normalized * weights["cvss"]
+        epss_points = epss_normalized * weights["epss"]
+        ssvc_weighted = ssvc_points * weights["ssvc"]
+        lev_points = lev * 100 * weights.get("lev", 0.0)
+        kev_bonus = np.where(is_kev, KEV_BONUS, 0)
+        universal = cvss_points + epss_points + ssvc_weighted + lev_points
+        final_score = np.minimum(100, universal + kev_bonus)
+        mean = (cvss_normalized + epss_normalized) / 2
+        variance = (
+            (cvss_normalized - mean) ** 2 + (epss_normalized - mean) ** 2
+        ) / 2
+        agreement = np.clip(1 - variance / 2500, 0.0, 1.0)
+        base_confidence = 0.5 + (framework_counts - 1) * 0.5 / 10
+        confidence = np.minimum(1.0, base_confidence * (0.8 + agreement * 0.2))
+        conflicts = np.column_stack(
+            (
+                (cvss >= 7.0) & (epss < 0.02),
+                (cvss < 5.0) & (epss > 0.5),
+                is_kev & (cvss < 7.0),
+            )
+        )
+        return {
+            "universal_risk_score": _round2(final_score),
+            "cvss_points": _round2(cvss_points),
+            "epss_points": _round2(epss_points),
+            "ssvc_points": _round2(ssvc_weighted),
+            "lev_points": _round2(lev_points),
+            "kev_bonus": kev_bonus,
+            "framework_agreement": _round2(agreement),
+            "scoring_confidence": _round2(confidence),
+            "conflict_mask": conflicts,
+        }
+
+    def score_records(
+        self, records: Sequence[dict], weights: dict[str, float]
+    ) -> dict[str, np.ndarray]:
+        """Score framework dicts in one pass; results match the scalar scorer exactly."""
+        columns = self.columns_from_records(records)
+        return self.score(
+            columns["cvss"],
+            columns["epss"],
+            columns["is_kev"],
+            columns["ssvc_points"],
+            weights,
+            columns["framework_counts"],
+            columns["lev"],
+        )
+
+    def to_results(self, scored: dict[str, np.ndarray]) -> list[dict[str, Any]]:
+        """Expand batch output into the per-CVE dict shape of compute_universal_score."""
+        results = []
+        for i in range(len(scored["universal_risk_score"])):
+            results.append(
+                {
+                    "universal_risk_score": float(scored["universal_risk_score"][i]),
+                    "breakdown": {
+                        "cvss_points": float(scored["cvss_points"][i]),
+                        "epss_points": float(scored["epss_points"][i]),
+                        "ssvc_points": float(scored["ssvc_points"][i]),
+                        "lev_points": float(scored["lev_points"][i]),
+                        "kev_bonus": int(scored["kev_bonus"][i]),
+                    },
+                    "framework_agreement": float(scored["framework_agreement"][i]),
+                    "scoring_confidence": float(scored["scoring_confidence"][i]),
+                    "conflict_flags": [
+                        label
+                        for label, flagged in zip(
+                            CONFLICT_LABELS, scored["conflict_mask"][i]
+                        )
+                        if flagged
+                    ],
+                }
+            )
+        return results
+
+
+portfolio_risk_scorer = PortfolioRiskScorer()
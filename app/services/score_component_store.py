@@ -0,0 +1,112 @@
+import logging
+import time
+from typing import Any, Optional
+import numpy as np
+from app.utils import supabase_client
+from app.services.risk_scoring_engine import KEV_BONUS, SSVC_POINTS
+
+logger = logging.getLogger(__name__)
+
+COMPONENT_COLUMNS = ("cvss", "epss", "ssvc", "lev")
+PORTFOLIO_TTL_SECONDS = 300
+DEFAULT_TOP_N = 200
+
+
+class ScoreComponentStore:
+    """Per-organization matrix of persisted score components for instant re-ranking.
+
+    Each finding is one row of normalized (0-100) CVSS/EPSS/SSVC/LEV components, so a
+    weight change is a single matrix-vector product rather than a recompute of
+    every framework.
+    """
+
+    def __init__(self, ttl_seconds: int = PORTFOLIO_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._portfolios: dict[str, dict[str, Any]] = {}
+
+    def _component(self, row: dict, column: str) -> float:
+        """Read a persisted component, deriving it for rows scored before persistence."""
+        value = row.get(f"{column}_component")
+        if value is not None:
+            return float(value)
+        if column == "cvss":
+            return (row.get("cvss_v3_score") or 0.0) * 10
+        if column == "epss":
+            return (row.get("epss_score") or 0.0) * 100
+        if column == "lev":
+            return (row.get("lev_score") or 0.0) * 100
+        return float(SSVC_POINTS.get(row.get("ssvc_decision"), 0))
+
+    def _build(self, rows: list[dict]) -> dict[str, Any]:
+        n = len(rows)
+        matrix = np.empty((n, len(COMPONENT_COLUMNS)), dtype=np.float64)
+        for j, column in enumerate(COMPONENT_COLUMNS):
+            matrix[:, j] = np.fromiter(
+                (self._component(r, column) for r in rows), dtype=np.float64, count=n
+            )
+        kev_bonus = np.fromiter(
+            (KEV_BONUS if r.get("is_kev") else 0 for r in rows),
+            dtype=np.float64,
+            count=n,
+        )
+        return {
+            "matrix": matrix,
+            "kev_bonus": kev_bonus,
+            "rows": rows,
+            "loaded_at": time.monotonic(),
+        }
+
+    async def get_portfolio(
+        self, org_id: str, refresh: bool = False
+    ) -> Optional[dict[str, Any]]:
+        """Return the cached component matrix for an organization, loading it if stale."""
+        portfolio = self._portfolios.get(org_id)
+        if (
+            portfolio is None
+            or refresh
+            or time.monotonic() - portfolio["loaded_at"] > self.ttl_seconds
+        ):
+            rows = await supabase_client.get_scoring_components(org_id)
+            if not rows:
+                return None
+            portfolio = self._build(rows)
+            self._portfolios[org_id] = portfolio
+        return portfolio
+
+    def invalidate(self, org_id: str):
+        """Drop an organization's matrix so the next re-rank reloads it."""
+        self._portfolios.pop(org_id, None)
+
+    async def rerank(
+        self, org_id: str, weights: dict[str, float], top_n: int = DEFAULT_TOP_N
+    ) -> list[dict]:
+        """Score the whole portfolio with new weights and return the top-N findings."""
+        portfolio = await self.get_portfolio(org_id)
+        if portfolio is None:
+            return []
+        weight_vector = np.array(
+            [weights.get(column, 0.0) for column in COMPONENT_COLUMNS],
+            dtype=np.float64,
+        )
+        scores = np.minimum(
+            100, portfolio["matrix"] @ weight_vector + portfolio["kev_bonus"]
+        )
+        top_n = min(top_n, len(scores))
+        if top_n < len(scores):
+            top = np.argpartition(-scores, top_n - 1)[:top_n]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        results = []
+        for i in top:
+            row = portfolio["rows"][i]
+            results.append(
+                {
+                    **row,
+                    "universal_risk_score": round(float(scores[i]), 2),
+                }
+            )
+        return results
+
+
+score_component_store = ScoreComponentStore()
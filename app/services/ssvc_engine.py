@@ -0,0 +1,176 @@
+import csv
+import io
+import logging
+from itertools import repeat
+from typing import Callable, Optional, Sequence, Union
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EXPLOITATION = ("none", "poc", "active")
+TECHNICAL_IMPACT = ("partial", "total")
+AUTOMATABLE = ("no", "yes")
+MISSION_IMPACT = ("low", "medium", "high", "critical")
+AXES = (
+    ("exploitation", EXPLOITATION),
+    ("technical_impact", TECHNICAL_IMPACT),
+    ("automatable", AUTOMATABLE),
+    ("mission_impact", MISSION_IMPACT),
+)
+DECISIONS = ("Track", "Track*", "Attend", "Act")
+INVALID = -1
+# INVALID (-1) indexes the trailing None
+_DECISION_LABELS = np.array(DECISIONS + (None,), dtype=object)
+BULK_CSV_COLUMNS = ("cve_id",) + tuple(name for name, _ in AXES) + ("decision",)
+
+Values = Union[str, Sequence[Optional[str]]]
+
+
+def cisa_deployer_tree(
+    exploitation: str, technical_impact: str, automatable: str, mission_impact: str
+) -> str:
+    """The SSVC deployer tree used by the public calculator."""
+    if exploitation == "active":
+        return "Act"
+    if exploitation == "poc":
+        if mission_impact in ("critical", "high"):
+            return "Act"
+        if mission_impact == "medium":
+            return "Attend"
+        return "Track"
+    if technical_impact == "total":
+        if automatable == "yes" and mission_impact in ("critical", "high"):
+            return "Attend"
+        return "Track*"
+    return "Track"
+
+
+def kev_exploitation_tree(
+    exploitation: str, technical_impact: str, automatable: str, mission_impact: str
+) -> str:
+    """The simplified platform tree that keys exploitation off CISA KEV membership."""
+    if exploitation == "active":
+        if mission_impact == "critical":
+            return "Act"
+        return "Attend"
+    if technical_impact == "total" and mission_impact in ("high", "critical"):
+        return "Track*"
+    return "Track"
+
+
+class SsvcDecisionTable:
+    """An SSVC decision tree compiled into a dense lookup table.
+
+    The table is indexed by (exploitation, technical_impact, automatable,
+    mission_impact), so a single decision is one array lookup and a whole
+    portfolio is one fancy-indexing operation.
+    """
+
+    def __init__(self, tree: Callable[[str, str, str, str], str]):
+        self._index = {
+            name: {value: i for i, value in enumerate(values)} for name, values in AXES
+        }
+        self._decision_codes = {d: i for i, d in enumerate(DECISIONS)}
+        self.table = np.empty(tuple(len(values) for _, values in AXES), dtype=np.int8)
+        for idx in np.ndindex(self.table.shape):
+            args = [values[i] for i, (_, values) in zip(idx, AXES)]
+            self.table[idx] = self._decision_codes[tree(*args)]
+
+    def decide(
+        self,
+        exploitation: Optional[str],
+        technical_impact: Optional[str],
+        automatable: Optional[str],
+        mission_impact: Optional[str],
+    ) -> Optional[str]:
+        """Look up one decision; returns None if any answer is not a valid option."""
+        try:
+            code = self.table[
+                self._index["exploitation"][exploitation],
+                self._index["technical_impact"][technical_impact],
+                self._index["automatable"][automatable],
+                self._index["mission_impact"][mission_impact],
+            ]
+        except KeyError:
+            return None
+        return DECISIONS[code]
+
+    def axis_index(self, axis: str, value: str) -> int:
+        """Index of one answer on an axis."""
+        return self._index[axis][value]
+
+    def encode(self, axis: str, values: Sequence[Optional[str]]) -> np.ndarray:
+        """Map answer labels to axis indices, with INVALID for unknown answers."""
+        index = self._index[axis]
+        codes = np.fromiter(
+            map(index.get, values, repeat(INVALID)), dtype=np.int64, count=len(values)
+        )
+        for i in np.flatnonzero(codes == INVALID):
+            if isinstance(values[i], str):
+                codes[i] = index.get(values[i].strip().lower(), INVALID)
+        return codes
+
+    def decide_batch(
+        self,
+        exploitation: Values,
+        technical_impact: Values,
+        automatable: Values,
+        mission_impact: Values,
+    ) -> np.ndarray:
+        """Decide a whole portfolio at once; scalar answers apply to every row.
+
+        Returns decision codes indexing DECISIONS, or INVALID where a row has an
+        answer outside the decision tree's options.
+        """
+        columns = [exploitation, technical_impact, automatable, mission_impact]
+        n = max(
+            (len(c) for c in columns if not isinstance(c, str)),
+            default=1,
+        )
+        indices = [
+            np.full(n, self.encode(name, [c])[0])
+            if isinstance(c, str)
+            else self.encode(name, c)
+            for (name, _), c in zip(AXES, columns)
+        ]
+        return self.decide_indices(*indices)
+
+    def decide_indices(self, *indices: np.ndarray) -> np.ndarray:
+        """Decide from pre-encoded axis indices, skipping label encoding entirely."""
+        indices = np.broadcast_arrays(*(np.asarray(i, dtype=np.int64) for i in indices))
+        valid = np.logical_and.reduce([i != INVALID for i in indices])
+        codes = np.full(indices[0].shape, INVALID, dtype=np.int64)
+        codes[valid] = self.table[tuple(i[valid] for i in indices)]
+        return codes
+
+    def labels(self, codes: np.ndarray) -> list[Optional[str]]:
+        """Convert decision codes back to decision labels (None for INVALID)."""
+        return _DECISION_LABELS[codes].tolist()
+
+    def decide_csv(self, text: str) -> tuple[list[dict], int]:
+        """Score every row of a CSV with one column per decision point.
+
+        Returns the rows with a 'decision' column added (blank for invalid rows)
+        and the number of invalid rows.
+        """
+        reader = csv.DictReader(io.StringIO(text))
+        reader.fieldnames = [f.strip().lower() for f in reader.fieldnames or []]
+        missing = [name for name, _ in AXES if name not in reader.fieldnames]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+        rows = list(reader)
+        codes = self.decide_batch(*([r.get(name) for r in rows] for name, _ in AXES))
+        results = []
+        for row, decision in zip(rows, self.labels(codes)):
+            results.append(
+                {
+                    "cve_id": (row.get("cve_id") or "").strip(),
+                    **{name: (row.get(name) or "").strip().lower() for name, _ in AXES},
+                    "decision": decision or "",
+                }
+            )
+        return results, int((codes == INVALID).sum())
+
+
+ssvc_calculator_table = SsvcDecisionTable(cisa_deployer_tree)
+ssvc_platform_table = SsvcDecisionTable(kev_exploitation_tree)
@@ -0,0 +1,174 @@
+import logging
+from typing import Any, Optional, Sequence
+import numpy as np
+from app.utils import supabase_client
+from app.services.score_component_store import (
+    COMPONENT_COLUMNS,
+    score_component_store,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_K = 50
+CANDIDATE_BLOCK = 64
+MIN_PRECISION_GAIN = 0.02
+MAX_RANK_CHURN = 0.5
+
+
+class WeightSimulator:
+    """Replays candidate scoring weights over an organization's finding history.
+
+    Ground truth is findings labelled 'exploitable' in feedback_labels plus every
+    finding that has since been added to CISA KEV. The flat KEV bonus does not
+    depend on the weights and would leak the KEV label into the ranking, so
+    candidates are compared on their weighted components alone.
+    """
+
+    def __init__(self, block_size: int = CANDIDATE_BLOCK):
+        self.block_size = block_size
+        self._labels: dict[str, tuple[float, np.ndarray]] = {}
+
+    async def load_history(self, org_id: str) -> Optional[dict[str, Any]]:
+        """Load the component matrix and ground-truth labels for an organization.
+
+        Labels are cached for as long as the component matrix they were built for.
+        """
+        portfolio = await score_component_store.get_portfolio(org_id)
+        if portfolio is None:
+            return None
+        cached = self._labels.get(org_id)
+        if cached and cached[0] == portfolio["loaded_at"]:
+            return {"matrix": portfolio["matrix"], "labels": cached[1]}
+        feedback = await supabase_client.get_feedback_for_org(org_id)
+        exploitable = set()
+        false_positives = set()
+        for item in feedback:
+            cve_id = (item.get("finding") or {}).get("cve_id")
+            if item.get("label") == "exploitable":
+                exploitable.add(cve_id)
+            elif item.get("label") == "false_positive":
+                false_positives.add(cve_id)
+        rows = portfolio["rows"]
+        labels = np.fromiter(
+            (
+                (r["cve_id"] in exploitable or bool(r.get("kev_date_added")))
+                and r["cve_id"] not in false_positives
+                for r in rows
+            ),
+            dtype=bool,
+            count=len(rows),
+        )
+        self._labels[org_id] = (portfolio["loaded_at"], labels)
+        return {"matrix": portfolio["matrix"], "labels": labels}
+
+    def weight_matrix(self, candidates: Sequence[dict[str, float]]) -> np.ndarray:
+        """Stack weight dicts into a (candidates x components) matrix."""
+        return np.array(
+            [[c.get(column, 0.0) for column in COMPONENT_COLUMNS] for c in candidates],
+            dtype=np.float64,
+        ).reshape(len(candidates), len(COMPONENT_COLUMNS))
+
+    def _top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of each candidate's top-k findings from a (candidates x findings) matrix."""
+        if k >= scores.shape[1]:
+            return np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+    def simulate(
+        self,
+        matrix: np.ndarray,
+        labels: np.ndarray,
+        candidates: Sequence[dict[str, float]],
+        baseline: dict[str, float],
+        k: int = DEFAULT_K,
+    ) -> dict[str, np.ndarray]:
+        """Evaluate every candidate against the labels and the baseline ranking.
+
+        Returns arrays aligned with candidates: precision@k, recall@k and rank churn
+        (the share of the baseline's top-k that the candidate drops).
+        """
+        k = max(1, min(k, matrix.shape[0]))
+        positives = max(int(labels.sum()), 1)
+        in_baseline_top = np.zeros(matrix.shape[0], dtype=bool)
+        in_baseline_top[
+            self._top_k(self.weight_matrix([baseline]) @ matrix.T, k)[0]
+        ] = True
+        weights = self.weight_matrix(candidates)
+        hits = np.empty(len(candidates), dtype=np.float64)
+        overlap = np.empty(len(candidates), dtype=np.float64)
+        for start in range(0, len(candidates), self.block_size):
+            block = weights[start : start + self.block_size]
+            top = self._top_k(block @ matrix.T, k)
+            hits[start : start + len(block)] = labels[top].sum(axis=1)
+            overlap[start : start + len(block)] = in_baseline_top[top].sum(axis=1)
+        return {
+            "precision_at_k": hits / k,
+            "recall": hits / positives,
+            "rank_churn": 1 - overlap / k,
+        }
+
+    def candidate_grid(
+        self, baseline: dict[str, float], count: int = 256, seed: Optional[int] = None
+    ) -> list[dict[str, float]]:
+        """Sample weight vectors around the baseline that keep its total weight."""
+        rng = np.random.default_rng(seed)
+        base = self.weight_matrix([baseline])[0]
+        total = base.sum() or 1.0
+        alpha = np.maximum(base / total * 20, 0.5)
+        samples = rng.dirichlet(alpha, size=count) * total
+        candidates = []
+        for row in samples:
+            candidate = dict(baseline)
+            for column, value in zip(COMPONENT_COLUMNS, row):
+                candidate[column] = round(float(value), 2)
+            candidates.append(candidate)
+        return candidates
+
+    async def evaluate(
+        self,
+        org_id: str,
+        weights: dict[str, float],
+        baseline: dict[str, float],
+        k: int = DEFAULT_K,
+    ) -> Optional[dict[str, float]]:
+        """Replay a single weight set against the baseline for a what-if preview."""
+        history = await self.load_history(org_id)
+        if history is None:
+            return None
+        results = self.simulate(
+            history["matrix"], history["labels"], [weights], baseline, k
+        )
+        return {
+            "precision_at_k": round(float(results["precision_at_k"][0]), 3),
+            "recall": round(float(results["recall"][0]), 3),
+            "rank_churn": round(float(results["rank_churn"][0]), 3),
+        }
+
+    async def tune(
+        self, org_id: str, baseline: dict[str, float], k: int = DEFAULT_K
+    ) -> Optional[dict[str, Any]]:
+        """Search the weight space and return the best candidate if it beats the baseline."""
+        history = await self.load_history(org_id)
+        if history is None or not history["labels"].any():
+            return None
+        candidates = [baseline] + self.candidate_grid(baseline)
+        results = self.simulate(
+            history["matrix"], history["labels"], candidates, baseline, k
+        )
+        eligible = results["rank_churn"] <= MAX_RANK_CHURN
+        precision = np.where(eligible, results["precision_at_k"], -1.0)
+        best = int(np.argmax(precision))
+        gain = float(precision[best] - results["precision_at_k"][0])
+        if gain < MIN_PRECISION_GAIN:
+            return None
+        return {
+            "weights": candidates[best],
+            "precision_at_k": float(results["precision_at_k"][best]),
+            "baseline_precision_at_k": float(results["precision_at_k"][0]),
+            "recall": float(results["recall"][best]),
+            "rank_churn": float(results["rank_churn"][best]),
+            "k": k,
+        }
+
+
+weight_simulator = WeightSimulator()
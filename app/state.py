@@ -8,6 +8,8 @@ import os
 import time
 from app.utils import supabase_client
 from app.models import Membership
+from app.utils import dataset_aggregates
+from app.utils.dataset_store import dataset_store, session_scope
 from datetime import datetime
 import random
 
@@ -32,7 +34,7 @@ class AppState(rx.State):
     is_loading: bool = False
     last_successful_run_time: datetime | None = None
     is_refresh_on_cooldown: bool = False
-    unenriched_cves: list[dict] = []
+    _unenriched_handle: str = ""
     enrichment_analysis_results: list[dict] = []
     gaps_found_count: int = 0
     gap_analysis_in_progress: bool = False
@@ -116,10 +118,10 @@ class AppState(rx.State):
     def can_use_secure_sharing(self) -> bool:
         return self.active_org_plan in ["enterprise", "msp"]
 
-    @rx.var
+    @rx.var(cache=True)
     def top_10_unenriched_cves(self) -> list[dict]:
         """Returns the top 10 unenriched CVEs for the live view."""
-        return self.unenriched_cves[:10]
+        return dataset_store.data(self._unenriched_handle, [])[:10]
 
     @rx.var
     def cooldown_tooltip_message(self) -> str:
@@ -154,59 +156,27 @@ class AppState(rx.State):
         self.tech_stack.remove(item)
         return AppState.fetch_and_filter_nvd_data
 
-    @rx.var
+    @rx.var(cache=True)
     def cves_awaiting_enrichment_count(self) -> int:
         """Returns the count of CVEs awaiting enrichment."""
-        return len(self.unenriched_cves)
+        return len(dataset_store.data(self._unenriched_handle, []))
 
-    @rx.var
+    @rx.var(cache=True)
     def my_stack_gaps_count(self) -> int:
         """Returns the count of critical gaps in the user's tech stack."""
-        count = 0
-        tech_stack_lower = [tech.lower() for tech in self.tech_stack]
-        for cve in self.unenriched_cves:
-            description = cve.get("Product Description", "").lower()
-            if any((tech in description for tech in tech_stack_lower)):
-                count += 1
-        return count
+        return dataset_aggregates.stack_gaps_count(
+            self._unenriched_handle, self.tech_stack
+        )
 
     @rx.var
     def average_enrichment_lag(self) -> int:
         """Returns the average enrichment lag in days (static for now)."""
         return 28
 
-    @rx.var
+    @rx.var(cache=True)
     def cves_by_vendor(self) -> list[dict[str, str | int]]:
         """Returns the top 5 vendors by CVE count."""
-        vendor_counts = {}
-        for cve in self.unenriched_cves:
-            vendor = cve.get("Vendor", "N/A")
-            if vendor == "N/A":
-                description = cve.get("Product Description", "").lower()
-                if "microsoft" in description or "windows" in description:
-                    vendor = "Microsoft"
-                elif (
-                    "apple" in description
-                    or "ios" in description
-                    or "macos" in description
-                ):
-                    vendor = "Apple"
-                elif (
-                    "google" in description
-                    or "android" in description
-                    or "chrome" in description
-                ):
-                    vendor = "Google"
-                elif "linux" in description:
-                    vendor = "Linux"
-                else:
-                    vendor = "Other"
-            vendor_counts[vendor] = vendor_counts.get(vendor, 0) + 1
-        sorted_vendors = sorted(
-            vendor_counts.items(), key=lambda item: item[1], reverse=True
-        )
-        top_vendors = sorted_vendors[:5]
-        return [{"name": name, "count": count} for name, count in top_vendors]
+        return dataset_aggregates.cves_by_vendor(self._unenriched_handle)
 
     @rx.var
     def current_page(self) -> str:
@@ -528,7 +498,9 @@ class AppState(rx.State):
                         }
                     )
             async with self:
-                self.unenriched_cves = filtered_results
+                self._unenriched_handle = dataset_store.put(
+                    session_scope(self), "unenriched_cves", filtered_results
+                )
             log_data["status"] = "success"
             log_data["records_fetched"] = len(vulnerabilities)
         except httpx.HTTPStatusError as e:
@@ -3,6 +3,11 @@ import os
 from groq import Groq
 import logging
 from app.utils import supabase_client
+from app.utils.ttl_cache import api_key_cache, framework_cache, org_context_cache
+from app.utils.single_flight import single_flight
+from app.utils.dataset_store import dataset_store
+from app.utils.state_metrics import state_delta_monitor
+from app.utils.rate_limiter import api_rate_limiter
 
 
 class AdminState(rx.State):
@@ -13,6 +18,90 @@ class AdminState(rx.State):
     selected_log_id: str = ""
     diagnostic_result: dict[str, str] = {}
     is_diagnosing: bool = False
+    cache_metrics: list[dict[str, str | int | float]] = []
+    coalescing_metrics: list[dict[str, str | int]] = []
+    state_delta_metrics: list[dict[str, str | int]] = []
+    dataset_memory_metrics: list[dict[str, str | int | float]] = []
+    bulk_write_metrics: list[dict[str, str | int | float]] = []
+    api_health_summary: list[dict[str, str | int | float]] = []
+    telemetry_metrics: list[dict[str, int]] = []
+    api_usage_metrics: list[dict[str, int | bool]] = []
+
+    def _collect_cache_metrics(self) -> list[dict[str, str | int | float]]:
+        """Snapshot the process-level caches for the health page."""
+        rows = []
+        for name, cache in (
+            ("Framework data", framework_cache),
+            ("Org context", org_context_cache),
+            ("API keys", api_key_cache),
+        ):
+            metrics = cache.metrics()
+            rows.append(
+                {
+                    "name": name,
+                    "size": metrics["size"],
+                    "hits": metrics["hits"],
+                    "misses": metrics["misses"],
+                    "evictions": metrics["evictions"],
+                    "hit_rate": round(metrics["hit_rate"] * 100, 1),
+                }
+            )
+        for source, stats in sorted(org_context_cache.metrics()["sources"].items()):
+            lookups = stats["hits"] + stats["misses"]
+            rows.append(
+                {
+                    "name": f"Org context: {source}",
+                    "size": stats["size"],
+                    "hits": stats["hits"],
+                    "misses": stats["misses"],
+                    "evictions": 0,
+                    "hit_rate": round(stats["hits"] / lookups * 100, 1) if lookups else 0.0,
+                }
+            )
+        return rows
+
+    def _collect_coalescing_metrics(self) -> list[dict[str, str | int]]:
+        """Snapshot how many upstream calls single-flight coalescing has saved."""
+        return [
+            {"source": source, **stats}
+            for source, stats in sorted(single_flight.metrics().items())
+        ]
+
+    def _collect_dataset_memory_metrics(self) -> list[dict[str, str | int | float]]:
+        """Snapshot dataset store memory per session or organization."""
+        return [
+            {
+                "scope": stats["scope"],
+                "datasets": stats["datasets"],
+                "rows": stats["rows"],
+                "approx_mb": round(stats["approx_bytes"] / 1024 / 1024, 2),
+            }
+            for stats in dataset_store.metrics()
+        ]
+
+    def _summarize_api_health(self, rollups: list[dict]) -> list[dict[str, str | int | float]]:
+        """Combine hourly API health rollups into one row per API."""
+        summary: dict[str, dict] = {}
+        for row in rollups:
+            stats = summary.setdefault(
+                row["api_name"],
+                {"api_name": row["api_name"], "calls": 0, "failures": 0, "total_ms": 0.0, "p95_ms": 0},
+            )
+            stats["calls"] += row["calls"]
+            stats["failures"] += row["failures"]
+            stats["total_ms"] += float(row["avg_duration_ms"] or 0) * row["calls"]
+            stats["p95_ms"] = max(stats["p95_ms"], row["p95_duration_ms"] or 0)
+        return [
+            {
+                "api_name": stats["api_name"],
+                "calls": stats["calls"],
+                "failure_rate": round(stats["failures"] / stats["calls"] * 100, 1),
+                "avg_ms": round(stats["total_ms"] / stats["calls"]),
+                "worst_p95_ms": stats["p95_ms"],
+            }
+            for stats in sorted(summary.values(), key=lambda s: s["calls"], reverse=True)
+            if stats["calls"]
+        ]
 
     @rx.event(background=True)
     async def fetch_api_health_logs(self):
@@ -22,8 +111,19 @@ class AdminState(rx.State):
             self.api_health_logs = []
         try:
             logs = await supabase_client.get_api_health_logs()
+            rollups = await supabase_client.get_api_health_rollups(hours=24)
             async with self:
                 self.api_health_logs = logs
+                self.api_health_summary = self._summarize_api_health(rollups)
+                self.cache_metrics = self._collect_cache_metrics()
+                self.coalescing_metrics = self._collect_coalescing_metrics()
+                self.state_delta_metrics = state_delta_monitor.metrics()[:25]
+                self.dataset_memory_metrics = self._collect_dataset_memory_metrics()[:25]
+                self.bulk_write_metrics = supabase_client.bulk_writer.metrics()
+                self.telemetry_metrics = [supabase_client.telemetry_writer.metrics()]
+                self.api_usage_metrics = [
+                    {**api_rate_limiter.metrics(), **supabase_client.usage_meter.metrics()}
+                ]
         except Exception as e:
             logging.exception(f"Failed to fetch API health logs: {e}")
         finally:
@@ -4,6 +4,7 @@ import string
 import logging
 from datetime import datetime, timezone
 from app.utils import supabase_client
+from app.utils.encryption import hash_api_key
 from app.state import AppState
 from app.models import ApiKey
 
@@ -35,7 +36,7 @@ class ApiState(rx.State):
             keys = await supabase_client.get_api_keys_for_org(org_id)
             processed_keys = []
             for key in keys:
-                masked = f"{key['key_prefix']}_...{key['key_hash'][-4:]}"
+                masked = f"{key['key_prefix']}_...{key.get('key_hint') or ''}"
                 processed_keys.append(
                     {
                         **key,
@@ -69,16 +70,16 @@ class ApiState(rx.State):
             return
         try:
             full_key = self._generate_api_key()
-            key_prefix, key_body = full_key.split("_")
-            key_hash = key_body
+            key_prefix = full_key.split("_")[0]
             new_key_record = await supabase_client.create_api_key(
                 org_id=org_id,
                 key_name=key_name,
                 key_prefix=key_prefix,
-                key_hash=key_hash,
+                key_hash=hash_api_key(full_key),
+                key_hint=full_key[-4:],
             )
             if new_key_record:
-                masked = f"{new_key_record['key_prefix']}_...{new_key_record['key_hash'][-4:]}"
+                masked = f"{new_key_record['key_prefix']}_...{new_key_record['key_hint']}"
                 new_key_display = {
                     **new_key_record,
                     "masked_key": masked,
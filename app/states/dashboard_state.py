@@ -4,6 +4,10 @@ from datetime import datetime, timedelta
 import json
 import asyncio
 import random
+import numpy as np
+from app.utils.cve_filter_index import CveFilterIndex
+from app.utils.dataset_store import dataset_store, session_scope
+from app.states.pagination import PaginationMixin
 
 
 class CveData(TypedDict):
@@ -42,11 +46,21 @@ SEVERITY_COLORS = {
 }
 
 
-class DashboardState(rx.State):
+EMPTY_VIEW = np.empty(0, dtype=np.int64)
+
+
+def _filter_index(handle: str) -> Optional[CveFilterIndex]:
+    """The filter index for a stored CVE dataset, built on first use."""
+    dataset = dataset_store.get(handle)
+    return dataset.derived("filter_index", CveFilterIndex) if dataset else None
+
+
+class DashboardState(PaginationMixin, rx.State):
     """State for the interactive main dashboard."""
 
-    all_cves: list[CveData] = []
-    filtered_cves: list[CveData] = []
+    _cves_handle: str = ""
+    _view_handle: str = ""
+    page_cves: list[CveData] = []
     is_loading: bool = True
     is_filter_panel_open: bool = False
     filters: FilterOptions = {
@@ -117,48 +131,59 @@ class DashboardState(rx.State):
                 }
             )
         async with self:
-            self.all_cves = cves
+            self._cves_handle = dataset_store.put(
+                session_scope(self), "dashboard_cves", cves
+            )
             self.is_loading = False
             self._apply_all_filters()
 
     def _apply_all_filters(self):
-        """Helper to apply all active filters and sorting to the CVE list."""
-        cves = self.all_cves
-        if self.filters["search_term"]:
-            term = self.filters["search_term"].lower()
-            cves = [
-                cve
-                for cve in cves
-                if term in cve["id"].lower() or term in cve["description"].lower()
-            ]
-        if self.filters["is_kev"]:
-            cves = [cve for cve in cves if cve["is_kev"]]
-        if self.filters["severity"]:
-            cves = [cve for cve in cves if cve["severity"] in self.filters["severity"]]
-        if self.filters["tech_stack"]:
-            tech_filters = [t.lower() for t in self.filters["tech_stack"]]
-            cves = [
-                cve
-                for cve in cves
-                if any((t in cve["product"].lower() for t in tech_filters))
-            ]
+        """Resolve the active filters and sorting from the filter index, then show the first page."""
+        index = _filter_index(self._cves_handle)
+        if index is None:
+            self._view_handle = ""
+            self.cursor = 0
+            return self._refresh_page()
+        published_after = None
         if self.filters["date_range"] and self.filters["date_range"].isdigit():
             days = int(self.filters["date_range"])
-            cutoff_date = datetime.now() - timedelta(days=days)
-            cves = [
-                cve
-                for cve in cves
-                if datetime.fromisoformat(cve["published_date"]) > cutoff_date
-            ]
+            published_after = datetime.now() - timedelta(days=days)
+        search_scores = None
+        if self.filters["search_term"]:
+            search_scores = index.search.scores(self.filters["search_term"])
+        mask = index.match(
+            severities=self.filters["severity"],
+            is_kev=self.filters["is_kev"],
+            tech_stack=self.filters["tech_stack"],
+            published_after=published_after,
+            search_scores=search_scores,
+        )
         key, order = self.sort_by
-        reverse = order == "desc"
-        cves = sorted(cves, key=lambda cve: cve.get(key, 0), reverse=reverse)
-        self.filtered_cves = cves
+        self._view_handle = dataset_store.put(
+            session_scope(self),
+            "dashboard_view",
+            index.sorted_indices(mask, key, order, search_scores),
+        )
+        self.cursor = 0
+        return self._refresh_page()
+
+    def _refresh_page(self):
+        if dataset_store.is_missing(self._cves_handle):
+            self.page_cves = self._window([])
+            return None if self.is_loading else DashboardState.load_initial_data
+        index = _filter_index(self._cves_handle)
+        if index is None:
+            self.page_cves = self._window([])
+            return
+        if dataset_store.is_missing(self._view_handle):
+            return self._apply_all_filters()
+        view = dataset_store.data(self._view_handle, EMPTY_VIEW)
+        self.page_cves = index.rows_at(self._window(view))
 
     @rx.event
     def apply_all_filters(self):
         """Apply all active filters and sorting to the CVE list."""
-        self._apply_all_filters()
+        return self._apply_all_filters()
 
     @rx.event
     def toggle_filter_panel(self):
@@ -167,22 +192,22 @@ class DashboardState(rx.State):
     @rx.event
     def set_search_term(self, term: str):
         self.filters["search_term"] = term
-        self.apply_all_filters()
+        return self.apply_all_filters()
 
     @rx.event
     def clear_search_term(self):
         self.filters["search_term"] = ""
-        self.apply_all_filters()
+        return self.apply_all_filters()
 
     @rx.event
     def toggle_kev_filter(self, is_checked: bool):
         self.filters["is_kev"] = is_checked
-        self.apply_all_filters()
+        return self.apply_all_filters()
 
     @rx.event
     def set_date_range(self, range_val: str):
         self.filters["date_range"] = range_val
-        self.apply_all_filters()
+        return self.apply_all_filters()
 
     @rx.event
     def toggle_severity_filter(self, severity: str):
@@ -190,7 +215,7 @@ class DashboardState(rx.State):
             self.filters["severity"].remove(severity)
         else:
             self.filters["severity"].append(severity)
-        self.apply_all_filters()
+        return self.apply_all_filters()
 
     @rx.event
     def set_sort(self, key: str):
@@ -198,7 +223,7 @@ class DashboardState(rx.State):
             self.sort_by = (key, "asc" if self.sort_by[1] == "desc" else "desc")
         else:
             self.sort_by = (key, "desc")
-        self.apply_all_filters()
+        return self.apply_all_filters()
 
     @rx.event
     def toggle_row_expansion(self, cve_id: str):
@@ -217,7 +242,7 @@ class DashboardState(rx.State):
     @rx.event
     def toggle_select_all(self, is_checked: bool):
         if is_checked:
-            self.selected_rows = {cve["id"] for cve in self.filtered_cves}
+            self.selected_rows = self.selected_rows | {cve["id"] for cve in self.page_cves}
         else:
             self.selected_rows = set()
 
@@ -240,49 +265,56 @@ class DashboardState(rx.State):
             if view["name"] == view_name:
                 self.filters = view["filters"]
                 self.active_view = view_name
-                self.apply_all_filters()
-                return rx.toast.info(f"Loaded view: {view_name}")
+                reload = self.apply_all_filters()
+                toast = rx.toast.info(f"Loaded view: {view_name}")
+                return [reload, toast] if reload else toast
 
     @rx.var
     def awaiting_enrichment_count(self) -> int:
-        return len(self.filtered_cves)
+        return self.total_count
 
-    @rx.var
+    @rx.var(cache=True)
     def average_enrichment_lag(self) -> int:
-        if not self.filtered_cves:
+        index = _filter_index(self._cves_handle)
+        view = dataset_store.data(self._view_handle, EMPTY_VIEW)
+        if index is None or not len(view):
             return 0
-        total_lag = sum((cve["time_gap"] for cve in self.filtered_cves))
-        return round(total_lag / len(self.filtered_cves))
+        total_lag = int(index.time_gap[view].sum())
+        return round(total_lag / len(view))
 
-    @rx.var
+    @rx.var(cache=True)
     def critical_kev_count(self) -> int:
-        return len(
-            [
-                cve
-                for cve in self.filtered_cves
-                if cve["severity"] == "CRITICAL" and cve["is_kev"]
-            ]
-        )
+        index = _filter_index(self._cves_handle)
+        view = dataset_store.data(self._view_handle, EMPTY_VIEW)
+        if index is None or not len(view):
+            return 0
+        critical = index.severity.get("CRITICAL")
+        if critical is None:
+            return 0
+        return int((critical & index.kev)[view].sum())
 
-    @rx.var
+    @rx.var(cache=True)
     def severity_distribution(self) -> list[dict[str, str | int]]:
+        index = _filter_index(self._cves_handle)
+        view = dataset_store.data(self._view_handle, EMPTY_VIEW)
         dist = {s: 0 for s in SEVERITY_COLORS}
-        for cve in self.filtered_cves:
-            dist[cve["severity"]] += 1
+        if index is not None and len(view):
+            for severity, bits in index.severity.items():
+                dist[severity] = int(bits[view].sum())
         return [
             {"name": k, "value": v, "fill": SEVERITY_COLORS[k]} for k, v in dist.items()
         ]
 
-    @rx.var
+    @rx.var(cache=True)
     def cves_over_time(self) -> list[dict[str, str | int]]:
-        data = {}
-        for cve in self.all_cves:
-            date = datetime.fromisoformat(cve["published_date"]).strftime("%Y-%m-%d")
-            if date not in data:
-                data[date] = 0
-            data[date] += 1
-        sorted_data = sorted(data.items())[-90:]
-        return [{"date": date, "count": count} for date, count in sorted_data]
+        index = _filter_index(self._cves_handle)
+        if index is None:
+            return []
+        days, counts = np.unique(index.published_day, return_counts=True)
+        return [
+            {"date": str(date), "count": int(count)}
+            for date, count in zip(days[-90:], counts[-90:])
+        ]
 
     @rx.var
     async def tech_stack_distribution(self) -> list[dict[str, str | int]]:
@@ -290,14 +322,19 @@ class DashboardState(rx.State):
 
         app_state = await self.get_state(AppState)
         tech_stack = app_state.tech_stack
+        index = _filter_index(self._cves_handle)
+        view = dataset_store.data(self._view_handle, EMPTY_VIEW)
         dist = {tech: 0 for tech in tech_stack}
-        for cve in self.filtered_cves:
-            for tech in tech_stack:
-                if tech.lower() in cve["product"].lower():
-                    dist[tech] += 1
+        if index is not None and len(view):
+            for product, bits in index.products.items():
+                count = int(bits[view].sum())
+                for tech in tech_stack:
+                    if tech.lower() in product:
+                        dist[tech] += count
         return [{"name": k, "count": v} for k, v in dist.items()]
 
     @rx.var
     def blind_spot_cves(self) -> list[dict]:
         scanner_cve_ids = {cve["CVE ID"] for cve in self.scanner_view_cves}
-        return [cve for cve in self.all_cves if cve["id"] not in scanner_cve_ids][:5]
\ No newline at end of file
+        cves = dataset_store.data(self._cves_handle, [])
+        return [cve for cve in cves if cve["id"] not in scanner_cve_ids][:5]
@@ -6,9 +6,17 @@ from app.state import AppState
 import asyncio
 import random
 from datetime import datetime, timedelta
+from app.utils.search_index import InvertedIndex
 
 logger = logging.getLogger(__name__)
 
+PROOF_SEARCH_FIELDS = {
+    "cve_id": 4.0,
+    "title": 2.0,
+    "affected_products": 2.0,
+    "description": 1.0,
+}
+
 
 class ExploitProof(TypedDict):
     id: int
@@ -40,6 +48,7 @@ class ExploitIntelligenceState(rx.State):
     maturity_level_filter: list[str] = []
     source_filter: list[str] = []
     search_query: str = ""
+    _search_index: Optional[InvertedIndex] = None
 
     @rx.event(background=True)
     async def load_exploit_proofs(self):
@@ -80,6 +89,7 @@ class ExploitIntelligenceState(rx.State):
                 )
             async with self:
                 self.proofs = mock_proofs
+                self._search_index = InvertedIndex(mock_proofs, PROOF_SEARCH_FIELDS)
                 self._apply_filters()
         except Exception as e:
             logger.exception("Failed to load exploit proofs.")
@@ -90,13 +100,9 @@ class ExploitIntelligenceState(rx.State):
     def _apply_filters(self):
         """Apply all active filters to the list of proofs."""
         proofs_to_filter = self.proofs
-        if self.search_query:
-            query = self.search_query.lower()
-            proofs_to_filter = [
-                p
-                for p in proofs_to_filter
-                if query in p["cve_id"].lower() or query in p["title"].lower()
-            ]
+        if self.search_query and self._search_index is not None:
+            ranked = self._search_index.search(self.search_query)
+            proofs_to_filter = [proofs_to_filter[i] for i in ranked.tolist()]
         if self.validation_status_filter:
             proofs_to_filter = [
                 p
@@ -117,10 +117,7 @@ class FindingDetailState(rx.State):
 
             async with self:
                 risk_state = await self.get_state(RiskIntelligenceState)
-                cve_data = next(
-                    (cve for cve in risk_state.all_cves if cve["cve_id"] == cve_id),
-                    None,
-                )
+                cve_data = risk_state._find_cve(cve_id)
             if not cve_data:
                 raise ValueError(f"Finding for {cve_id} not found.")
             import hashlib
@@ -2,9 +2,12 @@ import reflex as rx
 import logging
 from app.utils import supabase_client
 from app.states.risk_scoring_state import RiskScoringState
+from app.services.weight_simulator import weight_simulator
 from app.state import AppState
 import random
 
+RECOMMENDED_WEIGHTS = {"cvss": 0.4, "epss": 0.3, "kev": 0.2, "ssvc": 0.1, "lev": 0.0}
+
 
 class FrameworkConfigState(rx.State):
     """State for the Framework Configuration page."""
@@ -24,6 +27,19 @@ class FrameworkConfigState(rx.State):
         "decision": "Act",
     }
     preview_score: dict = {}
+    what_if: dict[str, float] = {}
+
+    async def _replay_weights(self):
+        """Replay the slider weights over the organization's historical outcomes."""
+        app_state = await self.get_state(AppState)
+        if not app_state.active_organization_id:
+            return
+        self.what_if = (
+            await weight_simulator.evaluate(
+                app_state.active_organization_id, self.weights, RECOMMENDED_WEIGHTS
+            )
+            or {}
+        )
 
     @rx.event(background=True)
     async def load_config(self):
@@ -37,6 +53,7 @@ class FrameworkConfigState(rx.State):
                 risk_state = await self.get_state(RiskScoringState)
                 risk_state.scoring_weights = self.weights
                 self.preview_score = risk_state.compute_universal_score(self.sample_cve)
+                await self._replay_weights()
         except Exception as e:
             logging.exception(f"Failed to load framework config: {e}")
         finally:
@@ -51,6 +68,8 @@ class FrameworkConfigState(rx.State):
             risk_state = await self.get_state(RiskScoringState)
             risk_state.scoring_weights = self.weights
             self.preview_score = risk_state.compute_universal_score(self.sample_cve)
+            await risk_state.rerank_active_portfolio()
+            await self._replay_weights()
         except ValueError as e:
             logging.exception(f"Failed to adjust weight: {e}")
 
@@ -63,9 +82,9 @@ class FrameworkConfigState(rx.State):
             )
         self.is_loading = True
         try:
-            import asyncio
-
-            await asyncio.sleep(1)
+            risk_state = await self.get_state(RiskScoringState)
+            risk_state.scoring_weights = self.weights
+            await risk_state.record_weight_change()
             return rx.toast.success("Configuration saved successfully!")
         except Exception as e:
             logging.exception(f"Failed to save config: {e}")
@@ -75,10 +94,12 @@ class FrameworkConfigState(rx.State):
 
     @rx.event
     async def reset_to_recommended(self):
-        self.weights = {"cvss": 0.4, "epss": 0.3, "kev": 0.2, "ssvc": 0.1, "lev": 0.0}
+        self.weights = dict(RECOMMENDED_WEIGHTS)
         risk_state = await self.get_state(RiskScoringState)
         risk_state.scoring_weights = self.weights
         self.preview_score = risk_state.compute_universal_score(self.sample_cve)
+        await risk_state.rerank_active_portfolio()
+        await self._replay_weights()
         return rx.toast.info("Weights reset to recommended values.")
 
     @rx.var
@@ -94,5 +115,6 @@ class FrameworkConfigState(rx.State):
             {"name": "CVSS", "value": breakdown.get("cvss_points", 0)},
             {"name": "EPSS", "value": breakdown.get("epss_points", 0)},
             {"name": "SSVC", "value": breakdown.get("ssvc_points", 0)},
+            {"name": "LEV", "value": breakdown.get("lev_points", 0)},
             {"name": "KEV Bonus", "value": breakdown.get("kev_bonus", 0)},
         ]
\ No newline at end of file
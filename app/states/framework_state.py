@@ -6,7 +6,23 @@ import os
 import asyncio
 from datetime import datetime, timedelta, timezone
 from app.utils import supabase_client
+from app.utils.ttl_cache import framework_cache
+from app.utils.single_flight import single_flight
+from app.services.risk_scoring_engine import portfolio_risk_scorer
+from app.services.score_component_store import score_component_store
+from app.services.framework_enrichment import batch_framework_enricher
+from app.services.ssvc_engine import MISSION_IMPACT, ssvc_platform_table
+from app.services.lev_engine import lev_engine
+from app.services.kev_catalog import kev_catalog, kev_status
 import random
+import numpy as np
+
+SSVC_RATIONALES = {
+    "Act": "Exploited with critical mission impact.",
+    "Attend": "Exploited, but mission impact is not critical.",
+    "Track*": "High impact, not exploited. Monitor closely.",
+    "Track": "Low impact and not exploited. Standard monitoring.",
+}
 
 
 class FrameworkState(rx.State):
@@ -16,7 +32,6 @@ class FrameworkState(rx.State):
     fetch_error: str = ""
     kev_catalog: dict[str, dict] = {}
     kev_last_updated: Optional[datetime] = None
-    framework_cache: dict[str, dict] = {}
     rate_limit_cooldown: dict[str, datetime] = {}
     framework_health: dict[str, dict] = {}
 
@@ -33,24 +48,6 @@ class FrameworkState(rx.State):
             seconds=duration_seconds
         )
 
-    def _get_cached(self, cache_key: str, max_age_hours: int) -> Optional[dict]:
-        """Retrieve data from the in-memory cache if it's not stale."""
-        if cache_key in self.framework_cache:
-            cached_item = self.framework_cache[cache_key]
-            cached_time = cached_item.get("timestamp")
-            if cached_time and datetime.now(timezone.utc) - cached_time < timedelta(
-                hours=max_age_hours
-            ):
-                return cached_item.get("data")
-        return None
-
-    def _set_cached(self, cache_key: str, data: dict):
-        """Store data in the in-memory cache with a timestamp."""
-        self.framework_cache[cache_key] = {
-            "data": data,
-            "timestamp": datetime.now(timezone.utc),
-        }
-
     def _normalize_score(
         self, score: float, source_range: tuple, target_range: tuple
     ) -> float:
@@ -109,9 +106,7 @@ class FrameworkState(rx.State):
     @rx.event(background=True)
     async def fetch_cvss_data(self, cve_id: str):
         """Fetch CVSS data from the NVD API for a given CVE ID."""
-        cache_key = f"cvss_{cve_id}"
-        async with self:
-            cached_data = self._get_cached(cache_key, 24)
+        cached_data = framework_cache.get("cvss", cve_id)
         if cached_data:
             return cached_data
         async with self:
@@ -120,6 +115,12 @@ class FrameworkState(rx.State):
                     f"NVD API rate limit active. Skipping fetch for {cve_id}."
                 )
                 return
+        return await single_flight.do(
+            "nvd_cvss", cve_id, lambda: self._request_cvss_data(cve_id)
+        )
+
+    async def _request_cvss_data(self, cve_id: str) -> Optional[dict]:
+        """Call the NVD API for one CVE; concurrent callers share a single call."""
         nvd_api_key = os.getenv("NVD_API_KEY")
         headers = {"apiKey": nvd_api_key} if nvd_api_key else {}
         url = f"https://services.nvd.nist.gov/rest/json/cves/2.0?cveId={cve_id}"
@@ -150,8 +151,7 @@ class FrameworkState(rx.State):
                         "vector": cvss_v31.get("vectorString"),
                         "version": "3.1",
                     }
-                    async with self:
-                        self._set_cached(cache_key, result)
+                    framework_cache.set("cvss", cve_id, result)
                     return result
             except httpx.HTTPStatusError as e:
                 logging.exception(f"Error fetching CVSS for {cve_id}: {e}")
@@ -170,9 +170,7 @@ class FrameworkState(rx.State):
     @rx.event(background=True)
     async def fetch_epss_data(self, cve_id: str):
         """Fetch EPSS data from the FIRST API."""
-        cache_key = f"epss_{cve_id}"
-        async with self:
-            cached_data = self._get_cached(cache_key, 24)
+        cached_data = framework_cache.get("epss", cve_id)
         if cached_data:
             return cached_data
         url = f"https://api.first.org/data/v1/epss?cve={cve_id}"
@@ -188,8 +186,7 @@ class FrameworkState(rx.State):
                     "epss_score": float(epss_data.get("epss", 0.0)),
                     "percentile": float(epss_data.get("percentile", 0.0)),
                 }
-                async with self:
-                    self._set_cached(cache_key, result)
+                framework_cache.set("epss", cve_id, result)
                 return result
         except httpx.HTTPStatusError as e:
             logging.exception(f"Error fetching EPSS for {cve_id}: {e}")
@@ -204,83 +201,67 @@ class FrameworkState(rx.State):
                 timezone.utc
             ) - self.kev_last_updated < timedelta(hours=24):
                 return
-        url = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=30.0)
-                response.raise_for_status()
-                data = response.json()
-                catalog = {}
-                for item in data.get("vulnerabilities", []):
-                    catalog[item["cveID"]] = {
-                        "date_added": item.get("dateAdded"),
-                        "due_date": item.get("dueDate"),
-                        "required_action": item.get("requiredAction"),
-                        "vuln_name": item.get("vulnerabilityName"),
-                    }
-            async with self:
-                self.kev_catalog = catalog
-                self.kev_last_updated = datetime.now(timezone.utc)
-                logging.info("KEV catalog updated successfully.")
-        except Exception as e:
-            logging.exception(f"Failed to fetch KEV catalog: {e}")
+        catalog = await kev_catalog.get()
+        if catalog is None:
+            return
+        async with self:
+            self.kev_catalog = catalog
+            self.kev_last_updated = datetime.now(timezone.utc)
+            logging.info("KEV catalog updated successfully.")
 
     @rx.event
     def check_kev_status(self, cve_id: str) -> dict:
         """Check if a CVE is in the local KEV catalog."""
-        if cve_id in self.kev_catalog:
-            kev_data = self.kev_catalog[cve_id]
-            return {
-                "is_kev": True,
-                "date_added": kev_data.get("date_added"),
-                "due_date": kev_data.get("due_date"),
-                "action": kev_data.get("required_action"),
-                "name": kev_data.get("vuln_name"),
-            }
-        return {"is_kev": False}
+        return kev_status(self.kev_catalog, cve_id)
 
     @rx.event
     def calculate_ssvc_decision(self, cve_data: dict, context: dict) -> dict:
-        """Calculates the SSVC decision based on a simplified decision tree."""
-        is_exploited = cve_data.get("is_kev", False)
-        technical_impact = context.get("technical_impact", "low")
+        """Calculates the SSVC decision from the compiled platform decision table."""
+        return self.calculate_ssvc_decisions([cve_data], context)[0]
+
+    def calculate_ssvc_decisions(self, records: list[dict], context: dict) -> list[dict]:
+        """Assign SSVC decisions to a whole portfolio in one table lookup."""
+        technical_impact = (
+            "total" if context.get("technical_impact") == "total" else "partial"
+        )
         mission_impact = context.get("mission_impact", "low")
-        if is_exploited:
-            if mission_impact == "critical":
-                return {
-                    "decision": "Act",
-                    "rationale": "Exploited with critical mission impact.",
-                }
-            return {
-                "decision": "Attend",
-                "rationale": "Exploited, but mission impact is not critical.",
-            }
-        if technical_impact == "total" and mission_impact in ["high", "critical"]:
-            return {
-                "decision": "Track*",
-                "rationale": "High impact, not exploited. Monitor closely.",
-            }
-        return {
-            "decision": "Track",
-            "rationale": "Low impact and not exploited. Standard monitoring.",
-        }
+        if mission_impact not in MISSION_IMPACT:
+            mission_impact = "low"
+        is_kev = np.fromiter(
+            (bool(r.get("is_kev", False)) for r in records),
+            dtype=bool,
+            count=len(records),
+        )
+        codes = ssvc_platform_table.decide_indices(
+            np.where(
+                is_kev,
+                ssvc_platform_table.axis_index("exploitation", "active"),
+                ssvc_platform_table.axis_index("exploitation", "none"),
+            ),
+            ssvc_platform_table.axis_index("technical_impact", technical_impact),
+            ssvc_platform_table.axis_index("automatable", "no"),
+            ssvc_platform_table.axis_index("mission_impact", mission_impact),
+        )
+        return [
+            {"decision": decision, "rationale": SSVC_RATIONALES[decision]}
+            for decision in ssvc_platform_table.labels(codes)
+        ]
 
     @rx.event
     async def calculate_lev_score(self, cve_id: str) -> Optional[float]:
-        """Calculate the Likely Exploited Vulnerability (LEV) score from EPSS data."""
+        """Look up the Likely Exploited Vulnerability (LEV) score computed from EPSS history."""
+        lev_score = await lev_engine.score_cve(cve_id)
+        if lev_score is not None:
+            return lev_score
         epss_data = await self.fetch_epss_data(cve_id)
         if not epss_data or not epss_data.get("epss_score"):
             return None
-        current_epss = epss_data["epss_score"]
-        lev_score = min(1.0, current_epss * 1.25)
-        return round(lev_score, 4)
+        return lev_engine.score_series([epss_data["epss_score"]])
 
     @rx.event(background=True)
     async def fetch_microsoft_exploitability(self, cve_id: str):
         """Fetch Microsoft Exploitability Index for a given CVE."""
-        cache_key = f"ms_ei_{cve_id}"
-        async with self:
-            cached_data = self._get_cached(cache_key, 24 * 30)
+        cached_data = framework_cache.get("ms_ei", cve_id)
         if cached_data:
             return cached_data
         mock_db = {
@@ -290,8 +271,7 @@ class FrameworkState(rx.State):
         }
         await asyncio.sleep(0.1)
         result = mock_db.get(cve_id, {"index": 3, "category": "Exploitation Unlikely"})
-        async with self:
-            self._set_cached(cache_key, result)
+        framework_cache.set("ms_ei", cve_id, result)
         return result
 
     @rx.event
@@ -404,9 +384,11 @@ class FrameworkState(rx.State):
                         "framework_agreement": agreement,
                         "conflict_flags": conflicts,
                         "scoring_confidence": confidence,
+                        **portfolio_risk_scorer.components(final_scores),
                         "last_updated": datetime.now(timezone.utc).isoformat(),
                     }
                     await supabase_client.upsert_vulnerabilities([db_record])
+                    score_component_store.invalidate(app_state.active_organization_id)
                 yield rx.toast.success(f"Full analysis for {cve_id} complete.")
         except Exception as e:
             logging.exception(f"Enhanced framework fetch failed for {cve_id}: {e}")
@@ -469,9 +451,11 @@ class FrameworkState(rx.State):
                             "microsoft_ei_category"
                         ),
                         "lev_score": final_scores.get("lev_score"),
+                        **portfolio_risk_scorer.components(final_scores),
                         "last_updated": datetime.now(timezone.utc).isoformat(),
                     }
                     await supabase_client.upsert_vulnerabilities([db_record])
+                    score_component_store.invalidate(app_state.active_organization_id)
                 yield rx.toast.success(f"Framework data for {cve_id} updated.")
         except Exception as e:
             logging.exception(f"Failed to fetch all frameworks for {cve_id}: {e}")
@@ -480,4 +464,88 @@ class FrameworkState(rx.State):
             yield rx.toast.error("Framework data fetch failed.")
         finally:
             async with self:
-                self.is_fetching = False
\ No newline at end of file
+                self.is_fetching = False
+
+    @rx.event(background=True)
+    async def enrich_cves(self, cve_ids: list[str]):
+        """Enrich many CVEs at once from local framework stores.
+
+        Only CVEs missing from the NVD mirror or EPSS table hit the network, the
+        batch is scored in one vectorized pass, and results are committed to
+        state in a single update.
+        """
+        async with self:
+            self.is_fetching = True
+            self.fetch_error = ""
+            from app.state import AppState
+            from app.states.risk_scoring_state import RiskScoringState
+
+            app_state = await self.get_state(AppState)
+            org_id = app_state.active_organization_id
+            risk_state = await self.get_state(RiskScoringState)
+        try:
+            framework_data, lev_scores, catalog = await asyncio.gather(
+                batch_framework_enricher.enrich(cve_ids),
+                lev_engine.lookup(cve_ids),
+                kev_catalog.get(),
+            )
+            if catalog is None:
+                raise RuntimeError("KEV catalog unavailable")
+            results = {}
+            db_records = []
+            last_updated = datetime.now(timezone.utc).isoformat()
+            portfolio = [
+                {"cve_id": cve_id, **data, **kev_status(catalog, cve_id)}
+                for cve_id, data in framework_data.items()
+            ]
+            decisions = self.calculate_ssvc_decisions(
+                portfolio, {"mission_impact": "high", "technical_impact": "total"}
+            )
+            for final_scores, ssvc_decision in zip(portfolio, decisions):
+                final_scores.update(ssvc_decision)
+                if final_scores["cve_id"] in lev_scores:
+                    final_scores["lev_score"] = lev_scores[final_scores["cve_id"]]
+            scores = risk_state.compute_portfolio_scores(portfolio)
+            for final_scores, score in zip(portfolio, scores):
+                cve_id = final_scores["cve_id"]
+                results[cve_id] = {**final_scores, **score}
+                if org_id:
+                    db_records.append(
+                        {
+                            "cve_id": cve_id,
+                            "organization_id": org_id,
+                            "cvss_v3_score": final_scores.get("cvss_score"),
+                            "cvss_v3_vector": final_scores.get("vector"),
+                            "epss_score": final_scores.get("epss_score"),
+                            "epss_percentile": final_scores.get("percentile"),
+                            "is_kev": final_scores.get("is_kev", False),
+                            "kev_date_added": final_scores.get("date_added"),
+                            "kev_due_date": final_scores.get("due_date"),
+                            "ssvc_decision": final_scores.get("decision"),
+                            "ssvc_rationale": {"path": final_scores.get("rationale")},
+                            "lev_score": final_scores.get("lev_score"),
+                            "universal_risk_score": score["universal_risk_score"],
+                            "framework_agreement": score["framework_agreement"],
+                            "conflict_flags": score["conflict_flags"],
+                            "scoring_confidence": score["scoring_confidence"],
+                            **portfolio_risk_scorer.components(final_scores),
+                            "last_updated": last_updated,
+                        }
+                    )
+            if db_records:
+                await supabase_client.upsert_vulnerabilities(db_records)
+                score_component_store.invalidate(org_id)
+            async with self:
+                from app.states.risk_intelligence_state import RiskIntelligenceState
+
+                risk_intel_state = await self.get_state(RiskIntelligenceState)
+                risk_intel_state.apply_enriched(results)
+            yield rx.toast.success(f"Framework data for {len(results)} CVEs updated.")
+        except Exception as e:
+            logging.exception(f"Batch framework enrichment failed: {e}")
+            async with self:
+                self.fetch_error = f"An error occurred: {e}"
+            yield rx.toast.error("Batch framework enrichment failed.")
+        finally:
+            async with self:
+                self.is_fetching = False
@@ -3,7 +3,12 @@ from typing import TypedDict, Any
 from datetime import datetime, timedelta
 import asyncio
 import random
+import numpy as np
 from app.utils import supabase_client
+from app.states.pagination import PaginationMixin
+from app.utils.search_index import InvertedIndex
+from app.utils import dataset_aggregates
+from app.utils.dataset_store import dataset_store, session_scope
 
 
 class GapData(TypedDict):
@@ -27,14 +32,16 @@ class FilterOptions(TypedDict):
     cpe_score_range: tuple[int, int]
 
 
+GAP_SEARCH_FIELDS = {"cve_id": 4.0, "vendor": 2.0, "description": 1.0}
 GAP_SEVERITY_COLORS = {"High": "#ef4444", "Medium": "#f97316", "Low": "#facc15"}
 
 
-class GapAnalysisState(rx.State):
+class GapAnalysisState(PaginationMixin, rx.State):
     """State for the Gap Intelligence Dashboard."""
 
-    all_gaps: list[GapData] = []
-    filtered_gaps: list[GapData] = []
+    _gaps_handle: str = ""
+    _view_handle: str = ""
+    page_gaps: list[GapData] = []
     is_loading: bool = True
     is_filter_panel_open: bool = False
     filters: FilterOptions = {
@@ -73,20 +80,28 @@ class GapAnalysisState(rx.State):
                 }
             )
         async with self:
-            self.all_gaps = gaps
+            self._gaps_handle = dataset_store.put(session_scope(self), "gaps", gaps)
             self.is_loading = False
             yield GapAnalysisState.apply_filters
 
     def _apply_all_filters(self):
-        """Helper to apply all active filters and sorting to the gap list."""
-        gaps = self.all_gaps
-        if self.filters["search_term"]:
-            term = self.filters["search_term"].lower()
-            gaps = [
-                gap
-                for gap in gaps
-                if term in gap["cve_id"].lower() or term in gap["vendor"].lower()
-            ]
+        """Helper to apply all active filters and sorting, then show the first page."""
+        if dataset_store.is_missing(self._gaps_handle):
+            return self._refresh_page()
+        dataset = dataset_store.get(self._gaps_handle)
+        gaps = dataset.data if dataset is not None else []
+        search_scores = None
+        if self.filters["search_term"] and dataset is not None:
+            search_index = dataset.derived(
+                "search_index", lambda rows: InvertedIndex(rows, GAP_SEARCH_FIELDS)
+            )
+            search_scores = search_index.scores(self.filters["search_term"])
+        if search_scores is not None:
+            relevance = {
+                gaps[i]["cve_id"]: search_scores[i]
+                for i in np.flatnonzero(search_scores).tolist()
+            }
+            gaps = [gap for gap in gaps if gap["cve_id"] in relevance]
         if self.filters["affects_stack"]:
             gaps = [gap for gap in gaps if gap["affects_org_stack"]]
         if self.filters["time_gap_ranges"]:
@@ -104,12 +119,23 @@ class GapAnalysisState(rx.State):
         key, order = self.sort_by
         reverse = order == "desc"
         gaps = sorted(gaps, key=lambda g: g.get(key, 0), reverse=reverse)
-        self.filtered_gaps = gaps
+        if search_scores is not None:
+            gaps.sort(key=lambda g: -relevance[g["cve_id"]])
+        self._view_handle = dataset_store.put(session_scope(self), "gaps_view", gaps)
+        self.cursor = 0
+        return self._refresh_page()
+
+    def _refresh_page(self):
+        if dataset_store.is_missing(self._gaps_handle):
+            self.page_gaps = self._window([])
+            return None if self.is_loading else GapAnalysisState.load_initial_data
+        if dataset_store.is_missing(self._view_handle):
+            return self._apply_all_filters()
+        self.page_gaps = self._window(dataset_store.data(self._view_handle, []))
 
     @rx.event
     def apply_filters(self):
-        self._apply_all_filters()
-        return
+        return self._apply_all_filters()
 
     @rx.event
     def toggle_filter_panel(self):
@@ -118,7 +144,7 @@ class GapAnalysisState(rx.State):
     @rx.event
     def set_search_term(self, term: str):
         self.filters["search_term"] = term
-        self._apply_all_filters()
+        return self._apply_all_filters()
 
     @rx.event
     def toggle_time_gap_filter(self, selected_range: str):
@@ -126,12 +152,12 @@ class GapAnalysisState(rx.State):
             self.filters["time_gap_ranges"].remove(selected_range)
         else:
             self.filters["time_gap_ranges"].append(selected_range)
-        self._apply_all_filters()
+        return self._apply_all_filters()
 
     @rx.event
     def toggle_affects_stack_filter(self, checked: bool):
         self.filters["affects_stack"] = checked
-        self._apply_all_filters()
+        return self._apply_all_filters()
 
     @rx.event
     def set_sort(self, key: str):
@@ -139,7 +165,7 @@ class GapAnalysisState(rx.State):
             self.sort_by = (key, "asc" if self.sort_by[1] == "desc" else "desc")
         else:
             self.sort_by = (key, "desc")
-        self._apply_all_filters()
+        return self._apply_all_filters()
 
     @rx.event
     def clear_all_filters(self):
@@ -151,45 +177,34 @@ class GapAnalysisState(rx.State):
             "cvss_score_range": (0, 10),
             "cpe_score_range": (0, 10),
         }
-        self._apply_all_filters()
-        return rx.toast.info("Filters cleared.")
+        reload = self._apply_all_filters()
+        toast = rx.toast.info("Filters cleared.")
+        return [reload, toast] if reload else toast
 
     @rx.var
     def total_gaps_count(self) -> int:
-        return len(self.filtered_gaps)
+        return self.total_count
 
-    @rx.var
+    @rx.var(cache=True)
     def avg_enrichment_time(self) -> int:
-        if not self.filtered_gaps:
-            return 0
-        total_days = sum((g["time_gap_days"] for g in self.filtered_gaps))
-        return round(total_days / len(self.filtered_gaps))
+        return dataset_aggregates.avg_enrichment_time(self._view_handle)
 
-    @rx.var
+    @rx.var(cache=True)
     def worst_offenders(self) -> list[GapData]:
-        return sorted(self.all_gaps, key=lambda g: g["time_gap_days"], reverse=True)[:5]
+        return dataset_aggregates.worst_offenders(self._gaps_handle)
 
-    @rx.var
+    @rx.var(cache=True)
     def cvss_gap_distribution(self) -> list[dict]:
-        dist = {i: 0 for i in range(11)}
-        for gap in self.filtered_gaps:
-            score = int(gap["cvss_gap_score"])
-            dist[score] += 1
-        return [{"score": k, "count": v} for k, v in dist.items()]
+        return dataset_aggregates.gap_score_distribution(
+            self._view_handle, "cvss_gap_score"
+        )
 
-    @rx.var
+    @rx.var(cache=True)
     def cpe_gap_distribution(self) -> list[dict]:
-        dist = {i: 0 for i in range(11)}
-        for gap in self.filtered_gaps:
-            score = int(gap["cpe_gap_score"])
-            dist[score] += 1
-        return [{"score": k, "count": v} for k, v in dist.items()]
+        return dataset_aggregates.gap_score_distribution(
+            self._view_handle, "cpe_gap_score"
+        )
 
-    @rx.var
+    @rx.var(cache=True)
     def monthly_backlog_growth(self) -> list[dict]:
-        monthly_counts = {}
-        for gap in self.all_gaps:
-            month = datetime.fromisoformat(gap["published_date"]).strftime("%Y-%m")
-            monthly_counts[month] = monthly_counts.get(month, 0) + 1
-        sorted_months = sorted(monthly_counts.keys())
-        return [{"month": m, "count": monthly_counts[m]} for m in sorted_months][-12:]
\ No newline at end of file
+        return dataset_aggregates.monthly_backlog_growth(self._gaps_handle)
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta, timezone
 from app.utils import supabase_client
 from app.inference_engine.main import run_inference_pipeline
 
+FINDINGS_FLUSH_SIZE = 100
+
 
 class InferenceOrchestrationState(rx.State):
     """Manages the end-to-end inference pipeline for an organization."""
@@ -42,6 +44,7 @@ class InferenceOrchestrationState(rx.State):
             yield rx.toast.info(
                 f"Starting inference for {self.cves_total} CVEs in org {org_id}."
             )
+            pending_findings = []
             for cve in unenriched_cves:
                 cve_id = cve.get("id")
                 if not cve_id:
@@ -67,7 +70,12 @@ class InferenceOrchestrationState(rx.State):
                                 "description": "Proof-of-concept exploit code is publicly available.",
                             },
                         }
-                        await supabase_client.upsert_inference_finding(enriched_data)
+                        pending_findings.append(enriched_data)
+                        if len(pending_findings) >= FINDINGS_FLUSH_SIZE:
+                            await supabase_client.upsert_inference_findings(
+                                pending_findings
+                            )
+                            pending_findings = []
                     async with self:
                         self.cves_processed += 1
                 except Exception as e:
@@ -77,6 +85,8 @@ class InferenceOrchestrationState(rx.State):
                     async with self:
                         self.errors.append(f"Error on {cve_id}: {str(e)}")
                     continue
+            if pending_findings:
+                await supabase_client.upsert_inference_findings(pending_findings)
             async with self:
                 self.last_run_timestamp = datetime.now(timezone.utc).isoformat()
                 from app.states.risk_intelligence_state import RiskIntelligenceState
@@ -100,9 +100,7 @@ class IntegrationState(rx.State):
         async with self:
             self.is_correlating = True
             risk_intel_state = await self.get_state(RiskIntelligenceState)
-            finding = next(
-                (f for f in risk_intel_state.all_cves if f["cve_id"] == cve_id), None
-            )
+            finding = risk_intel_state._find_cve(cve_id)
         if not finding:
             yield rx.toast.error(f"Finding {cve_id} not found.")
             async with self:
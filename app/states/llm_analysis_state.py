@@ -183,8 +183,17 @@ class LlmAnalysisState(rx.State):
                 self.is_analyzing = False
             yield rx.toast.error(self.error_message)
             return
+        hold = None
         if not is_byok:
-            await supabase_client.deduct_credits(org_id, provider_cost)
+            hold = await supabase_client.reserve_credits(
+                org_id, provider_cost, f"llm_analysis:{cve_id}"
+            )
+            if hold is None:
+                async with self:
+                    self.error_message = "Insufficient credits for this analysis."
+                    self.is_analyzing = False
+                yield rx.toast.error(self.error_message)
+                return
             async with self:
                 self.org_credits -= provider_cost
         try:
@@ -231,14 +240,16 @@ class LlmAnalysisState(rx.State):
                 1500,
                 False,
             )
+            if hold is not None:
+                await supabase_client.commit_credits(hold)
             async with self:
                 self.analysis_result[cve_id] = parsed_result
         except Exception as e:
             logging.exception(f"LLM analysis failed for {cve_id}: {e}")
             async with self:
                 self.error_message = f"Analysis failed: {e}"
-            if not is_byok:
-                await supabase_client.refund_credits(org_id, provider_cost)
+            if hold is not None:
+                await supabase_client.release_credits(hold)
                 async with self:
                     self.org_credits += provider_cost
             yield rx.toast.error("Analysis failed. Credits refunded.")
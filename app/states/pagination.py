@@ -0,0 +1,87 @@
+import reflex as rx
+
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZE_OPTIONS = ["25", "50", "100", "250"]
+
+
+class PaginationMixin(rx.State, mixin=True):
+    """Server-side windowing for large result tables.
+
+    The full filtered result lives in backend-only vars and only the current
+    window of page_size rows is sent to the browser, so payloads stay the same
+    size however many rows match. cursor is the offset of the first row on the
+    page. States override _refresh_page() to slice their result via _window();
+    when the stored result is gone it returns the event that reloads it, and
+    the paging events pass that event on.
+    """
+
+    cursor: int = 0
+    page_size: int = DEFAULT_PAGE_SIZE
+    total_count: int = 0
+
+    def _window(self, rows: list) -> list:
+        """Clamp the cursor to rows and return the current page of them."""
+        self.total_count = len(rows)
+        if self.total_count == 0:
+            self.cursor = 0
+        else:
+            last_page_start = (self.total_count - 1) // self.page_size * self.page_size
+            self.cursor = max(
+                0, min(self.cursor - self.cursor % self.page_size, last_page_start)
+            )
+        return rows[self.cursor : self.cursor + self.page_size]
+
+    def _refresh_page(self):
+        """Show the page at cursor; without an override there are no rows to page."""
+        self._window([])
+
+    @rx.var
+    def page_number(self) -> int:
+        return self.cursor // self.page_size + 1
+
+    @rx.var
+    def page_count(self) -> int:
+        return max(1, -(-self.total_count // self.page_size))
+
+    @rx.var
+    def has_prev_page(self) -> bool:
+        return self.cursor > 0
+
+    @rx.var
+    def has_next_page(self) -> bool:
+        return self.cursor + self.page_size < self.total_count
+
+    @rx.var
+    def page_range_label(self) -> str:
+        if self.total_count == 0:
+            return "No results"
+        end = min(self.cursor + self.page_size, self.total_count)
+        return f"Showing {self.cursor + 1:,}-{end:,} of {self.total_count:,}"
+
+    @rx.event
+    def next_page(self):
+        if self.cursor + self.page_size < self.total_count:
+            self.cursor += self.page_size
+            return self._refresh_page()
+
+    @rx.event
+    def prev_page(self):
+        if self.cursor > 0:
+            self.cursor = max(0, self.cursor - self.page_size)
+            return self._refresh_page()
+
+    @rx.event
+    def first_page(self):
+        self.cursor = 0
+        return self._refresh_page()
+
+    @rx.event
+    def last_page(self):
+        self.cursor = max(0, self.total_count - 1)
+        return self._refresh_page()
+
+    @rx.event
+    def set_page_size(self, size: str):
+        self.page_size = int(size)
+        self.cursor = 0
+        return self._refresh_page()
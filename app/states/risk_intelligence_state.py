@@ -3,6 +3,12 @@ from typing import TypedDict, Any
 from app.states.framework_state import FrameworkState
 from app.states.risk_scoring_state import RiskScoringState
 from app.state import AppState
+from app.services.lev_engine import lev_engine
+from app.services.risk_scoring_engine import portfolio_risk_scorer
+from app.services.score_component_store import score_component_store
+from app.states.pagination import PaginationMixin
+from app.utils import dataset_aggregates
+from app.utils.dataset_store import dataset_store, session_scope
 import asyncio
 import random
 from datetime import datetime, timedelta
@@ -22,11 +28,12 @@ class CveRiskData(TypedDict):
     published_date: str
 
 
-class RiskIntelligenceState(rx.State):
+class RiskIntelligenceState(PaginationMixin, rx.State):
     """State for the Risk Intelligence dashboard."""
 
-    all_cves: list[CveRiskData] = []
-    filtered_cves: list[CveRiskData] = []
+    _cves_handle: str = ""
+    _view_handle: str = ""
+    page_cves: list[CveRiskData] = []
     is_loading: bool = True
     sort_by: tuple[str, str] = ("universal_risk_score", "desc")
     selected_cve: CveRiskData | None = None
@@ -55,24 +62,121 @@ class RiskIntelligenceState(rx.State):
                     "epss_score": epss,
                     "is_kev": i % 10 == 0,
                     "ssvc_decision": ssvc_decisions[i % len(ssvc_decisions)],
-                    "lev_score": round(min(1.0, epss * 1.25), 4),
+                    "lev_score": round(lev_engine.score_series([epss] * 30), 4),
                     "agreement": round(random.uniform(0.6, 1.0), 2),
                     "conflicts": conflicts,
                     "published_date": (datetime.now() - timedelta(days=i)).isoformat(),
                 }
             )
         async with self:
-            self.all_cves = cves
-            self.filtered_cves = cves
+            self._cves_handle = dataset_store.put(
+                session_scope(self), "risk_intelligence_cves", cves
+            )
             self.is_loading = False
             self._apply_sorting()
 
+    def apply_reranked(self, findings: list[dict], weights: dict[str, float]):
+        """Re-score and re-order the loaded table under new scoring weights.
+
+        findings is the re-ranked top-N of the portfolio; those rows take their
+        exact new scores and any not yet loaded are added. Every other loaded
+        row is re-scored from its own framework columns, so totals, paging and
+        the score distribution still cover the whole dataset.
+        """
+        cves = [dict(cve) for cve in dataset_store.data(self._cves_handle, [])]
+        if cves:
+            scored = portfolio_risk_scorer.score(
+                [cve["cvss_score"] for cve in cves],
+                [cve["epss_score"] for cve in cves],
+                [cve["is_kev"] for cve in cves],
+                portfolio_risk_scorer.encode_ssvc([cve["ssvc_decision"] for cve in cves]),
+                weights,
+                lev=[cve["lev_score"] for cve in cves],
+            )
+            for cve, score in zip(cves, scored["universal_risk_score"]):
+                cve["universal_risk_score"] = float(score)
+        by_id = {cve["cve_id"]: cve for cve in cves}
+        for f in findings:
+            cve = by_id.get(f["cve_id"])
+            if cve is None:
+                cve = {
+                    "cve_id": f["cve_id"],
+                    "description": f.get("description") or "",
+                    "cvss_score": float(f.get("cvss_v3_score") or 0.0),
+                    "epss_score": float(f.get("epss_score") or 0.0),
+                    "is_kev": bool(f.get("is_kev")),
+                    "ssvc_decision": f.get("ssvc_decision") or "",
+                    "lev_score": float(f.get("lev_score") or 0.0),
+                    "agreement": float(f.get("framework_agreement") or 0.0),
+                    "conflicts": f.get("conflict_flags") or [],
+                    "published_date": "",
+                }
+                by_id[f["cve_id"]] = cve
+                cves.append(cve)
+            cve["universal_risk_score"] = f["universal_risk_score"]
+        self._cves_handle = dataset_store.put(
+            session_scope(self), "risk_intelligence_cves", cves
+        )
+        return self._apply_sorting()
+
+    def apply_enriched(self, results: dict[str, dict]):
+        """Merge freshly enriched and scored framework data into the loaded rows."""
+        if not results:
+            return None
+        cves = []
+        for cve in dataset_store.data(self._cves_handle, []):
+            enriched = results.get(cve["cve_id"])
+            if enriched is not None:
+                cve = {
+                    **cve,
+                    "universal_risk_score": enriched["universal_risk_score"],
+                    "cvss_score": float(enriched.get("cvss_score") or 0.0),
+                    "epss_score": float(enriched.get("epss_score") or 0.0),
+                    "is_kev": bool(enriched.get("is_kev")),
+                    "ssvc_decision": enriched.get("decision") or "",
+                    "lev_score": float(enriched.get("lev_score") or 0.0),
+                    "agreement": enriched["framework_agreement"],
+                    "conflicts": enriched["conflict_flags"],
+                }
+            cves.append(cve)
+        self._cves_handle = dataset_store.put(
+            session_scope(self), "risk_intelligence_cves", cves
+        )
+        return self._apply_sorting()
+
     def _apply_sorting(self):
+        if dataset_store.is_missing(self._cves_handle):
+            return self._refresh_page()
         key, order = self.sort_by
         reverse = order == "desc"
-        self.filtered_cves = sorted(
-            self.filtered_cves, key=lambda cve: cve.get(key, 0) or 0, reverse=reverse
+        self._view_handle = dataset_store.put(
+            session_scope(self),
+            "risk_intelligence_view",
+            sorted(
+                dataset_store.data(self._cves_handle, []),
+                key=lambda cve: cve.get(key, 0) or 0,
+                reverse=reverse,
+            ),
+        )
+        self.cursor = 0
+        return self._refresh_page()
+
+    def _refresh_page(self):
+        if dataset_store.is_missing(self._cves_handle):
+            self.page_cves = self._window([])
+            return None if self.is_loading else RiskIntelligenceState.load_all_cve_data
+        if dataset_store.is_missing(self._view_handle):
+            return self._apply_sorting()
+        self.page_cves = self._window(dataset_store.data(self._view_handle, []))
+
+    def _find_cve(self, cve_id: str) -> CveRiskData | None:
+        dataset = dataset_store.get(self._cves_handle)
+        if dataset is None:
+            return None
+        by_id = dataset.derived(
+            "by_cve_id", lambda cves: {cve["cve_id"]: cve for cve in cves}
         )
+        return by_id.get(cve_id)
 
     @rx.event
     def set_sort(self, key: str):
@@ -80,7 +184,27 @@ class RiskIntelligenceState(rx.State):
             self.sort_by = (key, "asc" if self.sort_by[1] == "desc" else "desc")
         else:
             self.sort_by = (key, "desc")
-        self._apply_sorting()
+        return self._apply_sorting()
+
+    @rx.event
+    async def refresh_frameworks(self):
+        """Re-enrich the loaded CVEs the organization has findings for, in one batch.
+
+        Rows that are not persisted findings, such as the sample data, are
+        skipped so they are never looked up upstream or written to the org.
+        """
+        app_state = await self.get_state(AppState)
+        org_id = app_state.active_organization_id
+        portfolio = await score_component_store.get_portfolio(org_id) if org_id else None
+        persisted = {row["cve_id"] for row in portfolio["rows"]} if portfolio else set()
+        cve_ids = [
+            cve["cve_id"]
+            for cve in dataset_store.data(self._cves_handle, [])
+            if cve["cve_id"] in persisted
+        ]
+        if not cve_ids:
+            return rx.toast.info("No tracked findings loaded to refresh.")
+        return FrameworkState.enrich_cves(cve_ids)
 
     @rx.event
     def show_cve_details(self, cve: CveRiskData):
@@ -92,13 +216,9 @@ class RiskIntelligenceState(rx.State):
         self.show_detail_modal = False
         self.selected_cve = None
 
-    @rx.var
+    @rx.var(cache=True)
     def score_distribution(self) -> list[dict]:
-        dist = {i * 10: 0 for i in range(11)}
-        for cve in self.all_cves:
-            bucket = int(cve["universal_risk_score"] // 10) * 10
-            dist[bucket] += 1
-        return [{"range": f"{k}-{k + 9}", "count": v} for k, v in dist.items()]
+        return dataset_aggregates.risk_score_distribution(self._cves_handle)
 
     @rx.var
     def selected_cve_breakdown(self) -> list[dict]:
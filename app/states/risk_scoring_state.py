@@ -1,6 +1,10 @@
 import reflex as rx
+import logging
 from typing import TypedDict, Any
 from app.states.framework_state import FrameworkState
+from app.services.risk_scoring_engine import portfolio_risk_scorer, universal_score
+from app.services.score_component_store import score_component_store
+from app.utils import supabase_client
 
 
 class RiskScoringState(rx.State):
@@ -14,101 +18,63 @@ class RiskScoringState(rx.State):
         "lev": 0.0,
     }
 
-    def _map_ssvc_to_numeric(self, ssvc_decision: str | None) -> int:
-        """Map SSVC decision to a numeric value for scoring."""
-        return {"Act": 100, "Attend": 70, "Track*": 50, "Track": 20}.get(
-            ssvc_decision, 0
-        )
+    @rx.event
+    def compute_universal_score(self, framework_data: dict) -> dict[str, Any]:
+        """Calculate universal risk score (0-100) from all framework inputs."""
+        return universal_score(framework_data, self.scoring_weights)
 
-    def _normalize_score(
-        self, score: float, source_range: tuple, target_range: tuple
-    ) -> float:
-        """Normalize a score from a source range to a target range."""
-        s_min, s_max = source_range
-        t_min, t_max = target_range
-        if s_max - s_min == 0:
-            return t_min
-        return t_min + (score - s_min) * (t_max - t_min) / (s_max - s_min)
+    def compute_portfolio_scores(self, records: list[dict]) -> list[dict[str, Any]]:
+        """Score many framework dicts in one vectorized pass with the current weights."""
+        if not records:
+            return []
+        scored = portfolio_risk_scorer.score_records(records, self.scoring_weights)
+        return portfolio_risk_scorer.to_results(scored)
 
-    def _calculate_cohen_kappa(self, scores: list[dict]) -> float:
-        """A mock calculation for inter-rater agreement among frameworks."""
-        if len(scores) < 2:
-            return 1.0
-        numeric_scores = [
-            s["normalized_score"]
-            for s in scores
-            if s.get("normalized_score") is not None
-        ]
-        if not numeric_scores or len(numeric_scores) < 2:
-            return 0.0
-        mean_score = sum(numeric_scores) / len(numeric_scores)
-        variance = sum(((x - mean_score) ** 2 for x in numeric_scores)) / len(
-            numeric_scores
-        )
-        agreement = 1 - variance / 2500
-        return max(0.0, min(1.0, agreement))
+    async def rerank_active_portfolio(self) -> int:
+        """Re-rank the active organization's findings from persisted components.
 
-    def _identify_conflicts(self, scores: dict, threshold: float = 30.0) -> list[str]:
-        """Identify significant conflicts between framework scores."""
-        conflicts = []
-        cvss = scores.get("cvss_score", 0.0) or 0.0
-        epss = scores.get("epss_score", 0.0) or 0.0
-        if cvss >= 7.0 and epss < 0.02:
-            conflicts.append("High CVSS, Low EPSS")
-        if cvss < 5.0 and epss > 0.5:
-            conflicts.append("Low CVSS, High EPSS")
-        if scores.get("is_kev") and cvss < 7.0:
-            conflicts.append("KEV with non-High CVSS")
-        return conflicts
+        Re-scores the Risk Intelligence table with the new top-N and returns how
+        many findings were ranked.
+        """
+        from app.state import AppState
+        from app.states.risk_intelligence_state import RiskIntelligenceState
 
-    def _calculate_confidence(self, scores: dict, agreement: float) -> float:
-        """Calculate a confidence score based on data availability and agreement."""
-        num_frameworks = len([s for s in scores if scores.get(s) is not None])
-        base_confidence = self._normalize_score(num_frameworks, (1, 11), (0.5, 1.0))
-        return min(1.0, base_confidence * (0.8 + agreement * 0.2))
+        app_state = await self.get_state(AppState)
+        org_id = app_state.active_organization_id
+        if not org_id:
+            return 0
+        top_findings = await score_component_store.rerank(org_id, self.scoring_weights)
+        if top_findings:
+            risk_intel_state = await self.get_state(RiskIntelligenceState)
+            risk_intel_state.apply_reranked(top_findings, self.scoring_weights)
+        return len(top_findings)
 
-    @rx.event
-    def compute_universal_score(self, framework_data: dict) -> dict[str, Any]:
-        """Calculate universal risk score (0-100) from all framework inputs."""
-        cvss_score = framework_data.get("cvss_score", 0.0) or 0.0
-        epss_score = framework_data.get("epss_score", 0.0) or 0.0
-        is_kev = framework_data.get("is_kev", False)
-        ssvc_decision = framework_data.get("decision")
-        cvss_normalized = self._normalize_score(cvss_score, (0, 10), (0, 100))
-        epss_normalized = epss_score * 100
-        ssvc_numeric = self._map_ssvc_to_numeric(ssvc_decision)
-        kev_bonus = 20 if is_kev else 0
-        universal_score = (
-            cvss_normalized * self.scoring_weights["cvss"]
-            + epss_normalized * self.scoring_weights["epss"]
-            + ssvc_numeric * self.scoring_weights["ssvc"]
+    async def record_weight_change(self, change_reason: str = "manual_update"):
+        """Append the current weights to the organization's weight history."""
+        from app.state import AppState
+        from app.states.auth_state import AuthState
+
+        app_state = await self.get_state(AppState)
+        if not app_state.active_organization_id:
+            return
+        auth_state = await self.get_state(AuthState)
+        await supabase_client.insert_weight_history(
+            app_state.active_organization_id,
+            dict(self.scoring_weights),
+            auth_state.user_id,
+            change_reason,
         )
-        final_score = min(100, universal_score + kev_bonus)
-        normalized_scores_for_kappa = [
-            {"name": "cvss", "normalized_score": cvss_normalized},
-            {"name": "epss", "normalized_score": epss_normalized},
-        ]
-        agreement = self._calculate_cohen_kappa(normalized_scores_for_kappa)
-        confidence = self._calculate_confidence(framework_data, agreement)
-        conflicts = self._identify_conflicts(framework_data)
-        return {
-            "universal_risk_score": round(final_score, 2),
-            "breakdown": {
-                "cvss_points": round(cvss_normalized * self.scoring_weights["cvss"], 2),
-                "epss_points": round(epss_normalized * self.scoring_weights["epss"], 2),
-                "ssvc_points": round(ssvc_numeric * self.scoring_weights["ssvc"], 2),
-                "kev_bonus": kev_bonus,
-            },
-            "framework_agreement": round(agreement, 2),
-            "scoring_confidence": round(confidence, 2),
-            "conflict_flags": conflicts,
-        }
 
     @rx.event
-    def adjust_weight(self, framework: str, new_weight: float):
-        """Update scoring weight for a framework (for UI sliders)."""
+    async def adjust_weight(self, framework: str, new_weight: float):
+        """Update scoring weight for a framework and re-rank the portfolio."""
         if framework in self.scoring_weights:
             self.scoring_weights[framework] = new_weight
+            try:
+                await self.rerank_active_portfolio()
+                await self.record_weight_change()
+            except Exception as e:
+                logging.exception(f"Failed to re-rank portfolio after weight change: {e}")
             return rx.toast.info(
                 f"Weight for {framework.upper()} updated to {new_weight:.2f}"
             )
@@ -1,5 +1,9 @@
 import reflex as rx
+import csv
+import io
+import logging
 from typing import Literal, Optional, TypedDict
+from app.services.ssvc_engine import BULK_CSV_COLUMNS, DECISIONS, ssvc_calculator_table
 
 Question = Literal["exploitation", "technical_impact", "automatable", "mission_impact"]
 Answer = Literal[
@@ -16,6 +20,7 @@ Answer = Literal[
     "low",
 ]
 Decision = Literal["Track", "Track*", "Attend", "Act"]
+BULK_PREVIEW_ROWS = 100
 
 
 class Option(TypedDict):
@@ -71,6 +76,59 @@ class SsvcCalculatorState(rx.State):
         "mission_impact": None,
     }
 
+    is_processing_bulk: bool = False
+    bulk_file_name: str = ""
+    bulk_preview: list[dict[str, str]] = []
+    bulk_counts: dict[str, int] = {}
+    bulk_total: int = 0
+    bulk_invalid: int = 0
+    _bulk_rows: list[dict[str, str]] = []
+
+    @rx.event
+    async def handle_bulk_upload(self, files: list[rx.UploadFile]):
+        """Score every row of an uploaded CSV against the compiled SSVC table."""
+        if not files:
+            return rx.toast.error("No CSV file selected.")
+        self.is_processing_bulk = True
+        try:
+            file = files[0]
+            text = (await file.read()).decode("utf-8-sig")
+            rows, invalid = ssvc_calculator_table.decide_csv(text)
+            self._bulk_rows = rows
+            self.bulk_file_name = file.name
+            self.bulk_preview = rows[:BULK_PREVIEW_ROWS]
+            self.bulk_total = len(rows)
+            self.bulk_invalid = invalid
+            self.bulk_counts = {
+                d: sum((1 for r in rows if r["decision"] == d)) for d in DECISIONS
+            }
+            return rx.toast.success(f"Scored {len(rows) - invalid} of {len(rows)} rows.")
+        except ValueError as e:
+            return rx.toast.error(str(e))
+        except Exception as e:
+            logging.exception(f"SSVC bulk CSV processing failed: {e}")
+            return rx.toast.error("Could not process the CSV file.")
+        finally:
+            self.is_processing_bulk = False
+
+    @rx.event
+    def download_bulk_results(self):
+        """Download the scored CSV with a decision column appended."""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=BULK_CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(self._bulk_rows)
+        return rx.download(data=output.getvalue(), filename="ssvc_decisions.csv")
+
+    @rx.event
+    def clear_bulk_results(self):
+        self._bulk_rows = []
+        self.bulk_file_name = ""
+        self.bulk_preview = []
+        self.bulk_counts = {}
+        self.bulk_total = 0
+        self.bulk_invalid = 0
+
     @rx.var
     def active_question_key(self) -> str:
         """Get the key for the current question based on the step."""
@@ -116,30 +174,15 @@ class SsvcCalculatorState(rx.State):
         """Calculate the SSVC decision based on the user's answers."""
         if self.current_step < len(QUESTIONS):
             return None
-        expl = self.answers["exploitation"]
-        tech = self.answers["technical_impact"]
-        auto = self.answers["automatable"]
-        mission = self.answers["mission_impact"]
-        if expl == "active":
-            return "Act"
-        if expl == "poc":
-            if mission in ["critical", "high"]:
-                return "Act"
-            if mission == "medium":
-                return "Attend"
-            if mission == "low":
-                return "Track"
-        if expl == "none":
-            if tech == "total":
-                if auto == "yes":
-                    if mission in ["critical", "high"]:
-                        return "Attend"
-                    return "Track*"
-                else:
-                    return "Track*"
-            else:
-                return "Track"
-        return "Track"
+        return (
+            ssvc_calculator_table.decide(
+                self.answers["exploitation"],
+                self.answers["technical_impact"],
+                self.answers["automatable"],
+                self.answers["mission_impact"],
+            )
+            or "Track"
+        )
 
     @rx.var
     def decision_rationale(self) -> str:
@@ -13,6 +13,5 @@ class TechStackState(rx.State):
     """State for managing the technology stack and related data."""
 
     is_loading: bool = False
-    unenriched_cves: list[dict] = []
     tech_stack: list[str] = ["PostgreSQL", "Windows Server"]
     new_tech_stack_item: str = ""
\ No newline at end of file
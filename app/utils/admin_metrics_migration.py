@@ -0,0 +1,114 @@
+import reflex as rx
+
+ADMIN_METRICS_MIGRATION_SCRIPT = """
+-- === Phase 1: Admin Metrics Rollups ===
+
+-- Per-customer summary with tracked CVE counts, so the customer list is one indexed read
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.admin_customer_summary AS
+SELECT
+    o.id,
+    o.name,
+    o.created_at,
+    o.status,
+    o.tech_stack_count,
+    o.subscription_tier,
+    o.subscription_status,
+    o.stripe_customer_id,
+    o.ai_credits,
+    o.domain,
+    o.company_size,
+    o.industry,
+    COALESCE(t.tracked_cves, 0) AS tracked_cves
+FROM public.organizations o
+LEFT JOIN (
+    SELECT organization_id, COUNT(*) AS tracked_cves
+    FROM public.tracked_cves
+    GROUP BY organization_id
+) t ON t.organization_id = o.id;
+COMMENT ON MATERIALIZED VIEW public.admin_customer_summary IS 'Per-organization admin summary, refreshed by refresh_admin_metrics().';
+
+-- Single-row KPI rollup read by the admin console
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.admin_kpis AS
+SELECT
+    1 AS id,
+    COUNT(*) FILTER (WHERE status = 'active') AS active_customers,
+    COUNT(*) AS total_customers,
+    COALESCE(SUM(tracked_cves), 0) AS total_tracked_cves,
+    (SELECT COUNT(DISTINCT cve_id) FROM public.tracked_cves) AS unique_tracked_cves,
+    COALESCE(ROUND(AVG(tech_stack_count) FILTER (WHERE status = 'active'), 2), 0) AS average_tech_stack_size,
+    NOW() AS refreshed_at
+FROM public.admin_customer_summary;
+COMMENT ON MATERIALIZED VIEW public.admin_kpis IS 'Admin console KPIs, refreshed by refresh_admin_metrics().';
+
+
+-- === Phase 2: Indexes ===
+
+-- Unique indexes let both views refresh CONCURRENTLY without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS idx_admin_customer_summary_id ON public.admin_customer_summary(id);
+CREATE INDEX IF NOT EXISTS idx_admin_customer_summary_name ON public.admin_customer_summary(name);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_admin_kpis_id ON public.admin_kpis(id);
+
+
+-- === Phase 3: Functions ===
+
+-- Materialized views bypass RLS, so reads go through admin-checked functions
+CREATE OR REPLACE FUNCTION public.is_platform_admin()
+RETURNS BOOLEAN AS $$
+    SELECT auth.role() = 'service_role'
+        OR COALESCE((SELECT role = 'admin' FROM public.users WHERE id = auth.uid()), FALSE);
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- Recompute both rollups; called on a schedule by the app
+CREATE OR REPLACE FUNCTION public.refresh_admin_metrics()
+RETURNS TIMESTAMPTZ AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY public.admin_customer_summary;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY public.admin_kpis;
+    RETURN (SELECT refreshed_at FROM public.admin_kpis WHERE id = 1);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- All admin KPIs in one call, read from the single-row rollup
+CREATE OR REPLACE FUNCTION public.get_admin_kpis()
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'active_customers', k.active_customers,
+        'total_customers', k.total_customers,
+        'total_tracked_cves', k.total_tracked_cves,
+        'unique_tracked_cves', k.unique_tracked_cves,
+        'average_tech_stack_size', k.average_tech_stack_size,
+        'refreshed_at', k.refreshed_at
+    )
+    FROM public.admin_kpis k
+    WHERE k.id = 1 AND public.is_platform_admin();
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- One page of the customer list from the summary
+CREATE OR REPLACE FUNCTION public.get_admin_customer_summary(page_limit INTEGER DEFAULT 100, page_offset INTEGER DEFAULT 0)
+RETURNS SETOF public.admin_customer_summary AS $$
+    SELECT *
+    FROM public.admin_customer_summary
+    WHERE public.is_platform_admin()
+    ORDER BY name
+    LIMIT page_limit OFFSET page_offset;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+
+-- === Final Grant Statements ===
+
+REVOKE ALL ON public.admin_customer_summary FROM anon, authenticated;
+REVOKE ALL ON public.admin_kpis FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_admin_kpis() TO authenticated;
+GRANT EXECUTE ON FUNCTION public.get_admin_customer_summary(INTEGER, INTEGER) TO authenticated;
+-- Full view refreshes run only from the scheduler's service role
+REVOKE EXECUTE ON FUNCTION public.refresh_admin_metrics() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.refresh_admin_metrics() TO service_role;
+
+SELECT 'SUCCESS: Admin metrics rollups have been applied.';
+
+"""
+
+
+def get_admin_metrics_migration_script() -> str:
+    """Returns the SQL migration script for the admin metrics rollups."""
+    return ADMIN_METRICS_MIGRATION_SCRIPT
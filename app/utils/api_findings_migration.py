@@ -0,0 +1,247 @@
+import reflex as rx
+
+API_FINDINGS_MIGRATION_SCRIPT = """
+-- === Phase 1: Severity Column ===
+
+-- CVSS v3 qualitative severity, derived in the row so API filters can use an index
+ALTER TABLE public.framework_scores ADD COLUMN IF NOT EXISTS cvss_severity TEXT GENERATED ALWAYS AS (
+    CASE
+        WHEN cvss_v3_score IS NULL THEN NULL
+        WHEN cvss_v3_score >= 9.0 THEN 'CRITICAL'
+        WHEN cvss_v3_score >= 7.0 THEN 'HIGH'
+        WHEN cvss_v3_score >= 4.0 THEN 'MEDIUM'
+        WHEN cvss_v3_score > 0 THEN 'LOW'
+        ELSE 'NONE'
+    END
+) STORED;
+COMMENT ON COLUMN public.framework_scores.cvss_severity IS 'CVSS v3 severity band of cvss_v3_score.';
+
+
+-- === Phase 2: Keyset Indexes ===
+
+-- The public API pages findings by risk score (unscored last), then CVE ID
+CREATE INDEX IF NOT EXISTS idx_framework_scores_api_order
+    ON public.framework_scores(organization_id, (COALESCE(universal_risk_score, -1)) DESC, cve_id);
+CREATE INDEX IF NOT EXISTS idx_framework_scores_api_severity
+    ON public.framework_scores(organization_id, cvss_severity, (COALESCE(universal_risk_score, -1)) DESC, cve_id);
+CREATE INDEX IF NOT EXISTS idx_framework_scores_api_kev
+    ON public.framework_scores(organization_id, (COALESCE(universal_risk_score, -1)) DESC, cve_id)
+    WHERE is_kev;
+
+
+-- === Phase 3: Functions ===
+
+-- One page of an organization's findings with their inference results.
+-- Pass the last row's sort_score and cve_id as the cursor to get the next page.
+CREATE OR REPLACE FUNCTION public.api_list_vulnerabilities(
+    p_organization_id UUID,
+    p_severity TEXT DEFAULT NULL,
+    p_is_kev BOOLEAN DEFAULT NULL,
+    p_cursor_score NUMERIC DEFAULT NULL,
+    p_cursor_cve TEXT DEFAULT NULL,
+    p_cve_id TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 100
+)
+RETURNS TABLE (
+    cve_id TEXT,
+    severity TEXT,
+    universal_risk_score NUMERIC,
+    sort_score NUMERIC,
+    cvss_v3_score NUMERIC,
+    cvss_v3_vector TEXT,
+    epss_score NUMERIC,
+    epss_percentile NUMERIC,
+    is_kev BOOLEAN,
+    kev_date_added DATE,
+    kev_due_date DATE,
+    ssvc_decision TEXT,
+    lev_score NUMERIC,
+    recommended_action TEXT,
+    last_updated TIMESTAMPTZ,
+    inference JSONB
+) AS $$
+    SELECT
+        f.cve_id,
+        COALESCE(f.cvss_severity, i.predicted_severity),
+        f.universal_risk_score,
+        COALESCE(f.universal_risk_score, -1),
+        f.cvss_v3_score,
+        f.cvss_v3_vector,
+        f.epss_score,
+        f.epss_percentile,
+        f.is_kev,
+        f.kev_date_added,
+        f.kev_due_date,
+        f.ssvc_decision,
+        f.lev_score,
+        f.recommended_action,
+        f.last_updated,
+        CASE WHEN i.id IS NULL THEN NULL ELSE jsonb_build_object(
+            'predicted_severity', i.predicted_severity,
+            'severity_confidence', i.severity_confidence,
+            'predicted_epss', i.predicted_epss,
+            'exploitation_likelihood', i.exploitation_likelihood,
+            'risk_category', i.risk_category,
+            'confidence_score', i.confidence_score,
+            'model_version', i.model_version
+        ) END
+    FROM public.framework_scores f
+    LEFT JOIN public.inference_findings i
+        ON i.organization_id = f.organization_id AND i.cve_id = f.cve_id
+    WHERE f.organization_id = p_organization_id
+        AND (p_cve_id IS NULL OR f.cve_id = p_cve_id)
+        AND (p_severity IS NULL OR f.cvss_severity = p_severity
+             OR (f.cvss_severity IS NULL AND i.predicted_severity = p_severity))
+        AND (p_is_kev IS NULL OR f.is_kev = p_is_kev)
+        AND (
+            p_cursor_score IS NULL
+            OR COALESCE(f.universal_risk_score, -1) < p_cursor_score
+            OR (COALESCE(f.universal_risk_score, -1) = p_cursor_score AND f.cve_id > p_cursor_cve)
+        )
+    ORDER BY COALESCE(f.universal_risk_score, -1) DESC, f.cve_id
+    LIMIT LEAST(GREATEST(p_limit, 1), 1000);
+$$ LANGUAGE sql STABLE;
+
+
+-- === Phase 4: Bulk Export ===
+
+-- Exports walk findings in change order so since= pulls only read new rows
+CREATE INDEX IF NOT EXISTS idx_framework_scores_export
+    ON public.framework_scores(organization_id, (COALESCE(last_updated, 'epoch'::timestamptz)), cve_id);
+
+-- One batch of an organization's findings in change order, flattened for NDJSON/CSV.
+-- p_since is inclusive; pass the last row's last_updated and cve_id as the cursor for the next batch.
+-- Batches stay within PostgREST's default max-rows of 1000.
+CREATE OR REPLACE FUNCTION public.api_export_findings(
+    p_organization_id UUID,
+    p_since TIMESTAMPTZ DEFAULT NULL,
+    p_cursor_updated TIMESTAMPTZ DEFAULT NULL,
+    p_cursor_cve TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 1000
+)
+RETURNS TABLE (
+    cve_id TEXT,
+    last_updated TIMESTAMPTZ,
+    severity TEXT,
+    universal_risk_score NUMERIC,
+    cvss_v3_score NUMERIC,
+    cvss_v3_vector TEXT,
+    epss_score NUMERIC,
+    epss_percentile NUMERIC,
+    is_kev BOOLEAN,
+    kev_date_added DATE,
+    kev_due_date DATE,
+    ssvc_decision TEXT,
+    lev_score NUMERIC,
+    recommended_action TEXT,
+    predicted_severity TEXT,
+    exploitation_likelihood TEXT,
+    risk_category TEXT,
+    inference_confidence NUMERIC
+) AS $$
+    SELECT
+        f.cve_id,
+        COALESCE(f.last_updated, 'epoch'::timestamptz),
+        COALESCE(f.cvss_severity, i.predicted_severity),
+        f.universal_risk_score,
+        f.cvss_v3_score,
+        f.cvss_v3_vector,
+        f.epss_score,
+        f.epss_percentile,
+        f.is_kev,
+        f.kev_date_added,
+        f.kev_due_date,
+        f.ssvc_decision,
+        f.lev_score,
+        f.recommended_action,
+        i.predicted_severity,
+        i.exploitation_likelihood,
+        i.risk_category,
+        i.confidence_score
+    FROM public.framework_scores f
+    LEFT JOIN public.inference_findings i
+        ON i.organization_id = f.organization_id AND i.cve_id = f.cve_id
+    WHERE f.organization_id = p_organization_id
+        AND (p_since IS NULL OR COALESCE(f.last_updated, 'epoch'::timestamptz) >= p_since)
+        AND (
+            p_cursor_updated IS NULL
+            OR (COALESCE(f.last_updated, 'epoch'::timestamptz), f.cve_id) > (p_cursor_updated, p_cursor_cve)
+        )
+    ORDER BY COALESCE(f.last_updated, 'epoch'::timestamptz), f.cve_id
+    LIMIT LEAST(GREATEST(p_limit, 1), 1000);
+$$ LANGUAGE sql STABLE;
+
+
+-- === Phase 5: Batch Lookup ===
+
+-- Scores for many CVEs at once: each store is read once by primary or unique
+-- key for the whole set. CVEs the organization does not track still get the
+-- shared CVSS and EPSS data.
+CREATE OR REPLACE FUNCTION public.api_batch_vulnerabilities(
+    p_organization_id UUID,
+    p_cve_ids TEXT[]
+)
+RETURNS TABLE (
+    cve_id TEXT,
+    tracked BOOLEAN,
+    universal_risk_score NUMERIC,
+    severity TEXT,
+    cvss_v3_score NUMERIC,
+    cvss_v3_vector TEXT,
+    epss_score NUMERIC,
+    epss_percentile NUMERIC,
+    epss_date DATE,
+    is_kev BOOLEAN,
+    ssvc_decision TEXT,
+    lev_score NUMERIC,
+    recommended_action TEXT,
+    inference JSONB
+) AS $$
+    SELECT
+        ids.cve_id,
+        f.id IS NOT NULL,
+        f.universal_risk_score,
+        COALESCE(f.cvss_severity, UPPER(n.severity), i.predicted_severity),
+        COALESCE(f.cvss_v3_score, n.cvss_score),
+        COALESCE(f.cvss_v3_vector, n.vector),
+        COALESCE(e.epss_score, f.epss_score),
+        COALESCE(e.percentile, f.epss_percentile),
+        e.score_date,
+        f.is_kev,
+        f.ssvc_decision,
+        f.lev_score,
+        f.recommended_action,
+        CASE WHEN i.id IS NULL THEN NULL ELSE jsonb_build_object(
+            'predicted_severity', i.predicted_severity,
+            'severity_confidence', i.severity_confidence,
+            'predicted_epss', i.predicted_epss,
+            'exploitation_likelihood', i.exploitation_likelihood,
+            'risk_category', i.risk_category,
+            'confidence_score', i.confidence_score,
+            'model_version', i.model_version
+        ) END
+    FROM (SELECT DISTINCT unnest(p_cve_ids) AS cve_id) ids
+    LEFT JOIN public.framework_scores f
+        ON f.organization_id = p_organization_id AND f.cve_id = ids.cve_id
+    LEFT JOIN public.inference_findings i
+        ON i.organization_id = p_organization_id AND i.cve_id = ids.cve_id
+    LEFT JOIN public.nvd_cve_mirror n ON n.cve_id = ids.cve_id
+    LEFT JOIN public.epss_scores e ON e.cve_id = ids.cve_id
+    WHERE f.id IS NOT NULL OR i.id IS NOT NULL OR n.cve_id IS NOT NULL OR e.cve_id IS NOT NULL;
+$$ LANGUAGE sql STABLE;
+
+
+-- === Final Grant Statements ===
+
+GRANT EXECUTE ON FUNCTION public.api_list_vulnerabilities(UUID, TEXT, BOOLEAN, NUMERIC, TEXT, TEXT, INTEGER) TO authenticated, service_role;
+GRANT EXECUTE ON FUNCTION public.api_export_findings(UUID, TIMESTAMPTZ, TIMESTAMPTZ, TEXT, INTEGER) TO authenticated, service_role;
+GRANT EXECUTE ON FUNCTION public.api_batch_vulnerabilities(UUID, TEXT[]) TO authenticated, service_role;
+
+SELECT 'SUCCESS: Public API findings queries have been applied.';
+
+"""
+
+
+def get_api_findings_migration_script() -> str:
+    """Returns the SQL migration script for the public API findings queries."""
+    return API_FINDINGS_MIGRATION_SCRIPT
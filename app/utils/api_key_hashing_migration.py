@@ -0,0 +1,33 @@
+import reflex as rx
+
+API_KEY_HASHING_MIGRATION_SCRIPT = """
+-- === Phase 1: Hashed API Key Columns ===
+
+-- hash_version 0 rows still hold the raw key body in key_hash; the app
+-- rehashes each one the first time it is used. New keys are written as
+-- hash_version 1 (HMAC-SHA256 of the full key).
+ALTER TABLE public.api_keys ADD COLUMN IF NOT EXISTS hash_version SMALLINT NOT NULL DEFAULT 0;
+ALTER TABLE public.api_keys ADD COLUMN IF NOT EXISTS key_hint TEXT;
+ALTER TABLE public.api_keys ALTER COLUMN hash_version SET DEFAULT 1;
+COMMENT ON COLUMN public.api_keys.hash_version IS '0 = legacy raw key body, 1 = HMAC-SHA256 of the full key.';
+COMMENT ON COLUMN public.api_keys.key_hint IS 'Last four characters of the key, for display only.';
+
+UPDATE public.api_keys
+SET key_hint = RIGHT(key_hash, 4)
+WHERE key_hint IS NULL AND hash_version = 0;
+
+
+-- === Phase 2: Indexes ===
+
+-- Authentication looks keys up by hash alone
+DROP INDEX IF EXISTS public.idx_api_keys_key_hash;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_api_keys_key_hash_active ON public.api_keys(key_hash) WHERE is_active;
+
+SELECT 'SUCCESS: Hashed API keys have been applied.';
+
+"""
+
+
+def get_api_key_hashing_migration_script() -> str:
+    """Returns the SQL migration script for hashed API keys."""
+    return API_KEY_HASHING_MIGRATION_SCRIPT
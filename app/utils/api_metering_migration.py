@@ -0,0 +1,126 @@
+import reflex as rx
+
+API_METERING_MIGRATION_SCRIPT = """
+-- === Phase 1: Aggregated Usage Rows ===
+
+-- The API meters requests in memory and writes one api_usage_log row per
+-- organization, key, endpoint, method and status each minute. Rows written
+-- one per request keep request_count 1 and leave the totals NULL.
+ALTER TABLE public.api_usage_log ADD COLUMN IF NOT EXISTS request_count INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE public.api_usage_log ADD COLUMN IF NOT EXISTS total_response_time_ms BIGINT;
+ALTER TABLE public.api_usage_log ADD COLUMN IF NOT EXISTS max_response_time_ms INTEGER;
+COMMENT ON COLUMN public.api_usage_log.request_count IS 'Requests this row stands for; 1 for per-request rows.';
+COMMENT ON COLUMN public.api_usage_log.response_time_ms IS 'Response time, or the mean over request_count for aggregated rows.';
+COMMENT ON COLUMN public.api_usage_log.total_response_time_ms IS 'Sum of response times over request_count; NULL for per-request rows.';
+COMMENT ON COLUMN public.api_usage_log.max_response_time_ms IS 'Slowest response among request_count; NULL for per-request rows.';
+
+
+-- === Phase 2: Plan Rate Limits ===
+
+-- A NULL rate_limit means the organization's plan limit applies. Keys still
+-- carrying the old blanket default are moved onto their plan.
+ALTER TABLE public.api_keys ALTER COLUMN rate_limit DROP DEFAULT;
+UPDATE public.api_keys SET rate_limit = NULL WHERE rate_limit = 1000;
+COMMENT ON COLUMN public.api_keys.rate_limit IS 'Requests per hour for this key; NULL uses the plan tier limit.';
+
+
+-- === Phase 3: Rollups ===
+
+-- api_usage_hourly counts requests by request_count and weights mean latency
+-- by it. p95 for aggregated rows is taken over per-minute means.
+CREATE OR REPLACE FUNCTION public.refresh_log_rollups(p_hours INTEGER DEFAULT 2)
+RETURNS TIMESTAMPTZ AS $$
+DECLARE
+    since TIMESTAMPTZ := date_trunc('hour', NOW()) - make_interval(hours => p_hours);
+BEGIN
+    INSERT INTO public.api_health_hourly
+        (hour, api_name, calls, failures, avg_duration_ms, p95_duration_ms, max_duration_ms, records_fetched)
+    SELECT
+        date_trunc('hour', start_time), api_name, COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'failure'),
+        ROUND(AVG(duration_ms), 2),
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms)::INTEGER,
+        MAX(duration_ms),
+        SUM(records_fetched)
+    FROM public.api_health_log
+    WHERE start_time >= since
+    GROUP BY 1, 2
+    ON CONFLICT (hour, api_name) DO UPDATE SET
+        calls = EXCLUDED.calls,
+        failures = EXCLUDED.failures,
+        avg_duration_ms = EXCLUDED.avg_duration_ms,
+        p95_duration_ms = EXCLUDED.p95_duration_ms,
+        max_duration_ms = EXCLUDED.max_duration_ms,
+        records_fetched = EXCLUDED.records_fetched;
+
+    INSERT INTO public.api_usage_hourly
+        (hour, organization_id, endpoint, requests, errors, avg_response_time_ms, p95_response_time_ms)
+    SELECT
+        date_trunc('hour', "timestamp"), organization_id, endpoint, SUM(request_count),
+        COALESCE(SUM(request_count) FILTER (WHERE status_code >= 400), 0),
+        ROUND(
+            SUM(COALESCE(total_response_time_ms, response_time_ms::BIGINT * request_count))::NUMERIC
+            / NULLIF(SUM(request_count) FILTER (WHERE response_time_ms IS NOT NULL), 0),
+            2
+        ),
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY response_time_ms)::INTEGER
+    FROM public.api_usage_log
+    WHERE "timestamp" >= since
+    GROUP BY 1, 2, 3
+    ON CONFLICT (hour, organization_id, endpoint) DO UPDATE SET
+        requests = EXCLUDED.requests,
+        errors = EXCLUDED.errors,
+        avg_response_time_ms = EXCLUDED.avg_response_time_ms,
+        p95_response_time_ms = EXCLUDED.p95_response_time_ms;
+
+    INSERT INTO public.llm_usage_hourly
+        (hour, organization_id, provider, model, analyses, cached_analyses, tokens_used, credits_charged, avg_duration_ms)
+    SELECT
+        date_trunc('hour', created_at), organization_id, COALESCE(provider, ''), COALESCE(model, ''),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE was_cached),
+        COALESCE(SUM(tokens_used), 0),
+        COALESCE(SUM(credits_charged), 0),
+        ROUND(AVG(analysis_duration_ms), 2)
+    FROM public.llm_usage_log
+    WHERE created_at >= since
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (hour, organization_id, provider, model) DO UPDATE SET
+        analyses = EXCLUDED.analyses,
+        cached_analyses = EXCLUDED.cached_analyses,
+        tokens_used = EXCLUDED.tokens_used,
+        credits_charged = EXCLUDED.credits_charged,
+        avg_duration_ms = EXCLUDED.avg_duration_ms;
+
+    INSERT INTO public.alert_hourly (hour, organization_id, severity, alerts)
+    SELECT date_trunc('hour', created_at), organization_id, severity, COUNT(*)
+    FROM public.alert_history
+    WHERE created_at >= since
+    GROUP BY 1, 2, 3
+    ON CONFLICT (hour, organization_id, severity) DO UPDATE SET alerts = EXCLUDED.alerts;
+
+    INSERT INTO public.report_audit_hourly (hour, action, events)
+    SELECT date_trunc('hour', "timestamp"), action, COUNT(*)
+    FROM public.report_audit_log
+    WHERE "timestamp" >= since
+    GROUP BY 1, 2
+    ON CONFLICT (hour, action) DO UPDATE SET events = EXCLUDED.events;
+
+    RETURN since;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+
+-- === Final Grant Statements ===
+
+REVOKE ALL ON FUNCTION public.refresh_log_rollups(INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.refresh_log_rollups(INTEGER) TO service_role;
+
+SELECT 'SUCCESS: API usage metering and plan rate limits have been applied.';
+
+"""
+
+
+def get_api_metering_migration_script() -> str:
+    """Returns the SQL migration script for API usage metering and plan rate limits."""
+    return API_METERING_MIGRATION_SCRIPT
@@ -0,0 +1,114 @@
+import reflex as rx
+
+BACKLOG_MIGRATION_SCRIPT = """
+-- === Phase 1: NVD Backlog Index Tables ===
+
+-- Create 'cve_backlog_index' to map every recently modified CVE to its NVD status
+CREATE TABLE IF NOT EXISTS public.cve_backlog_index (
+    cve_id TEXT PRIMARY KEY,
+    vuln_status TEXT NOT NULL,           -- e.g., 'Awaiting Analysis', 'Analyzed'
+    published_at TIMESTAMPTZ,
+    published_month TEXT,                -- 'YYYY-MM', precomputed for monthly rollups
+    last_modified_at TIMESTAMPTZ,
+    is_kev BOOLEAN DEFAULT FALSE NOT NULL,
+    kev_date_added DATE,
+    indexed_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+COMMENT ON TABLE public.cve_backlog_index IS 'Server-side index of NVD CVE statuses maintained by the backlog ingestion sync.';
+
+-- Create 'cve_backlog_monthly_counts' to hold precomputed per-status monthly aggregates
+CREATE TABLE IF NOT EXISTS public.cve_backlog_monthly_counts (
+    vuln_status TEXT NOT NULL,
+    published_month TEXT NOT NULL,
+    cve_count INTEGER NOT NULL,
+    kev_count INTEGER NOT NULL,
+    avg_published_epoch DOUBLE PRECISION,      -- Mean publish time, used to derive average days waiting
+    kev_avg_published_epoch DOUBLE PRECISION,  -- Same, restricted to KEV entries
+    refreshed_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    PRIMARY KEY (vuln_status, published_month)
+);
+COMMENT ON TABLE public.cve_backlog_monthly_counts IS 'Precomputed monthly backlog counts, refreshed after each backlog sync.';
+
+-- Create 'cve_backlog_sync_state' to remember how far the incremental NVD crawl has progressed
+CREATE TABLE IF NOT EXISTS public.cve_backlog_sync_state (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    last_modified_cursor TIMESTAMPTZ,
+    last_run_at TIMESTAMPTZ,
+    records_processed INTEGER
+);
+COMMENT ON TABLE public.cve_backlog_sync_state IS 'Single-row cursor for the incremental NVD backlog sync.';
+
+
+-- === Phase 2: RLS Policies ===
+
+ALTER TABLE public.cve_backlog_index ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.cve_backlog_monthly_counts ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.cve_backlog_sync_state ENABLE ROW LEVEL SECURITY;
+
+-- NVD data is public and shared by all tenants; only the sync job writes it.
+CREATE POLICY "Authenticated users can read the backlog index" ON public.cve_backlog_index FOR SELECT
+    USING ( auth.role() = 'authenticated' );
+CREATE POLICY "Authenticated users can read backlog monthly counts" ON public.cve_backlog_monthly_counts FOR SELECT
+    USING ( auth.role() = 'authenticated' );
+
+CREATE POLICY "Admins have full access to cve_backlog_index" ON public.cve_backlog_index FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to cve_backlog_monthly_counts" ON public.cve_backlog_monthly_counts FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to cve_backlog_sync_state" ON public.cve_backlog_sync_state FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+
+
+-- === Phase 3: Indexes ===
+
+CREATE INDEX IF NOT EXISTS idx_backlog_index_status_month ON public.cve_backlog_index(vuln_status, published_month);
+CREATE INDEX IF NOT EXISTS idx_backlog_index_status_kev ON public.cve_backlog_index(vuln_status) WHERE is_kev;
+
+
+-- === Phase 4: Functions ===
+
+-- Rebuild the monthly rollup from the index. Called by the sync job after each run.
+CREATE OR REPLACE FUNCTION public.refresh_cve_backlog_monthly_counts()
+RETURNS INTEGER AS $$
+DECLARE
+    row_count INTEGER;
+BEGIN
+    DELETE FROM public.cve_backlog_monthly_counts;
+    INSERT INTO public.cve_backlog_monthly_counts (
+        vuln_status, published_month, cve_count, kev_count,
+        avg_published_epoch, kev_avg_published_epoch, refreshed_at
+    )
+    SELECT
+        vuln_status,
+        published_month,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE is_kev),
+        AVG(EXTRACT(EPOCH FROM published_at)),
+        AVG(EXTRACT(EPOCH FROM published_at)) FILTER (WHERE is_kev),
+        NOW()
+    FROM public.cve_backlog_index
+    WHERE published_month IS NOT NULL
+    GROUP BY vuln_status, published_month;
+    GET DIAGNOSTICS row_count = ROW_COUNT;
+    RETURN row_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+
+-- === Final Grant Statements ===
+
+GRANT SELECT ON public.cve_backlog_index TO authenticated;
+GRANT SELECT ON public.cve_backlog_monthly_counts TO authenticated;
+GRANT ALL ON public.cve_backlog_sync_state TO authenticated;
+-- The rollup rebuild runs only from the backlog sync job's service role
+REVOKE EXECUTE ON FUNCTION public.refresh_cve_backlog_monthly_counts() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.refresh_cve_backlog_monthly_counts() TO service_role;
+
+SELECT 'SUCCESS: NVD backlog index schema has been applied.';
+
+"""
+
+
+def get_backlog_migration_script() -> str:
+    """Returns the SQL migration script for the NVD backlog index."""
+    return BACKLOG_MIGRATION_SCRIPT
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def _conflict_columns(on_conflict: str) -> list[str]:
+    return [column.strip() for column in on_conflict.split(",") if column.strip()]
+
+
+class BulkWriter:
+    """Chunked, pipelined upserts for large PostgREST writes.
+
+    Rows are deduplicated on the conflict columns (last one wins, since one
+    statement cannot update a row twice) and split into chunks bounded by
+    serialized size and row count, so no request exceeds the payload limit.
+    Chunks are sent concurrently on worker threads because the Supabase client
+    is synchronous. A failed chunk is retried with exponential backoff; the
+    upsert on the conflict key makes a retry idempotent.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_chunk_bytes: int = 512 * 1024,
+        max_chunk_rows: int = 1000,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_backoff: float = 0.5,
+    ):
+        self.client = client
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_chunk_rows = max_chunk_rows
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def chunk(self, rows: list[dict]) -> list[list[dict]]:
+        """Split rows into chunks under max_chunk_bytes of JSON and max_chunk_rows."""
+        chunks = []
+        current: list[dict] = []
+        current_bytes = 2
+        for row in rows:
+            row_bytes = len(json.dumps(row, default=str).encode()) + 2
+            if current and (
+                current_bytes + row_bytes > self.max_chunk_bytes
+                or len(current) >= self.max_chunk_rows
+            ):
+                chunks.append(current)
+                current, current_bytes = [], 2
+            current.append(row)
+            current_bytes += row_bytes
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _send(
+        self,
+        table: str,
+        chunk: list[dict],
+        on_conflict: str,
+        ignore_duplicates: bool,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[bool, int]:
+        """Upsert one chunk, retrying on failure. Returns (succeeded, retries)."""
+        async with semaphore:
+            for attempt in range(self.max_attempts):
+                try:
+                    query = self.client.table(table).upsert(
+                        chunk, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates
+                    )
+                    await asyncio.to_thread(query.execute)
+                    return True, attempt
+                except Exception as e:
+                    if attempt + 1 == self.max_attempts:
+                        logger.error(
+                            f"Bulk upsert of {len(chunk)} rows into {table} failed after {self.max_attempts} attempts: {e}"
+                        )
+                        return False, attempt
+                    logger.warning(
+                        f"Bulk upsert chunk into {table} failed (attempt {attempt + 1}), retrying: {e}"
+                    )
+                    await asyncio.sleep(self.retry_backoff * 2**attempt)
+        return False, 0
+
+    async def upsert(
+        self,
+        table: str,
+        rows: list[dict],
+        on_conflict: str,
+        ignore_duplicates: bool = False,
+    ) -> dict[str, Any]:
+        """Upsert rows in size-bounded chunks and report rows written and throughput."""
+        started = time.monotonic()
+        columns = _conflict_columns(on_conflict)
+        unique_rows = list(
+            {tuple(row.get(c) for c in columns): row for row in rows}.values()
+        )
+        chunks = self.chunk(unique_rows)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(
+            *(
+                self._send(table, chunk, on_conflict, ignore_duplicates, semaphore)
+                for chunk in chunks
+            )
+        )
+        written = sum(len(c) for c, (ok, _) in zip(chunks, outcomes) if ok)
+        seconds = time.monotonic() - started
+        result = {
+            "table": table,
+            "rows": len(unique_rows),
+            "written": written,
+            "failed": len(unique_rows) - written,
+            "chunks": len(chunks),
+            "retries": sum(retries for _, retries in outcomes),
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(written / seconds, 1) if seconds > 0 else 0.0,
+        }
+        self._record(result)
+        logger.info(
+            f"Bulk upsert into {table}: {written}/{len(unique_rows)} rows in {len(chunks)} chunks, {result['rows_per_second']} rows/s"
+        )
+        return result
+
+    def _record(self, result: dict[str, Any]):
+        with self._lock:
+            stats = self._stats.setdefault(
+                result["table"],
+                {"batches": 0, "written": 0, "failed": 0, "retries": 0, "seconds": 0.0},
+            )
+            stats["batches"] += 1
+            stats["written"] += result["written"]
+            stats["failed"] += result["failed"]
+            stats["retries"] += result["retries"]
+            stats["seconds"] += result["seconds"]
+
+    def metrics(self) -> list[dict[str, Any]]:
+        """Per-table batches, rows written and failed, retries and average rows/s."""
+        with self._lock:
+            return [
+                {
+                    "table": table,
+                    "batches": int(stats["batches"]),
+                    "written": int(stats["written"]),
+                    "failed": int(stats["failed"]),
+                    "retries": int(stats["retries"]),
+                    "rows_per_second": round(stats["written"] / stats["seconds"], 1)
+                    if stats["seconds"] > 0
+                    else 0.0,
+                }
+                for table, stats in sorted(self._stats.items())
+            ]
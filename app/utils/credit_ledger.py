@@ -0,0 +1,352 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CreditLedger:
+    """Credit holds through the credit_transaction RPC, with local blocks for hot orgs.
+
+    reserve() normally takes one hold in the database and commit() or
+    release() settles it, one round trip each. Once an organization has made
+    hot_threshold reservations within hot_window seconds, this process
+    reserves a block of up to block_multiplier holds at once and carves later
+    holds out of it locally; commits and releases of carved holds only adjust
+    the block. A block never takes more than max_block_share of the last
+    balance the database reported, so other processes can still reserve
+    while it is open. A block is settled (credits spent are committed, the
+    rest released) once it is retired and its last hold finishes. A block
+    or direct hold whose settling call fails is kept and retried by
+    settle_idle() and close(). Blocks retire when they run dry, sit idle for block_idle
+    seconds, or reach max_block_age. Every block is a real hold in the
+    database, so processes can never spend more than the balance between
+    them.
+    """
+
+    def __init__(
+        self,
+        client,
+        block_multiplier: int = 20,
+        hot_threshold: int = 5,
+        hot_window: float = 10.0,
+        block_idle: float = 30.0,
+        max_block_age: float = 300.0,
+        hold_seconds: int = 900,
+        max_block_share: float = 0.1,
+        on_balance: Optional[Callable[[str, int], None]] = None,
+    ):
+        self.client = client
+        self.block_multiplier = block_multiplier
+        self.hot_threshold = hot_threshold
+        self.hot_window = hot_window
+        self.block_idle = block_idle
+        self.max_block_age = max_block_age
+        self.hold_seconds = hold_seconds
+        self.max_block_share = max_block_share
+        self.on_balance = on_balance
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._recent: dict[str, deque] = {}
+        self._blocks: dict[str, dict[str, Any]] = {}
+        self._active: dict[str, str] = {}
+        self._balances: dict[str, int] = {}
+        self._hold_ids = itertools.count(1)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "rpc_calls": 0,
+            "direct_holds": 0,
+            "local_holds": 0,
+            "blocks_opened": 0,
+            "blocks_settled": 0,
+            "insufficient": 0,
+            "rpc_failures": 0,
+            "settle_failures": 0,
+            "spend_recharged": 0,
+            "spend_unrecorded": 0,
+        }
+
+    def _count(self, stat: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[stat] += n
+
+    def _lock_for(self, org_id: str) -> asyncio.Lock:
+        lock = self._locks.get(org_id)
+        if lock is None:
+            lock = self._locks[org_id] = asyncio.Lock()
+        return lock
+
+    def _call(self, params: dict[str, Any]) -> dict[str, Any]:
+        """One credit_transaction call; failures come back as ok=False."""
+        self._count("rpc_calls")
+        try:
+            result = self.client.rpc("credit_transaction", params).execute().data or {}
+        except Exception as e:
+            logger.exception(f"credit_transaction {params.get('p_action')} failed: {e}")
+            self._count("rpc_failures")
+            return {"ok": False, "error": str(e)}
+        org_id = params.get("p_organization_id")
+        if org_id and result.get("balance") is not None:
+            self._balances[org_id] = result["balance"]
+            if self.on_balance:
+                self.on_balance(org_id, result["balance"])
+        return result
+
+    async def _rpc(self, action: str, **params) -> dict[str, Any]:
+        payload = {"p_action": action, **{f"p_{k}": v for k, v in params.items() if v is not None}}
+        return await asyncio.to_thread(self._call, payload)
+
+    def _is_hot(self, org_id: str) -> bool:
+        now = time.monotonic()
+        recent = self._recent.setdefault(org_id, deque())
+        recent.append(now)
+        while recent and recent[0] < now - self.hot_window:
+            recent.popleft()
+        return len(recent) >= self.hot_threshold
+
+    def _carve(self, block: dict[str, Any], amount: int) -> dict[str, Any]:
+        block["remaining"] -= amount
+        block["outstanding"] += 1
+        block["last_used"] = time.monotonic()
+        self._count("local_holds")
+        return {
+            "hold_id": f"{block['reservation_id']}:{next(self._hold_ids)}",
+            "organization_id": block["organization_id"],
+            "amount": amount,
+            "block": block["reservation_id"],
+        }
+
+    def _retire(self, org_id: str):
+        self._active.pop(org_id, None)
+
+    def _recharge(self, block: dict[str, Any]) -> bool:
+        """Charge a block's spend as a fresh hold after its own hold expired."""
+        org_id = block["organization_id"]
+        result = self._call(
+            {
+                "p_action": "reserve",
+                "p_organization_id": org_id,
+                "p_amount": block["spent"],
+                "p_reference": f"recharge:{block['reservation_id']}",
+            }
+        )
+        if result.get("ok"):
+            result = self._call(
+                {
+                    "p_action": "commit",
+                    "p_organization_id": org_id,
+                    "p_reservation_id": result["reservation_id"],
+                }
+            )
+        if result.get("ok"):
+            self._count("spend_recharged", block["spent"])
+            return True
+        if "balance" in result:
+            # The database answered; retrying will not make the credits appear.
+            logger.error(
+                f"Could not record {block['spent']} credits spent from expired block "
+                f"{block['reservation_id']} of org {org_id}: {result.get('error')}"
+            )
+            self._count("spend_unrecorded", block["spent"])
+            return True
+        return False
+
+    def _settle_block(self, block: dict[str, Any]) -> bool:
+        """Commit a block's spend and release the rest; False if it should be retried."""
+        params = {
+            "p_action": "commit" if block["spent"] else "release",
+            "p_organization_id": block["organization_id"],
+            "p_reservation_id": block["reservation_id"],
+        }
+        if block["spent"]:
+            params["p_amount"] = block["spent"]
+        result = self._call(params)
+        if result.get("status") == "expired" and block["spent"]:
+            settled = self._recharge(block)
+        else:
+            settled = bool(result.get("ok") or result.get("already_settled"))
+        if settled:
+            self._blocks.pop(block["reservation_id"], None)
+            if not block.get("direct"):
+                self._count("blocks_settled")
+        else:
+            self._count("settle_failures")
+            logger.warning(
+                f"Settling credit hold {block['reservation_id']} of org "
+                f"{block['organization_id']} failed; will retry."
+            )
+        return settled
+
+    async def _settle_if_done(self, block: dict[str, Any]):
+        org_id = block["organization_id"]
+        if block["outstanding"] or self._active.get(org_id) == block["reservation_id"]:
+            return
+        await asyncio.to_thread(self._settle_block, block)
+
+    async def _settle_direct(self, hold: dict[str, Any], spent: int) -> bool:
+        """Settle a direct hold, queueing it for settle_idle() if the call fails."""
+        now = time.monotonic()
+        pending = {
+            "reservation_id": hold["hold_id"],
+            "organization_id": hold["organization_id"],
+            "remaining": 0,
+            "spent": spent,
+            "outstanding": 0,
+            "created": now,
+            "last_used": now,
+            "direct": True,
+        }
+        if not await asyncio.to_thread(self._settle_block, pending):
+            self._blocks[pending["reservation_id"]] = pending
+        return True
+
+    def _block_size(self, org_id: str, amount: int) -> int:
+        """Credits to reserve for a new block: a multiple of amount within the balance share."""
+        balance = self._balances.get(org_id)
+        if balance is None:
+            return 0
+        size = min(amount * self.block_multiplier, int(balance * self.max_block_share))
+        return size - size % amount
+
+    async def _open_block(
+        self, org_id: str, amount: int, reference: Optional[str]
+    ) -> Optional[dict[str, Any]]:
+        """Reserve a block for a hot org; None when a block would be too large a share of its balance."""
+        size = self._block_size(org_id, amount)
+        if size < amount * 2:
+            return None
+        result = await self._rpc(
+            "reserve",
+            organization_id=org_id,
+            amount=size,
+            reference=f"block:{reference or 'credits'}",
+            hold_seconds=self.hold_seconds,
+        )
+        if not result.get("ok"):
+            return None
+        now = time.monotonic()
+        block = {
+            "reservation_id": result["reservation_id"],
+            "organization_id": org_id,
+            "remaining": size,
+            "spent": 0,
+            "outstanding": 0,
+            "created": now,
+            "last_used": now,
+        }
+        self._blocks[block["reservation_id"]] = block
+        self._active[org_id] = block["reservation_id"]
+        self._count("blocks_opened")
+        return block
+
+    async def reserve(
+        self, org_id: str, amount: int, reference: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        """Hold amount credits for org_id; None if the balance does not cover it."""
+        async with self._lock_for(org_id):
+            hot = self._is_hot(org_id)
+            block = self._blocks.get(self._active.get(org_id, ""))
+            if block is not None:
+                if block["remaining"] >= amount:
+                    return self._carve(block, amount)
+                self._retire(org_id)
+                await self._settle_if_done(block)
+            if hot and self.block_multiplier > 1:
+                block = await self._open_block(org_id, amount, reference)
+                if block is not None:
+                    return self._carve(block, amount)
+            result = await self._rpc(
+                "reserve",
+                organization_id=org_id,
+                amount=amount,
+                reference=reference,
+                hold_seconds=self.hold_seconds,
+            )
+            if not result.get("ok"):
+                if result.get("error") == "insufficient_credits":
+                    self._count("insufficient")
+                return None
+            self._count("direct_holds")
+            return {
+                "hold_id": result["reservation_id"],
+                "organization_id": org_id,
+                "amount": amount,
+                "block": None,
+            }
+
+    async def commit(self, hold: dict[str, Any], amount: Optional[int] = None) -> bool:
+        """Spend a hold (all of it unless amount is given) and return the rest."""
+        spent = hold["amount"] if amount is None else max(0, min(amount, hold["amount"]))
+        org_id = hold["organization_id"]
+        if hold["block"] is None:
+            return await self._settle_direct(hold, spent)
+        async with self._lock_for(org_id):
+            block = self._blocks.get(hold["block"])
+            if block is None:
+                logger.error(f"Credit hold {hold['hold_id']} outlived its block; spend not recorded.")
+                return False
+            block["spent"] += spent
+            block["remaining"] += hold["amount"] - spent
+            block["outstanding"] -= 1
+            await self._settle_if_done(block)
+            return True
+
+    async def release(self, hold: dict[str, Any]) -> bool:
+        """Return a hold's credits without spending any."""
+        org_id = hold["organization_id"]
+        if hold["block"] is None:
+            return await self._settle_direct(hold, 0)
+        async with self._lock_for(org_id):
+            block = self._blocks.get(hold["block"])
+            if block is None:
+                return True
+            block["remaining"] += hold["amount"]
+            block["outstanding"] -= 1
+            await self._settle_if_done(block)
+            return True
+
+    async def settle_idle(self):
+        """Retire idle or old blocks and settle those with no holds left."""
+        now = time.monotonic()
+        for block in list(self._blocks.values()):
+            org_id = block["organization_id"]
+            async with self._lock_for(org_id):
+                if block["reservation_id"] not in self._blocks:
+                    continue
+                if (
+                    now - block["last_used"] >= self.block_idle
+                    or now - block["created"] >= self.max_block_age
+                ) and self._active.get(org_id) == block["reservation_id"]:
+                    self._retire(org_id)
+                await self._settle_if_done(block)
+
+    def close(self, attempts: int = 3):
+        """Settle every block synchronously at shutdown. Unfinished holds are released."""
+        self._active = {}
+        for _ in range(attempts):
+            for block in list(self._blocks.values()):
+                self._settle_block(block)
+            if not self._blocks:
+                return
+        for block in self._blocks.values():
+            logger.error(
+                f"Credit block {block['reservation_id']} of org {block['organization_id']} "
+                f"could not be settled; {block['spent']} spent credits are unrecorded."
+            )
+
+    def metrics(self) -> dict[str, Any]:
+        """RPC calls, holds served directly or from blocks, and credits held in open blocks."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        blocks = list(self._blocks.values())
+        return {
+            **stats,
+            "open_blocks": len(blocks),
+            "unsettled_blocks": sum(
+                1 for b in blocks if self._active.get(b["organization_id"]) != b["reservation_id"]
+            ),
+            "block_credits_unused": sum(b["remaining"] for b in blocks),
+        }
@@ -0,0 +1,172 @@
+"""Concurrency benchmark for CreditLedger against an in-memory credit_transaction.
+
+    python -m app.utils.credit_ledger_benchmark --analyses 1000 --workers 4
+
+Runs concurrent analyses (reserve, work, then commit or release) through
+several ledgers sharing one fake database, as separate app processes would,
+with a share of RPC calls failing. Checks that every balance equals its
+opening balance minus credits actually spent, that the ledger sums match,
+and that no hold is left open, then prints RPC calls against the two per
+analysis a ledger without blocks would make. Exits non-zero if a check fails.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from app.utils.credit_ledger import CreditLedger
+
+
+class FakeCreditDatabase:
+    """credit_transaction semantics in memory; the lock stands in for the row lock."""
+
+    def __init__(self, balances: dict[str, int], latency: float = 0.002, failure_rate: float = 0.0):
+        self.balances = dict(balances)
+        self.reservations: dict[str, dict] = {}
+        self.ledger = [(org_id, balance) for org_id, balance in balances.items()]
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def credit_transaction(self, params: dict) -> dict:
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            if random.random() < self.failure_rate:
+                raise ConnectionError("injected RPC failure")
+            action = params["p_action"]
+            if action == "reserve":
+                org_id, amount = params["p_organization_id"], params["p_amount"]
+                if self.balances[org_id] < amount:
+                    return {"ok": False, "error": "insufficient_credits", "balance": self.balances[org_id]}
+                self.balances[org_id] -= amount
+                reservation_id = str(uuid.uuid4())
+                self.reservations[reservation_id] = {"org_id": org_id, "amount": amount, "status": "held"}
+                self.ledger.append((org_id, -amount))
+                return {"ok": True, "reservation_id": reservation_id, "balance": self.balances[org_id]}
+            reservation = self.reservations[params["p_reservation_id"]]
+            org_id = reservation["org_id"]
+            if reservation["status"] != "held":
+                return {"ok": True, "already_settled": True, "status": reservation["status"], "balance": self.balances[org_id]}
+            committed = min(params.get("p_amount", reservation["amount"]), reservation["amount"]) if action == "commit" else 0
+            released = reservation["amount"] - committed
+            self.balances[org_id] += released
+            reservation["status"] = "committed" if committed else "released"
+            if released:
+                self.ledger.append((org_id, released))
+            return {"ok": True, "committed": committed, "released": released, "balance": self.balances[org_id]}
+
+
+class FakeRpcClient:
+    """Just enough of the Supabase client for CreditLedger: rpc(...).execute().data."""
+
+    def __init__(self, database: FakeCreditDatabase):
+        self.database = database
+
+    def rpc(self, name: str, params: dict):
+        database = self.database
+
+        class Query:
+            def execute(self):
+                class Response:
+                    data = database.credit_transaction(params)
+
+                return Response()
+
+        return Query()
+
+
+async def analysis(ledger: CreditLedger, database: FakeCreditDatabase, org_id: str, cost: int, spent: Counter, outcomes: Counter, args):
+    hold = await ledger.reserve(org_id, cost, "llm")
+    if hold is None:
+        outcomes["denied"] += 1
+        if database.balances[org_id] >= cost:
+            outcomes["denied_with_credits_left"] += 1
+        return
+    await asyncio.sleep(random.uniform(0.001, args.max_work_ms / 1000))
+    if random.random() < args.analysis_failure_rate:
+        await ledger.release(hold)
+        outcomes["failed"] += 1
+        return
+    await ledger.commit(hold)
+    spent[org_id] += cost
+    outcomes["ok"] += 1
+
+
+async def run(args) -> int:
+    random.seed(args.seed)
+    opening = {f"org{i}": (args.hot_balance if i == 0 else args.balance) for i in range(args.orgs)}
+    database = FakeCreditDatabase(opening, failure_rate=args.rpc_failure_rate)
+    ledgers = [CreditLedger(FakeRpcClient(database)) for _ in range(args.workers)]
+    spent: Counter = Counter()
+    outcomes: Counter = Counter()
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            analysis(
+                ledgers[i % args.workers],
+                database,
+                "org0" if i % 2 == 0 else f"org{random.randint(1, args.orgs - 1)}",
+                args.cost,
+                spent,
+                outcomes,
+                args,
+            )
+            for i in range(args.analyses)
+        )
+    )
+    for ledger in ledgers:
+        ledger.block_idle = 0
+        for _ in range(10):
+            await ledger.settle_idle()
+            if not ledger.metrics()["open_blocks"]:
+                break
+    elapsed = time.perf_counter() - started
+
+    errors = []
+    for org_id, balance in opening.items():
+        if database.balances[org_id] != balance - spent[org_id]:
+            errors.append(f"{org_id}: balance {database.balances[org_id]}, expected {balance - spent[org_id]}")
+        if database.balances[org_id] < 0:
+            errors.append(f"{org_id}: negative balance {database.balances[org_id]}")
+        if sum(delta for o, delta in database.ledger if o == org_id) != database.balances[org_id]:
+            errors.append(f"{org_id}: ledger entries do not sum to the balance")
+    held = sum(1 for r in database.reservations.values() if r["status"] == "held")
+    if held:
+        errors.append(f"{held} reservations still held")
+
+    settled = outcomes["ok"] + outcomes["failed"]
+    print(f"analyses: {dict(outcomes)} in {elapsed:.2f}s across {args.workers} workers")
+    print(f"rpc calls: {database.calls} (vs {2 * settled} without blocks), injected failure rate {args.rpc_failure_rate:.0%}")
+    for i, ledger in enumerate(ledgers):
+        print(f"worker {i}: {ledger.metrics()}")
+    for error in errors:
+        print(f"FAIL {error}")
+    if not errors:
+        print("balances correct")
+    return 1 if errors else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analyses", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--orgs", type=int, default=10)
+    parser.add_argument("--hot-balance", type=int, default=3000)
+    parser.add_argument("--balance", type=int, default=200)
+    parser.add_argument("--cost", type=int, default=5)
+    parser.add_argument("--max-work-ms", type=float, default=50)
+    parser.add_argument("--analysis-failure-rate", type=float, default=0.1)
+    parser.add_argument("--rpc-failure-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=1)
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+import reflex as rx
+
+CREDIT_LEDGER_MIGRATION_SCRIPT = """
+-- === Phase 1: Credit Ledger Tables ===
+
+-- Append-only record of every credit movement; SUM(balance_delta) per organization equals organizations.ai_credits
+CREATE TABLE IF NOT EXISTS public.credit_ledger (
+    id BIGINT PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
+    organization_id UUID NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+    entry_type TEXT NOT NULL CHECK (entry_type IN ('opening_balance', 'grant', 'reserve', 'commit', 'release')),
+    amount INTEGER NOT NULL CHECK (amount >= 0),   -- Credits involved in this movement
+    balance_delta INTEGER NOT NULL,                -- Effect on the available balance (commit is 0, the reserve already took it)
+    balance_after INTEGER NOT NULL,                -- Available balance once this entry was applied
+    reservation_id UUID,
+    reference TEXT,                                -- e.g. 'llm_analysis:CVE-2024-1234'
+    created_by UUID DEFAULT auth.uid(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+COMMENT ON TABLE public.credit_ledger IS 'Append-only credit ledger. Written only by credit_transaction() and expire_credit_reservations().';
+
+-- Credits held for in-flight work; settled by commit (spent) or release (returned)
+CREATE TABLE IF NOT EXISTS public.credit_reservations (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    organization_id UUID NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+    amount INTEGER NOT NULL CHECK (amount > 0),
+    committed_amount INTEGER NOT NULL DEFAULT 0 CHECK (committed_amount >= 0),
+    status TEXT NOT NULL DEFAULT 'held' CHECK (status IN ('held', 'committed', 'released', 'expired')),
+    reference TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL,
+    settled_at TIMESTAMPTZ
+);
+COMMENT ON TABLE public.credit_reservations IS 'Credit holds taken before paid work starts; unsettled holds are released after expires_at.';
+
+-- Every pre-ledger balance becomes an opening entry so the ledger sums to ai_credits
+INSERT INTO public.credit_ledger (organization_id, entry_type, amount, balance_delta, balance_after, reference)
+SELECT o.id, 'opening_balance', GREATEST(o.ai_credits, 0), o.ai_credits, o.ai_credits, 'credit ledger migration'
+FROM public.organizations o
+WHERE NOT EXISTS (SELECT 1 FROM public.credit_ledger l WHERE l.organization_id = o.id);
+
+
+-- === Phase 2: Append-Only Guard and RLS ===
+
+-- Ledger rows are never edited; deletes are only allowed as the organization's ON DELETE CASCADE
+CREATE OR REPLACE FUNCTION public.prevent_credit_ledger_changes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' OR pg_trigger_depth() < 2 THEN
+        RAISE EXCEPTION 'credit_ledger is append-only';
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS credit_ledger_append_only ON public.credit_ledger;
+CREATE TRIGGER credit_ledger_append_only
+    BEFORE UPDATE OR DELETE ON public.credit_ledger
+    FOR EACH ROW EXECUTE FUNCTION public.prevent_credit_ledger_changes();
+
+ALTER TABLE public.credit_ledger ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.credit_reservations ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view the credit ledger of their own organization" ON public.credit_ledger FOR SELECT
+    USING ( organization_id = (SELECT organization_id FROM public.users WHERE id = auth.uid()) );
+
+CREATE POLICY "Admins can view all credit ledgers" ON public.credit_ledger FOR SELECT
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+
+CREATE POLICY "Users can view credit reservations of their own organization" ON public.credit_reservations FOR SELECT
+    USING ( organization_id = (SELECT organization_id FROM public.users WHERE id = auth.uid()) );
+
+CREATE POLICY "Admins can view all credit reservations" ON public.credit_reservations FOR SELECT
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+
+
+-- === Phase 3: Indexes ===
+
+CREATE INDEX IF NOT EXISTS idx_credit_ledger_org_created ON public.credit_ledger(organization_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_credit_ledger_reservation ON public.credit_ledger(reservation_id) WHERE reservation_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_credit_reservations_held ON public.credit_reservations(expires_at) WHERE status = 'held';
+
+
+-- === Phase 4: Functions ===
+
+-- Members may spend their own organization's credits; platform admins may act on any organization
+CREATE OR REPLACE FUNCTION public.can_use_org_credits(p_organization_id UUID)
+RETURNS BOOLEAN AS $$
+    SELECT public.is_platform_admin()
+        OR COALESCE((SELECT organization_id = p_organization_id FROM public.users WHERE id = auth.uid()), FALSE);
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- The single credit RPC. Each action is one statement-level transaction: the
+-- balance row is updated in place (row lock, no read-then-write) and the
+-- ledger entry is appended alongside it.
+--   reserve: hold p_amount if the balance covers it
+--   commit:  spend p_amount of a hold (default all of it) and return the rest
+--   release: return a whole hold
+--   grant:   add credits (platform admins only)
+-- Settling an already settled hold is a no-op, so retries are safe.
+CREATE OR REPLACE FUNCTION public.credit_transaction(
+    p_action TEXT,
+    p_organization_id UUID DEFAULT NULL,
+    p_amount INTEGER DEFAULT NULL,
+    p_reservation_id UUID DEFAULT NULL,
+    p_reference TEXT DEFAULT NULL,
+    p_hold_seconds INTEGER DEFAULT 900
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_balance INTEGER;
+    v_reservation public.credit_reservations%ROWTYPE;
+    v_commit INTEGER;
+    v_release INTEGER;
+BEGIN
+    IF p_action IN ('reserve', 'grant') THEN
+        IF p_organization_id IS NULL OR p_amount IS NULL OR p_amount <= 0 THEN
+            RAISE EXCEPTION 'credit_transaction %: an organization and a positive amount are required', p_action;
+        END IF;
+        IF NOT public.can_use_org_credits(p_organization_id) THEN
+            RAISE EXCEPTION 'Not allowed to use credits of organization %', p_organization_id;
+        END IF;
+    END IF;
+
+    IF p_action = 'reserve' THEN
+        UPDATE public.organizations
+        SET ai_credits = ai_credits - p_amount
+        WHERE id = p_organization_id AND ai_credits >= p_amount
+        RETURNING ai_credits INTO v_balance;
+        IF NOT FOUND THEN
+            RETURN jsonb_build_object(
+                'ok', FALSE,
+                'error', 'insufficient_credits',
+                'balance', (SELECT ai_credits FROM public.organizations WHERE id = p_organization_id)
+            );
+        END IF;
+        INSERT INTO public.credit_reservations (organization_id, amount, reference, expires_at)
+        VALUES (p_organization_id, p_amount, p_reference, NOW() + make_interval(secs => p_hold_seconds))
+        RETURNING * INTO v_reservation;
+        INSERT INTO public.credit_ledger (organization_id, entry_type, amount, balance_delta, balance_after, reservation_id, reference)
+        VALUES (p_organization_id, 'reserve', p_amount, -p_amount, v_balance, v_reservation.id, p_reference);
+        RETURN jsonb_build_object('ok', TRUE, 'reservation_id', v_reservation.id, 'amount', p_amount, 'balance', v_balance);
+    END IF;
+
+    IF p_action = 'grant' THEN
+        IF NOT public.is_platform_admin() THEN
+            RAISE EXCEPTION 'Only platform admins can grant credits';
+        END IF;
+        UPDATE public.organizations
+        SET ai_credits = ai_credits + p_amount
+        WHERE id = p_organization_id
+        RETURNING ai_credits INTO v_balance;
+        IF NOT FOUND THEN
+            RAISE EXCEPTION 'Organization % not found', p_organization_id;
+        END IF;
+        INSERT INTO public.credit_ledger (organization_id, entry_type, amount, balance_delta, balance_after, reference)
+        VALUES (p_organization_id, 'grant', p_amount, p_amount, v_balance, p_reference);
+        RETURN jsonb_build_object('ok', TRUE, 'amount', p_amount, 'balance', v_balance);
+    END IF;
+
+    IF p_action IN ('commit', 'release') THEN
+        SELECT * INTO v_reservation
+        FROM public.credit_reservations
+        WHERE id = p_reservation_id
+        FOR UPDATE;
+        IF NOT FOUND THEN
+            RAISE EXCEPTION 'Credit reservation % not found', p_reservation_id;
+        END IF;
+        IF NOT public.can_use_org_credits(v_reservation.organization_id) THEN
+            RAISE EXCEPTION 'Not allowed to use credits of organization %', v_reservation.organization_id;
+        END IF;
+        IF v_reservation.status <> 'held' THEN
+            -- An expired hold was already returned, so the spend could not be recorded
+            RETURN jsonb_build_object(
+                'ok', v_reservation.status <> 'expired',
+                'already_settled', TRUE,
+                'status', v_reservation.status,
+                'reservation_id', v_reservation.id,
+                'committed', v_reservation.committed_amount,
+                'balance', (SELECT ai_credits FROM public.organizations WHERE id = v_reservation.organization_id)
+            );
+        END IF;
+
+        v_commit := CASE WHEN p_action = 'commit'
+            THEN LEAST(GREATEST(COALESCE(p_amount, v_reservation.amount), 0), v_reservation.amount)
+            ELSE 0 END;
+        v_release := v_reservation.amount - v_commit;
+
+        UPDATE public.organizations
+        SET ai_credits = ai_credits + v_release
+        WHERE id = v_reservation.organization_id
+        RETURNING ai_credits INTO v_balance;
+        UPDATE public.credit_reservations
+        SET status = CASE WHEN v_commit > 0 THEN 'committed' ELSE 'released' END,
+            committed_amount = v_commit,
+            settled_at = NOW()
+        WHERE id = v_reservation.id;
+
+        IF v_commit > 0 THEN
+            INSERT INTO public.credit_ledger (organization_id, entry_type, amount, balance_delta, balance_after, reservation_id, reference)
+            VALUES (v_reservation.organization_id, 'commit', v_commit, 0, v_balance, v_reservation.id, COALESCE(p_reference, v_reservation.reference));
+        END IF;
+        IF v_release > 0 THEN
+            INSERT INTO public.credit_ledger (organization_id, entry_type, amount, balance_delta, balance_after, reservation_id, reference)
+            VALUES (v_reservation.organization_id, 'release', v_release, v_release, v_balance, v_reservation.id, COALESCE(p_reference, v_reservation.reference));
+        END IF;
+        RETURN jsonb_build_object(
+            'ok', TRUE,
+            'reservation_id', v_reservation.id,
+            'committed', v_commit,
+            'released', v_release,
+            'balance', v_balance
+        );
+    END IF;
+
+    RAISE EXCEPTION 'Unknown credit action %', p_action;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Return holds whose owner never settled them (e.g. the process died mid-analysis)
+CREATE OR REPLACE FUNCTION public.expire_credit_reservations()
+RETURNS INTEGER AS $$
+DECLARE
+    v_row RECORD;
+    v_balance INTEGER;
+    v_count INTEGER := 0;
+BEGIN
+    FOR v_row IN
+        SELECT * FROM public.credit_reservations
+        WHERE status = 'held' AND expires_at < NOW()
+        FOR UPDATE SKIP LOCKED
+    LOOP
+        UPDATE public.organizations
+        SET ai_credits = ai_credits + v_row.amount
+        WHERE id = v_row.organization_id
+        RETURNING ai_credits INTO v_balance;
+        UPDATE public.credit_reservations
+        SET status = 'expired', settled_at = NOW()
+        WHERE id = v_row.id;
+        INSERT INTO public.credit_ledger (organization_id, entry_type, amount, balance_delta, balance_after, reservation_id, reference)
+        VALUES (v_row.organization_id, 'release', v_row.amount, v_row.amount, v_balance, v_row.id, 'expired hold');
+        v_count := v_count + 1;
+    END LOOP;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Organizations whose balance no longer matches their ledger; expected to be empty
+CREATE OR REPLACE FUNCTION public.get_credit_ledger_drift()
+RETURNS TABLE (organization_id UUID, balance INTEGER, ledger_balance BIGINT) AS $$
+    SELECT o.id, o.ai_credits, COALESCE(SUM(l.balance_delta), 0)
+    FROM public.organizations o
+    LEFT JOIN public.credit_ledger l ON l.organization_id = o.id
+    WHERE public.is_platform_admin()
+    GROUP BY o.id, o.ai_credits
+    HAVING o.ai_credits <> COALESCE(SUM(l.balance_delta), 0);
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+
+-- === Final Grant Statements ===
+
+-- Balances change only through credit_transaction()
+GRANT SELECT ON public.credit_ledger TO authenticated;
+GRANT SELECT ON public.credit_reservations TO authenticated;
+REVOKE INSERT, UPDATE, DELETE ON public.credit_ledger FROM anon, authenticated;
+REVOKE INSERT, UPDATE, DELETE ON public.credit_reservations FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.credit_transaction(TEXT, UUID, INTEGER, UUID, TEXT, INTEGER) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.get_credit_ledger_drift() TO authenticated;
+-- Expiry sweeps every organization's holds, so only the scheduler's service role may run it
+REVOKE EXECUTE ON FUNCTION public.expire_credit_reservations() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.expire_credit_reservations() TO service_role;
+
+SELECT 'SUCCESS: Credit ledger and reservations have been applied.';
+
+"""
+
+
+def get_credit_ledger_migration_script() -> str:
+    """Returns the SQL migration script for the credit ledger and reservations."""
+    return CREDIT_LEDGER_MIGRATION_SCRIPT
@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Optional, Sequence
+import numpy as np
+from app.utils.search_index import CVE_SEARCH_FIELDS, InvertedIndex
+
+SORT_KEYS = (
+    "id",
+    "severity",
+    "time_gap",
+    "tech_match",
+    "universal_risk_score",
+    "published_date",
+)
+
+
+class CveFilterIndex:
+    """Filter and sort indexes built once over a loaded CVE list.
+
+    Severity, KEV and product membership are boolean bitsets, published dates
+    are a sorted datetime64 array searched with binary search, and every
+    sortable column has precomputed ascending and descending permutations. A
+    filter combination is a few bitset ANDs, and sorting it is one take from
+    the permutation. Free-text search goes through an inverted index.
+    """
+
+    def __init__(self, rows: Sequence[dict], sort_keys: Sequence[str] = SORT_KEYS):
+        self.rows = rows
+        self.size = len(rows)
+        self.severity = self._bitsets([r["severity"] for r in rows])
+        self.products = self._bitsets([r["product"].lower() for r in rows])
+        self.kev = np.fromiter(
+            (bool(r["is_kev"]) for r in rows), dtype=bool, count=self.size
+        )
+        self.time_gap = np.fromiter(
+            (r["time_gap"] for r in rows), dtype=np.int64, count=self.size
+        )
+        published = np.array(
+            [datetime.fromisoformat(r["published_date"]) for r in rows],
+            dtype="datetime64[us]",
+        )
+        self.published_day = published.astype("datetime64[D]")
+        self._date_order = np.argsort(published, kind="stable")
+        self._sorted_dates = published[self._date_order]
+        self.search = InvertedIndex(rows, CVE_SEARCH_FIELDS)
+        self._orders = {}
+        for key in sort_keys:
+            _, ranks = np.unique(
+                np.array([r.get(key, 0) for r in rows]), return_inverse=True
+            )
+            self._orders[(key, "asc")] = np.argsort(ranks, kind="stable")
+            self._orders[(key, "desc")] = np.argsort(-ranks, kind="stable")
+
+    def _bitsets(self, values: list[str]) -> dict[str, np.ndarray]:
+        labels, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+        return {label: codes == i for i, label in enumerate(labels)}
+
+    def _any_of(self, bitsets: list[np.ndarray]) -> np.ndarray:
+        if not bitsets:
+            return np.zeros(self.size, dtype=bool)
+        return np.logical_or.reduce(bitsets)
+
+    def published_after(self, cutoff: datetime) -> np.ndarray:
+        """Bitset of CVEs published strictly after cutoff, via binary search."""
+        mask = np.zeros(self.size, dtype=bool)
+        start = np.searchsorted(
+            self._sorted_dates, np.datetime64(cutoff, "us"), side="right"
+        )
+        mask[self._date_order[start:]] = True
+        return mask
+
+    def match(
+        self,
+        severities: Sequence[str] = (),
+        is_kev: bool = False,
+        tech_stack: Sequence[str] = (),
+        published_after: Optional[datetime] = None,
+        search_scores: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Bitset of rows passing every active filter."""
+        mask = np.ones(self.size, dtype=bool)
+        if is_kev:
+            mask &= self.kev
+        if severities:
+            mask &= self._any_of(
+                [self.severity[s] for s in severities if s in self.severity]
+            )
+        if tech_stack:
+            terms = [t.lower() for t in tech_stack]
+            mask &= self._any_of(
+                [
+                    bits
+                    for product, bits in self.products.items()
+                    if any(t in product for t in terms)
+                ]
+            )
+        if published_after is not None:
+            mask &= self.published_after(published_after)
+        if search_scores is not None:
+            mask &= search_scores > 0
+        return mask
+
+    def sorted_indices(
+        self,
+        mask: np.ndarray,
+        key: str,
+        order: str,
+        search_scores: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Row indices passing mask, ordered like sorted(rows, key, reverse=desc).
+
+        With search scores, rows are ranked by relevance and the column order
+        breaks ties.
+        """
+        permutation = self._orders[(key, order)]
+        indices = permutation[mask[permutation]]
+        if search_scores is not None:
+            indices = indices[np.argsort(-search_scores[indices], kind="stable")]
+        return indices
+
+    def rows_at(self, indices: np.ndarray) -> list[dict]:
+        return [self.rows[i] for i in indices.tolist()]
@@ -0,0 +1,127 @@
+import heapq
+from datetime import datetime
+from typing import Iterable
+
+from app.utils.dataset_store import DatasetStore, dataset_store
+
+# Chart and summary aggregates behind the dashboard, gap analysis and risk
+# intelligence computed vars. Each reader builds its aggregate once per stored
+# dataset version under a fixed derived key, so UI events that leave a state's
+# handles unchanged never rescan the rows. A missing dataset yields the
+# reader's default without building anything.
+
+
+def _vendor_of(cve: dict) -> str:
+    vendor = cve.get("Vendor", "N/A")
+    if vendor != "N/A":
+        return vendor
+    description = cve.get("Product Description", "").lower()
+    if "microsoft" in description or "windows" in description:
+        return "Microsoft"
+    if "apple" in description or "ios" in description or "macos" in description:
+        return "Apple"
+    if "google" in description or "android" in description or "chrome" in description:
+        return "Google"
+    if "linux" in description:
+        return "Linux"
+    return "Other"
+
+
+def _top_vendors(cves: list[dict]) -> list[dict[str, str | int]]:
+    """Top 5 vendors by CVE count."""
+    vendor_counts = {}
+    for cve in cves:
+        vendor = _vendor_of(cve)
+        vendor_counts[vendor] = vendor_counts.get(vendor, 0) + 1
+    sorted_vendors = sorted(vendor_counts.items(), key=lambda item: item[1], reverse=True)
+    return [{"name": name, "count": count} for name, count in sorted_vendors[:5]]
+
+
+def _count_stack_gaps(cves: list[dict], tech_stack_lower: tuple[str, ...]) -> int:
+    """Unenriched CVEs whose description mentions a tech stack item."""
+    count = 0
+    for cve in cves:
+        description = cve.get("Product Description", "").lower()
+        if any((tech in description for tech in tech_stack_lower)):
+            count += 1
+    return count
+
+
+def _avg_enrichment_time(gaps: list[dict]) -> int:
+    if not gaps:
+        return 0
+    return round(sum((g["time_gap_days"] for g in gaps)) / len(gaps))
+
+
+def _worst_offenders(gaps: list[dict]) -> list[dict]:
+    return heapq.nlargest(5, gaps, key=lambda g: g["time_gap_days"])
+
+
+def _gap_score_distribution(gaps: list[dict], field: str) -> list[dict]:
+    dist = {i: 0 for i in range(11)}
+    for gap in gaps:
+        dist[int(gap[field])] += 1
+    return [{"score": k, "count": v} for k, v in dist.items()]
+
+
+def _monthly_backlog_growth(gaps: list[dict]) -> list[dict]:
+    monthly_counts = {}
+    for gap in gaps:
+        month = datetime.fromisoformat(gap["published_date"]).strftime("%Y-%m")
+        monthly_counts[month] = monthly_counts.get(month, 0) + 1
+    sorted_months = sorted(monthly_counts.keys())
+    return [{"month": m, "count": monthly_counts[m]} for m in sorted_months][-12:]
+
+
+def _risk_score_distribution(cves: list[dict]) -> list[dict]:
+    """Counts per 10-point universal risk score bucket."""
+    dist = {i * 10: 0 for i in range(11)}
+    for cve in cves:
+        bucket = int(cve["universal_risk_score"] // 10) * 10
+        dist[bucket] += 1
+    return [{"range": f"{k}-{k + 9}", "count": v} for k, v in dist.items()]
+
+
+def cves_by_vendor(handle: str, store: DatasetStore = dataset_store) -> list[dict[str, str | int]]:
+    return store.derived(handle, "cves_by_vendor", _top_vendors, [])
+
+
+def stack_gaps_count(handle: str, tech_stack: Iterable[str], store: DatasetStore = dataset_store) -> int:
+    tech_stack_lower = tuple(tech.lower() for tech in tech_stack)
+    return store.derived(
+        handle,
+        "stack_gaps:" + "|".join(tech_stack_lower),
+        lambda cves: _count_stack_gaps(cves, tech_stack_lower),
+        0,
+    )
+
+
+def avg_enrichment_time(handle: str, store: DatasetStore = dataset_store) -> int:
+    return store.derived(handle, "avg_enrichment_time", _avg_enrichment_time, 0)
+
+
+def worst_offenders(handle: str, store: DatasetStore = dataset_store) -> list[dict]:
+    return store.derived(handle, "worst_offenders", _worst_offenders, [])
+
+
+def gap_score_distribution(handle: str, field: str, store: DatasetStore = dataset_store) -> list[dict]:
+    """Distribution of cvss_gap_score or cpe_gap_score, keyed like the state vars."""
+    return store.derived(
+        handle,
+        f"{field.removesuffix('_score')}_distribution",
+        lambda gaps: _gap_score_distribution(gaps, field),
+        _gap_score_distribution([], field),
+    )
+
+
+def monthly_backlog_growth(handle: str, store: DatasetStore = dataset_store) -> list[dict]:
+    return store.derived(handle, "monthly_backlog_growth", _monthly_backlog_growth, [])
+
+
+def risk_score_distribution(handle: str, store: DatasetStore = dataset_store) -> list[dict]:
+    return store.derived(
+        handle,
+        "score_distribution",
+        _risk_score_distribution,
+        _risk_score_distribution([]),
+    )
@@ -0,0 +1,176 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from itertools import count, islice
+from typing import Any, Callable, Optional, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+SIZE_SAMPLE_ROWS = 100
+
+
+def _deep_size(value: Any) -> int:
+    """Approximate in-memory size of a JSON-like value."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_size(k) + _deep_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_deep_size(v) for v in value)
+    return size
+
+
+def approximate_size(data: Any) -> int:
+    """Estimate a dataset's size from a sample of its rows."""
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, list) and len(data) > SIZE_SAMPLE_ROWS:
+        sample = sum(_deep_size(row) for row in islice(data, SIZE_SAMPLE_ROWS))
+        return sys.getsizeof(data) + sample * len(data) // SIZE_SAMPLE_ROWS
+    return _deep_size(data)
+
+
+class Dataset:
+    """One stored dataset plus artifacts derived from it, such as indexes."""
+
+    def __init__(self, scope: str, name: str, data: Any):
+        self.scope = scope
+        self.name = name
+        self.data = data
+        self.approx_bytes = approximate_size(data)
+        self.last_access = time.monotonic()
+        self._derived: dict[str, Any] = {}
+
+    def derived(self, key: str, build: Callable[[Any], T]) -> T:
+        """Build an artifact from the data once and reuse it while the dataset lives."""
+        if key not in self._derived:
+            self._derived[key] = build(self.data)
+        return self._derived[key]
+
+
+class DatasetStore:
+    """Process-level home for large per-session and per-organization datasets.
+
+    States keep only the handle returned by put(), so the rows are never part
+    of serialized or diffed Reflex state. A handle names a scope (a session or
+    organization), a dataset name and a version; putting the same scope and
+    name again replaces the previous version and returns a new handle, which
+    lets computed vars that depend on the handle recompute. Datasets idle for
+    longer than idle_ttl, or beyond max_datasets, are evicted.
+    """
+
+    def __init__(self, max_datasets: int = 2000, idle_ttl: float = 4 * 3600):
+        self.max_datasets = max_datasets
+        self.idle_ttl = idle_ttl
+        self._datasets: OrderedDict[str, Dataset] = OrderedDict()
+        self._current: dict[tuple[str, str], str] = {}
+        self._versions = count(1)
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def _evict(self, handle: str):
+        dataset = self._datasets.pop(handle)
+        if self._current.get((dataset.scope, dataset.name)) == handle:
+            del self._current[(dataset.scope, dataset.name)]
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._datasets:
+            handle, dataset = next(iter(self._datasets.items()))
+            if dataset.last_access >= cutoff and len(self._datasets) <= self.max_datasets:
+                break
+            self._evict(handle)
+            self._evictions += 1
+
+    def put(self, scope: str, name: str, data: Any) -> str:
+        """Store data for (scope, name), replacing any earlier version, and return its handle."""
+        with self._lock:
+            previous = self._current.get((scope, name))
+            if previous in self._datasets:
+                self._evict(previous)
+            handle = f"{scope}/{name}@{next(self._versions)}"
+            self._datasets[handle] = Dataset(scope, name, data)
+            self._current[(scope, name)] = handle
+            self._prune()
+            return handle
+
+    def get(self, handle: str) -> Optional[Dataset]:
+        """The dataset for a handle, or None if it was replaced or evicted."""
+        if not handle:
+            return None
+        with self._lock:
+            dataset = self._datasets.get(handle)
+            if dataset is not None:
+                dataset.last_access = time.monotonic()
+                self._datasets.move_to_end(handle)
+            return dataset
+
+    def is_missing(self, handle: str) -> bool:
+        """True if handle was issued but its dataset is not in this process.
+
+        That happens after eviction or the idle TTL, when the session moved to
+        another worker, or after a restart with persisted state. Callers should
+        reload the data rather than render an empty result.
+        """
+        if not handle:
+            return False
+        with self._lock:
+            return handle not in self._datasets
+
+    def data(self, handle: str, default: Any = None) -> Any:
+        """The stored data for a handle, or default if it is gone."""
+        dataset = self.get(handle)
+        return dataset.data if dataset is not None else default
+
+    def derived(
+        self, handle: str, key: str, build: Callable[[Any], T], default: T = None
+    ) -> T:
+        """An artifact derived from a handle's data, built once per dataset version."""
+        dataset = self.get(handle)
+        return dataset.derived(key, build) if dataset is not None else default
+
+    def drop_scope(self, scope: str):
+        """Release every dataset held for a session or organization."""
+        with self._lock:
+            for handle in [h for h, d in self._datasets.items() if d.scope == scope]:
+                self._evict(handle)
+
+    def metrics(self) -> list[dict[str, Any]]:
+        """Per-scope dataset count, row count and approximate memory, largest first."""
+        scopes: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for dataset in self._datasets.values():
+                stats = scopes.setdefault(
+                    dataset.scope,
+                    {"scope": dataset.scope, "datasets": 0, "rows": 0, "approx_bytes": 0},
+                )
+                stats["datasets"] += 1
+                stats["rows"] += len(dataset.data) if hasattr(dataset.data, "__len__") else 0
+                stats["approx_bytes"] += dataset.approx_bytes
+        return sorted(scopes.values(), key=lambda s: s["approx_bytes"], reverse=True)
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+
+def session_scope(state) -> str:
+    """Dataset scope for the browser session a state belongs to."""
+    try:
+        token = state.router.session.client_token
+    except Exception as e:
+        logging.debug(f"No session token available for dataset scope: {e}")
+        token = ""
+    return f"session:{token or 'anonymous'}"
+
+
+dataset_store = DatasetStore(
+    max_datasets=int(os.getenv("DATASET_STORE_MAX_DATASETS", "2000")),
+    idle_ttl=float(os.getenv("DATASET_STORE_IDLE_TTL", str(4 * 3600))),
+)
@@ -1,5 +1,7 @@
 import os
 import base64
+import hashlib
+import hmac
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -18,6 +20,8 @@ def get_key_from_secret(secret: str, salt: bytes) -> bytes:
     return key
 
 
+API_KEY_PEPPER = os.getenv("API_KEY_PEPPER", ENCRYPTION_SECRET).encode()
+
 encryption_key = get_key_from_secret(ENCRYPTION_SECRET, SALT)
 fernet_client = Fernet(encryption_key)
 
@@ -45,4 +49,13 @@ def decrypt_data(encrypted_data: str) -> str:
         logging.exception(
             f"Decryption failed: {e}. The data may be tampered or the key is incorrect."
         )
-        return ""
\ No newline at end of file
+        return ""
+
+
+def hash_api_key(api_key: str) -> str:
+    """Keyed SHA-256 digest of a full API key, as stored in api_keys.key_hash.
+
+    Keys are long random strings, so a fast keyed hash is enough: the pepper
+    keeps a leaked table from being checked offline.
+    """
+    return hmac.new(API_KEY_PEPPER, api_key.encode(), hashlib.sha256).hexdigest()
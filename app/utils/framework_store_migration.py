@@ -0,0 +1,64 @@
+import reflex as rx
+
+FRAMEWORK_STORE_MIGRATION_SCRIPT = """
+-- === Phase 1: Local Framework Stores ===
+
+-- Create 'nvd_cve_mirror' to hold the CVSS data of every CVE seen by the NVD sync
+CREATE TABLE IF NOT EXISTS public.nvd_cve_mirror (
+    cve_id TEXT PRIMARY KEY,
+    cvss_score NUMERIC(3,1),
+    severity TEXT,
+    vector TEXT,
+    cvss_version TEXT,
+    published_at TIMESTAMPTZ,
+    last_modified_at TIMESTAMPTZ,
+    mirrored_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+COMMENT ON TABLE public.nvd_cve_mirror IS 'Local mirror of NVD CVSS data used for batch framework enrichment.';
+
+-- Create 'epss_scores' to hold the latest daily EPSS score for every CVE
+CREATE TABLE IF NOT EXISTS public.epss_scores (
+    cve_id TEXT PRIMARY KEY,
+    epss_score NUMERIC(6,5) NOT NULL,
+    percentile NUMERIC(6,5),
+    score_date DATE NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+COMMENT ON TABLE public.epss_scores IS 'Latest FIRST EPSS score per CVE, refreshed daily from the bulk feed.';
+
+
+-- === Phase 2: RLS Policies ===
+
+ALTER TABLE public.nvd_cve_mirror ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.epss_scores ENABLE ROW LEVEL SECURITY;
+
+-- Framework data is public and shared by all tenants; only the sync jobs write it.
+CREATE POLICY "Authenticated users can read the NVD mirror" ON public.nvd_cve_mirror FOR SELECT
+    USING ( auth.role() = 'authenticated' );
+CREATE POLICY "Authenticated users can read EPSS scores" ON public.epss_scores FOR SELECT
+    USING ( auth.role() = 'authenticated' );
+
+CREATE POLICY "Admins have full access to nvd_cve_mirror" ON public.nvd_cve_mirror FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to epss_scores" ON public.epss_scores FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+
+
+-- === Phase 3: Indexes ===
+
+CREATE INDEX IF NOT EXISTS idx_epss_scores_score_date ON public.epss_scores(score_date);
+
+
+-- === Final Grant Statements ===
+
+GRANT SELECT ON public.nvd_cve_mirror TO authenticated;
+GRANT SELECT ON public.epss_scores TO authenticated;
+
+SELECT 'SUCCESS: Local framework store schema has been applied.';
+
+"""
+
+
+def get_framework_store_migration_script() -> str:
+    """Returns the SQL migration script for the local NVD mirror and EPSS table."""
+    return FRAMEWORK_STORE_MIGRATION_SCRIPT
@@ -0,0 +1,85 @@
+import reflex as rx
+
+LEV_MIGRATION_SCRIPT = """
+-- === Phase 1: EPSS History and LEV Tables ===
+
+-- Create 'epss_history' to keep every daily EPSS score, the input series for LEV
+CREATE TABLE IF NOT EXISTS public.epss_history (
+    cve_id TEXT NOT NULL,
+    score_date DATE NOT NULL,
+    epss_score NUMERIC(6,5) NOT NULL,
+    PRIMARY KEY (cve_id, score_date)
+);
+COMMENT ON TABLE public.epss_history IS 'Daily EPSS score history per CVE, appended by the EPSS bulk sync.';
+
+-- Create 'lev_scores' to hold the running LEV accumulator for every CVE
+CREATE TABLE IF NOT EXISTS public.lev_scores (
+    cve_id TEXT PRIMARY KEY,
+    log_survival DOUBLE PRECISION NOT NULL,  -- Sum of ln(1 - epss/30) over every observed day
+    days_observed INTEGER NOT NULL,
+    first_score_date DATE NOT NULL,
+    last_score_date DATE NOT NULL,
+    lev_score NUMERIC(6,5) NOT NULL,         -- 1 - exp(log_survival)
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+COMMENT ON TABLE public.lev_scores IS 'Likely Exploited Vulnerabilities (NIST CSWP 41 LEV2) scores, updated incrementally each day.';
+
+
+-- === Phase 2: RLS Policies ===
+
+ALTER TABLE public.epss_history ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.lev_scores ENABLE ROW LEVEL SECURITY;
+
+-- EPSS and LEV are public and shared by all tenants; only the sync jobs write them.
+CREATE POLICY "Authenticated users can read EPSS history" ON public.epss_history FOR SELECT
+    USING ( auth.role() = 'authenticated' );
+CREATE POLICY "Authenticated users can read LEV scores" ON public.lev_scores FOR SELECT
+    USING ( auth.role() = 'authenticated' );
+
+CREATE POLICY "Admins have full access to epss_history" ON public.epss_history FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to lev_scores" ON public.lev_scores FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+
+
+-- === Phase 3: Indexes ===
+
+CREATE INDEX IF NOT EXISTS idx_epss_history_score_date ON public.epss_history(score_date);
+
+
+-- === Phase 4: Functions ===
+
+-- Copy the latest LEV scores onto every organization's framework scores. The score
+-- component store reads LEV from framework_scores.lev_score, so this keeps it live.
+CREATE OR REPLACE FUNCTION public.sync_framework_lev_scores()
+RETURNS INTEGER AS $$
+DECLARE
+    row_count INTEGER;
+BEGIN
+    UPDATE public.framework_scores f
+    SET lev_score = l.lev_score
+    FROM public.lev_scores l
+    WHERE f.cve_id = l.cve_id
+      AND f.lev_score IS DISTINCT FROM l.lev_score;
+    GET DIAGNOSTICS row_count = ROW_COUNT;
+    RETURN row_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+
+-- === Final Grant Statements ===
+
+GRANT SELECT ON public.epss_history TO authenticated;
+GRANT SELECT ON public.lev_scores TO authenticated;
+-- The LEV sync writes every tenant's framework scores, so only the EPSS sync job's service role may run it
+REVOKE EXECUTE ON FUNCTION public.sync_framework_lev_scores() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.sync_framework_lev_scores() TO service_role;
+
+SELECT 'SUCCESS: EPSS history and LEV schema has been applied.';
+
+"""
+
+
+def get_lev_migration_script() -> str:
+    """Returns the SQL migration script for EPSS history and LEV scores."""
+    return LEV_MIGRATION_SCRIPT
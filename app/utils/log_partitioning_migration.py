@@ -0,0 +1,390 @@
+import reflex as rx
+
+LOG_PARTITIONING_MIGRATION_SCRIPT = """
+-- === Phase 1: Retention Policies ===
+
+-- One row per partitioned log table: its partition key and how long raw rows are kept
+CREATE TABLE IF NOT EXISTS public.log_retention_policies (
+    table_name TEXT PRIMARY KEY,
+    time_column TEXT NOT NULL,
+    retention_months INTEGER NOT NULL CHECK (retention_months > 0),
+    premake_months INTEGER NOT NULL DEFAULT 2 CHECK (premake_months >= 0),
+    last_maintained_at TIMESTAMPTZ
+);
+COMMENT ON TABLE public.log_retention_policies IS 'Partition key, raw-row retention and partitions created ahead for each monthly-partitioned log table.';
+
+INSERT INTO public.log_retention_policies (table_name, time_column, retention_months) VALUES
+    ('api_health_log', 'start_time', 3),
+    ('api_usage_log', 'timestamp', 6),
+    ('llm_usage_log', 'created_at', 13),
+    ('alert_history', 'created_at', 12),
+    ('report_audit_log', 'timestamp', 24)
+ON CONFLICT (table_name) DO NOTHING;
+
+
+-- === Phase 2: Partition Management Functions ===
+
+-- Create monthly partitions from p_from through p_months_ahead months past now, plus a
+-- default partition for stray timestamps. Partitions get RLS with no policies, so they
+-- can only be read through the parent table and its policies.
+CREATE OR REPLACE FUNCTION public.ensure_log_partitions(p_table TEXT, p_from DATE, p_months_ahead INTEGER DEFAULT 2)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', p_from)::date;
+    last_month DATE := (date_trunc('month', NOW()) + make_interval(months => p_months_ahead))::date;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := p_table || '_p' || to_char(month_start, 'YYYYMM');
+        IF to_regclass(format('public.%I', partition_name)) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE public.%I PARTITION OF public.%I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, p_table, month_start, (month_start + INTERVAL '1 month')::date
+            );
+            EXECUTE format('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', partition_name);
+            created := created + 1;
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+    IF to_regclass(format('public.%I', p_table || '_default')) IS NULL THEN
+        EXECUTE format('CREATE TABLE public.%I PARTITION OF public.%I DEFAULT', p_table || '_default', p_table);
+        EXECUTE format('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', p_table || '_default');
+    END IF;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Drop monthly partitions that ended more than p_retention_months ago
+CREATE OR REPLACE FUNCTION public.drop_expired_log_partitions(p_table TEXT, p_retention_months INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    cutoff DATE := (date_trunc('month', NOW()) - make_interval(months => p_retention_months))::date;
+    part RECORD;
+    dropped INTEGER := 0;
+BEGIN
+    FOR part IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = format('public.%I', p_table)::regclass
+          AND c.relname ~ ('^' || p_table || '_p[0-9]{6}$')
+          AND to_date(right(c.relname, 6), 'YYYYMM') < cutoff
+    LOOP
+        EXECUTE format('DROP TABLE public.%I', part.relname);
+        dropped := dropped + 1;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Convert an existing log table into a monthly range-partitioned table in place.
+-- Columns, defaults, checks, foreign keys, RLS policies and rows are carried over; the
+-- primary key becomes (id, time column) because it must include the partition key.
+CREATE OR REPLACE FUNCTION public.partition_log_table(p_table TEXT, p_time_column TEXT)
+RETURNS VOID AS $$
+DECLARE
+    legacy TEXT := p_table || '_unpartitioned';
+    seq TEXT := p_table || '_part_id_seq';
+    idx RECORD;
+    con RECORD;
+    pol RECORD;
+    first_month DATE;
+    max_id BIGINT;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_partitioned_table WHERE partrelid = format('public.%I', p_table)::regclass
+    ) THEN
+        RETURN;
+    END IF;
+
+    EXECUTE format('ALTER TABLE public.%I RENAME TO %I', p_table, legacy);
+    FOR idx IN
+        SELECT c.relname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = format('public.%I', legacy)::regclass
+    LOOP
+        EXECUTE format('ALTER INDEX public.%I RENAME TO %I', idx.relname, left(idx.relname, 48) || '_unpartitioned');
+    END LOOP;
+    EXECUTE format('UPDATE public.%I SET %I = NOW() WHERE %I IS NULL', legacy, p_time_column, p_time_column);
+
+    EXECUTE format(
+        'CREATE TABLE public.%I (LIKE public.%I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS) PARTITION BY RANGE (%I)',
+        p_table, legacy, p_time_column
+    );
+    EXECUTE format('CREATE SEQUENCE public.%I', seq);
+    EXECUTE format('ALTER TABLE public.%I ALTER COLUMN id SET DEFAULT nextval(%L)', p_table, 'public.' || seq);
+    EXECUTE format('ALTER TABLE public.%I ADD PRIMARY KEY (id, %I)', p_table, p_time_column);
+
+    FOR con IN
+        SELECT conname, pg_get_constraintdef(oid) AS def
+        FROM pg_constraint
+        WHERE conrelid = format('public.%I', legacy)::regclass AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE public.%I ADD CONSTRAINT %I %s', p_table, con.conname, con.def);
+    END LOOP;
+
+    IF (SELECT relrowsecurity FROM pg_class WHERE oid = format('public.%I', legacy)::regclass) THEN
+        EXECUTE format('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', p_table);
+    END IF;
+    FOR pol IN
+        SELECT policyname, permissive, roles, cmd, qual, with_check
+        FROM pg_policies
+        WHERE schemaname = 'public' AND tablename = legacy
+    LOOP
+        EXECUTE format(
+            'CREATE POLICY %I ON public.%I AS %s FOR %s TO %s',
+            pol.policyname, p_table, pol.permissive, pol.cmd, array_to_string(pol.roles, ', ')
+        ) || COALESCE(' USING (' || pol.qual || ')', '')
+          || COALESCE(' WITH CHECK (' || pol.with_check || ')', '');
+    END LOOP;
+
+    EXECUTE format('SELECT date_trunc(''month'', MIN(%I))::date FROM public.%I', p_time_column, legacy) INTO first_month;
+    PERFORM public.ensure_log_partitions(p_table, COALESCE(first_month, date_trunc('month', NOW())::date));
+    EXECUTE format('INSERT INTO public.%I SELECT * FROM public.%I', p_table, legacy);
+    EXECUTE format('SELECT MAX(id) FROM public.%I', legacy) INTO max_id;
+    IF max_id IS NOT NULL THEN
+        PERFORM setval(format('public.%I', seq), max_id);
+    END IF;
+
+    EXECUTE format('DROP TABLE public.%I', legacy);
+    EXECUTE format('ALTER SEQUENCE public.%I RENAME TO %I', seq, p_table || '_id_seq');
+    EXECUTE format('ALTER SEQUENCE public.%I OWNED BY public.%I.id', p_table || '_id_seq', p_table);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Daily maintenance: premake upcoming partitions and drop expired ones for every policy
+CREATE OR REPLACE FUNCTION public.maintain_log_partitions()
+RETURNS JSONB AS $$
+DECLARE
+    policy RECORD;
+    created INTEGER;
+    dropped INTEGER;
+    summary JSONB := '{}'::jsonb;
+BEGIN
+    FOR policy IN SELECT * FROM public.log_retention_policies LOOP
+        created := public.ensure_log_partitions(policy.table_name, NOW()::date, policy.premake_months);
+        dropped := public.drop_expired_log_partitions(policy.table_name, policy.retention_months);
+        UPDATE public.log_retention_policies SET last_maintained_at = NOW() WHERE table_name = policy.table_name;
+        summary := summary || jsonb_build_object(
+            policy.table_name, jsonb_build_object('created', created, 'dropped', dropped)
+        );
+    END LOOP;
+    RETURN summary;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+
+-- === Phase 3: Convert Log Tables ===
+
+SELECT public.partition_log_table(table_name, time_column) FROM public.log_retention_policies;
+
+-- Recreate the read indexes; indexes on a partitioned table cascade to every partition
+CREATE INDEX IF NOT EXISTS idx_api_health_log_start_time ON public.api_health_log(start_time DESC);
+CREATE INDEX IF NOT EXISTS idx_api_usage_log_org_timestamp ON public.api_usage_log(organization_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_llm_usage_log_org_created ON public.llm_usage_log(organization_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_alert_history_org_status_created ON public.alert_history(organization_id, status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_alert_history_dedup_key ON public.alert_history(deduplication_key);
+CREATE INDEX IF NOT EXISTS idx_report_audit_log_report_id_timestamp ON public.report_audit_log(report_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_report_audit_log_user_id ON public.report_audit_log(user_id);
+
+
+-- === Phase 4: Hourly Rollups ===
+
+CREATE TABLE IF NOT EXISTS public.api_health_hourly (
+    hour TIMESTAMPTZ NOT NULL,
+    api_name TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    avg_duration_ms NUMERIC(10,2),
+    p95_duration_ms INTEGER,
+    max_duration_ms INTEGER,
+    records_fetched BIGINT,
+    PRIMARY KEY (hour, api_name)
+);
+COMMENT ON TABLE public.api_health_hourly IS 'Hourly call, failure and latency rollup of api_health_log.';
+
+CREATE TABLE IF NOT EXISTS public.api_usage_hourly (
+    hour TIMESTAMPTZ NOT NULL,
+    organization_id UUID NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    avg_response_time_ms NUMERIC(10,2),
+    p95_response_time_ms INTEGER,
+    PRIMARY KEY (hour, organization_id, endpoint)
+);
+COMMENT ON TABLE public.api_usage_hourly IS 'Hourly request, error and latency rollup of api_usage_log per organization and endpoint.';
+
+CREATE TABLE IF NOT EXISTS public.llm_usage_hourly (
+    hour TIMESTAMPTZ NOT NULL,
+    organization_id UUID NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    analyses INTEGER NOT NULL,
+    cached_analyses INTEGER NOT NULL,
+    tokens_used BIGINT NOT NULL,
+    credits_charged BIGINT NOT NULL,
+    avg_duration_ms NUMERIC(10,2),
+    PRIMARY KEY (hour, organization_id, provider, model)
+);
+COMMENT ON TABLE public.llm_usage_hourly IS 'Hourly analysis, token and credit rollup of llm_usage_log per organization and model.';
+
+CREATE TABLE IF NOT EXISTS public.alert_hourly (
+    hour TIMESTAMPTZ NOT NULL,
+    organization_id UUID NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+    severity TEXT NOT NULL,
+    alerts INTEGER NOT NULL,
+    PRIMARY KEY (hour, organization_id, severity)
+);
+COMMENT ON TABLE public.alert_hourly IS 'Hourly alert counts from alert_history per organization and severity.';
+
+CREATE TABLE IF NOT EXISTS public.report_audit_hourly (
+    hour TIMESTAMPTZ NOT NULL,
+    action TEXT NOT NULL,
+    events INTEGER NOT NULL,
+    PRIMARY KEY (hour, action)
+);
+COMMENT ON TABLE public.report_audit_hourly IS 'Hourly event counts from report_audit_log per action.';
+
+-- Recompute the rollups for the last p_hours hours. Upserts make reruns idempotent, and
+-- running hourly keeps rollups ahead of partition retention, so aggregates outlive raw rows.
+CREATE OR REPLACE FUNCTION public.refresh_log_rollups(p_hours INTEGER DEFAULT 2)
+RETURNS TIMESTAMPTZ AS $$
+DECLARE
+    since TIMESTAMPTZ := date_trunc('hour', NOW()) - make_interval(hours => p_hours);
+BEGIN
+    INSERT INTO public.api_health_hourly
+        (hour, api_name, calls, failures, avg_duration_ms, p95_duration_ms, max_duration_ms, records_fetched)
+    SELECT
+        date_trunc('hour', start_time), api_name, COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'failure'),
+        ROUND(AVG(duration_ms), 2),
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms)::INTEGER,
+        MAX(duration_ms),
+        SUM(records_fetched)
+    FROM public.api_health_log
+    WHERE start_time >= since
+    GROUP BY 1, 2
+    ON CONFLICT (hour, api_name) DO UPDATE SET
+        calls = EXCLUDED.calls,
+        failures = EXCLUDED.failures,
+        avg_duration_ms = EXCLUDED.avg_duration_ms,
+        p95_duration_ms = EXCLUDED.p95_duration_ms,
+        max_duration_ms = EXCLUDED.max_duration_ms,
+        records_fetched = EXCLUDED.records_fetched;
+
+    INSERT INTO public.api_usage_hourly
+        (hour, organization_id, endpoint, requests, errors, avg_response_time_ms, p95_response_time_ms)
+    SELECT
+        date_trunc('hour', "timestamp"), organization_id, endpoint, COUNT(*),
+        COUNT(*) FILTER (WHERE status_code >= 400),
+        ROUND(AVG(response_time_ms), 2),
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY response_time_ms)::INTEGER
+    FROM public.api_usage_log
+    WHERE "timestamp" >= since
+    GROUP BY 1, 2, 3
+    ON CONFLICT (hour, organization_id, endpoint) DO UPDATE SET
+        requests = EXCLUDED.requests,
+        errors = EXCLUDED.errors,
+        avg_response_time_ms = EXCLUDED.avg_response_time_ms,
+        p95_response_time_ms = EXCLUDED.p95_response_time_ms;
+
+    INSERT INTO public.llm_usage_hourly
+        (hour, organization_id, provider, model, analyses, cached_analyses, tokens_used, credits_charged, avg_duration_ms)
+    SELECT
+        date_trunc('hour', created_at), organization_id, COALESCE(provider, ''), COALESCE(model, ''),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE was_cached),
+        COALESCE(SUM(tokens_used), 0),
+        COALESCE(SUM(credits_charged), 0),
+        ROUND(AVG(analysis_duration_ms), 2)
+    FROM public.llm_usage_log
+    WHERE created_at >= since
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (hour, organization_id, provider, model) DO UPDATE SET
+        analyses = EXCLUDED.analyses,
+        cached_analyses = EXCLUDED.cached_analyses,
+        tokens_used = EXCLUDED.tokens_used,
+        credits_charged = EXCLUDED.credits_charged,
+        avg_duration_ms = EXCLUDED.avg_duration_ms;
+
+    INSERT INTO public.alert_hourly (hour, organization_id, severity, alerts)
+    SELECT date_trunc('hour', created_at), organization_id, severity, COUNT(*)
+    FROM public.alert_history
+    WHERE created_at >= since
+    GROUP BY 1, 2, 3
+    ON CONFLICT (hour, organization_id, severity) DO UPDATE SET alerts = EXCLUDED.alerts;
+
+    INSERT INTO public.report_audit_hourly (hour, action, events)
+    SELECT date_trunc('hour', "timestamp"), action, COUNT(*)
+    FROM public.report_audit_log
+    WHERE "timestamp" >= since
+    GROUP BY 1, 2
+    ON CONFLICT (hour, action) DO UPDATE SET events = EXCLUDED.events;
+
+    RETURN since;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Backfill rollups for the rows carried over from the unpartitioned tables (24 months)
+SELECT public.refresh_log_rollups(24 * 31 * 24);
+
+
+-- === Phase 5: RLS Policies ===
+
+ALTER TABLE public.log_retention_policies ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.api_health_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.api_usage_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.llm_usage_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.alert_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.report_audit_hourly ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view API usage rollups for their own organization" ON public.api_usage_hourly FOR SELECT
+    USING ( organization_id = (SELECT organization_id FROM public.users WHERE id = auth.uid()) );
+CREATE POLICY "Users can view LLM usage rollups for their own organization" ON public.llm_usage_hourly FOR SELECT
+    USING ( organization_id = (SELECT organization_id FROM public.users WHERE id = auth.uid()) );
+CREATE POLICY "Users can view alert rollups for their own organization" ON public.alert_hourly FOR SELECT
+    USING ( organization_id = (SELECT organization_id FROM public.users WHERE id = auth.uid()) );
+
+CREATE POLICY "Admins have full access to log_retention_policies" ON public.log_retention_policies FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to api_health_hourly" ON public.api_health_hourly FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to api_usage_hourly" ON public.api_usage_hourly FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to llm_usage_hourly" ON public.llm_usage_hourly FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to alert_hourly" ON public.alert_hourly FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+CREATE POLICY "Admins have full access to report_audit_hourly" ON public.report_audit_hourly FOR ALL
+    USING ( (SELECT role FROM public.users WHERE id = auth.uid()) = 'admin' );
+
+
+-- === Final Grant Statements ===
+
+GRANT ALL ON public.api_health_log, public.api_usage_log, public.llm_usage_log,
+    public.alert_history, public.report_audit_log TO authenticated;
+GRANT ALL ON SEQUENCE public.api_health_log_id_seq, public.api_usage_log_id_seq, public.llm_usage_log_id_seq,
+    public.alert_history_id_seq, public.report_audit_log_id_seq TO authenticated;
+GRANT INSERT ON public.api_health_log TO anon;
+GRANT USAGE ON SEQUENCE public.api_health_log_id_seq TO anon;
+GRANT SELECT ON public.api_health_hourly, public.api_usage_hourly, public.llm_usage_hourly,
+    public.alert_hourly, public.report_audit_hourly TO authenticated;
+REVOKE ALL ON FUNCTION public.partition_log_table(TEXT, TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.ensure_log_partitions(TEXT, DATE, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.drop_expired_log_partitions(TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.maintain_log_partitions() FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION public.refresh_log_rollups(INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.maintain_log_partitions() TO service_role;
+GRANT EXECUTE ON FUNCTION public.refresh_log_rollups(INTEGER) TO service_role;
+
+SELECT 'SUCCESS: Log tables are partitioned with retention and hourly rollups.';
+
+"""
+
+
+def get_log_partitioning_migration_script() -> str:
+    """Returns the SQL migration script for partitioned, retention-managed log tables."""
+    return LOG_PARTITIONING_MIGRATION_SCRIPT
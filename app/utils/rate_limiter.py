@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+# Requests per hour and per minute for each subscription tier. A key's own
+# api_keys.rate_limit, when set, replaces the hourly figure.
+PLAN_RATE_LIMITS = {
+    "free": {"hour": 1000, "minute": 60},
+    "pro": {"hour": 10000, "minute": 600},
+    "enterprise": {"hour": 100000, "minute": 3000},
+}
+DEFAULT_PLAN = "free"
+WINDOW_SECONDS = {"hour": 3600, "minute": 60}
+PRUNE_INTERVAL = 1000
+
+
+def plan_limits(plan: Optional[str], key_rate_limit: Optional[int] = None) -> list[tuple[int, int]]:
+    """(limit, window_seconds) rules for a plan tier, with the key's hourly override applied."""
+    limits = dict(PLAN_RATE_LIMITS.get(plan or DEFAULT_PLAN, PLAN_RATE_LIMITS[DEFAULT_PLAN]))
+    if key_rate_limit:
+        limits["hour"] = int(key_rate_limit)
+    return [(limits[name], WINDOW_SECONDS[name]) for name in ("minute", "hour")]
+
+
+def rate_limit_headers(decision: dict[str, Any]) -> dict[str, str]:
+    """X-RateLimit-* headers for a decision, plus Retry-After when it was refused."""
+    headers = {
+        "X-RateLimit-Limit": str(decision["limit"]),
+        "X-RateLimit-Remaining": str(decision["remaining"]),
+        "X-RateLimit-Reset": str(decision["reset"]),
+    }
+    if not decision["allowed"]:
+        headers["Retry-After"] = str(decision["retry_after"])
+    return headers
+
+
+class SlidingWindowRateLimiter:
+    """Sliding-window request limits per key, checked against several windows at once.
+
+    Each window keeps a counter for the current and the previous fixed
+    interval and estimates the sliding count by weighting the previous
+    counter by how much of it still overlaps the window, so memory per key
+    is constant. A request is counted only when every window allows it.
+
+    Counters live in memory and are per process. When store_path is set they
+    are kept in a SQLite file instead, so worker processes on the same host
+    share one budget per key; if the file cannot be opened the limiter falls
+    back to memory.
+    """
+
+    def __init__(self, store_path: Optional[str] = None, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._counters: dict[tuple[str, int], list[float]] = {}
+        self._lock = threading.Lock()
+        self._checks = 0
+        self._stats = {"allowed": 0, "limited": 0, "store_errors": 0}
+        self._store = None
+        if store_path:
+            try:
+                self._store = sqlite3.connect(store_path, timeout=1.0, check_same_thread=False, isolation_level=None)
+                self._store.execute(
+                    "CREATE TABLE IF NOT EXISTS rate_windows (key TEXT, window INTEGER, start INTEGER, count INTEGER, PRIMARY KEY (key, window, start))"
+                )
+            except Exception as e:
+                logging.exception(f"Failed to open rate limit store at {store_path}: {e}")
+                self._store = None
+
+    @staticmethod
+    def _estimate(previous: float, current: float, elapsed: float, window: int) -> float:
+        return previous * (1 - elapsed / window) + current
+
+    @staticmethod
+    def _retry_after(previous: float, current: float, cost: int, limit: int, elapsed: float, window: int) -> float:
+        """Seconds until the estimate leaves room for cost more requests."""
+        if current + cost > limit or previous <= 0:
+            return window - elapsed
+        return min(window - elapsed, (previous + current + cost - limit) / previous * window - elapsed)
+
+    def _decide(
+        self, counts: list[tuple[float, float]], rules: list[tuple[int, int]], cost: int, now: float
+    ) -> dict[str, Any]:
+        allowed = True
+        retry_after = 0.0
+        tightest = None
+        for (previous, current), (limit, window) in zip(counts, rules):
+            elapsed = now % window
+            estimate = self._estimate(previous, current, elapsed, window)
+            remaining = limit - estimate - cost
+            if estimate + cost > limit:
+                allowed = False
+                retry_after = max(retry_after, self._retry_after(previous, current, cost, limit, elapsed, window))
+            if tightest is None or remaining < tightest[0]:
+                tightest = (remaining, limit, window - elapsed)
+        remaining, limit, reset = tightest
+        return {
+            "allowed": allowed,
+            "limit": limit,
+            "remaining": max(0, math.floor(remaining)) if allowed else 0,
+            "reset": math.ceil(reset),
+            "retry_after": max(1, math.ceil(retry_after)) if not allowed else 0,
+        }
+
+    def _hit_memory(self, key: str, rules: list[tuple[int, int]], cost: int, now: float) -> dict[str, Any]:
+        with self._lock:
+            counters = []
+            for _, window in rules:
+                start = now - now % window
+                counter = self._counters.get((key, window))
+                if counter is None:
+                    counter = self._counters[(key, window)] = [start, 0, 0]
+                elif counter[0] != start:
+                    # Roll forward; a counter more than one interval old contributes nothing.
+                    counter[2] = counter[1] if start - counter[0] == window else 0
+                    counter[0], counter[1] = start, 0
+                counters.append(counter)
+            decision = self._decide([(c[2], c[1]) for c in counters], rules, cost, now)
+            if decision["allowed"]:
+                for counter in counters:
+                    counter[1] += cost
+            self._checks += 1
+            if self._checks % PRUNE_INTERVAL == 0 or len(self._counters) > self.max_keys:
+                self._prune(now)
+        return decision
+
+    def _prune(self, now: float):
+        stale = [k for k, c in self._counters.items() if now - c[0] >= 2 * k[1]]
+        for k in stale:
+            del self._counters[k]
+        overflow = len(self._counters) - self.max_keys
+        if overflow > 0:
+            for k in sorted(self._counters, key=lambda k: self._counters[k][0])[:overflow]:
+                del self._counters[k]
+
+    def _hit_store(self, key: str, rules: list[tuple[int, int]], cost: int, now: float) -> dict[str, Any]:
+        with self._lock:
+            store = self._store
+            store.execute("BEGIN IMMEDIATE")
+            try:
+                counts = []
+                for _, window in rules:
+                    start = int(now - now % window)
+                    rows = dict(
+                        store.execute(
+                            "SELECT start, count FROM rate_windows WHERE key = ? AND window = ? AND start IN (?, ?)",
+                            (key, window, start, start - window),
+                        ).fetchall()
+                    )
+                    counts.append((rows.get(start - window, 0), rows.get(start, 0)))
+                decision = self._decide(counts, rules, cost, now)
+                if decision["allowed"]:
+                    for _, window in rules:
+                        store.execute(
+                            "INSERT INTO rate_windows (key, window, start, count) VALUES (?, ?, ?, ?) "
+                            "ON CONFLICT (key, window, start) DO UPDATE SET count = count + excluded.count",
+                            (key, window, int(now - now % window), cost),
+                        )
+                self._checks += 1
+                if self._checks % PRUNE_INTERVAL == 0:
+                    store.execute(
+                        "DELETE FROM rate_windows WHERE start < ? - 2 * window", (int(now),)
+                    )
+                store.execute("COMMIT")
+            except Exception:
+                store.execute("ROLLBACK")
+                raise
+        return decision
+
+    def hit(self, key: str, rules: list[tuple[int, int]], cost: int = 1, now: Optional[float] = None) -> dict[str, Any]:
+        """Count cost requests for key if every (limit, window_seconds) rule allows them.
+
+        Returns allowed, plus limit, remaining and reset (seconds) for the
+        tightest window and retry_after (seconds) when refused. If the shared
+        store fails, the check falls back to this process's counters.
+        """
+        now = time.time() if now is None else now
+        decision = None
+        if self._store is not None:
+            try:
+                decision = self._hit_store(key, rules, cost, now)
+            except Exception as e:
+                self._stats["store_errors"] += 1
+                logging.warning(f"Rate limit store check for {key} failed, using local counters: {e}")
+        if decision is None:
+            decision = self._hit_memory(key, rules, cost, now)
+        with self._lock:
+            self._stats["allowed" if decision["allowed"] else "limited"] += 1
+        return decision
+
+    async def hit_async(
+        self, key: str, rules: list[tuple[int, int]], cost: int = 1, now: Optional[float] = None
+    ) -> dict[str, Any]:
+        """hit() for async callers.
+
+        With a shared store the check takes a SQLite write lock that may wait
+        up to the busy timeout on other workers, so it runs in a thread to
+        keep the event loop free. Memory-only checks run inline.
+        """
+        if self._store is None:
+            return self.hit(key, rules, cost, now)
+        return await asyncio.to_thread(self.hit, key, rules, cost, now)
+
+    def metrics(self) -> dict[str, Any]:
+        """Requests allowed and limited, store errors, and keys tracked in memory."""
+        with self._lock:
+            tracked = len({key for key, _ in self._counters})
+        return {**self._stats, "tracked_keys": tracked, "shared_store": self._store is not None}
+
+
+api_rate_limiter = SlidingWindowRateLimiter(store_path=os.getenv("RATE_LIMIT_STORE_PATH"))
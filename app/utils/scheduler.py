@@ -44,6 +44,37 @@ async def scheduled_gap_analysis_job():
         logging.exception(f"Scheduled gap analysis job failed entirely: {e}")
 
 
+async def scheduled_admin_metrics_refresh():
+    """Refresh the materialized admin console KPIs."""
+    refreshed_at = await supabase_client.refresh_admin_metrics()
+    if refreshed_at:
+        logging.info(f"Admin metrics refreshed at {refreshed_at}.")
+
+
+async def scheduled_log_partition_maintenance():
+    """Premake next months' log partitions and drop partitions past retention."""
+    summary = await supabase_client.maintain_log_partitions()
+    if summary:
+        logging.info(f"Log partition maintenance: {summary}")
+
+
+async def scheduled_log_rollup_refresh():
+    """Recompute the hourly log rollups for the most recent hours."""
+    await supabase_client.refresh_log_rollups(hours=2)
+
+
+async def scheduled_credit_settlement():
+    """Settle idle credit blocks and return credits held by abandoned reservations."""
+    expired = await supabase_client.settle_credit_reservations()
+    if expired:
+        logging.warning(f"Released {expired} expired credit reservations.")
+
+
+async def scheduled_api_usage_flush():
+    """Queue aggregated API usage for minutes that have closed, even when traffic stops."""
+    supabase_client.usage_meter.flush()
+
+
 def job_listener(event):
     """Log job execution results for monitoring."""
     if event.exception:
@@ -79,6 +110,41 @@ def initialize_scheduler():
         max_instances=1,
         misfire_grace_time=600,
     )
+    scheduler.add_job(
+        scheduled_admin_metrics_refresh,
+        CronTrigger(minute="*/10"),
+        id="admin_metrics_refresh",
+        max_instances=1,
+        misfire_grace_time=300,
+    )
+    scheduler.add_job(
+        scheduled_log_rollup_refresh,
+        CronTrigger(minute="5"),
+        id="log_rollup_refresh",
+        max_instances=1,
+        misfire_grace_time=900,
+    )
+    scheduler.add_job(
+        scheduled_log_partition_maintenance,
+        CronTrigger(hour="2", minute="20", timezone="UTC"),
+        id="log_partition_maintenance",
+        max_instances=1,
+        misfire_grace_time=3600,
+    )
+    scheduler.add_job(
+        scheduled_credit_settlement,
+        CronTrigger(minute="*"),
+        id="credit_settlement",
+        max_instances=1,
+        misfire_grace_time=60,
+    )
+    scheduler.add_job(
+        scheduled_api_usage_flush,
+        CronTrigger(minute="*"),
+        id="api_usage_flush",
+        max_instances=1,
+        misfire_grace_time=60,
+    )
     scheduler.add_listener(job_listener, EVENT_JOB_ERROR | EVENT_JOB_EXECUTED)
     from app.services.exploit_feed_scheduler import scheduled_exploit_feed_sync
 
@@ -89,6 +155,24 @@ def initialize_scheduler():
         max_instances=1,
         misfire_grace_time=600,
     )
+    from app.services.backlog_index_sync import scheduled_backlog_index_sync
+
+    scheduler.add_job(
+        scheduled_backlog_index_sync,
+        CronTrigger(minute="15", hour="*/2"),
+        id="backlog_index_sync",
+        max_instances=1,
+        misfire_grace_time=1800,
+    )
+    from app.services.epss_sync import scheduled_epss_bulk_sync
+
+    scheduler.add_job(
+        scheduled_epss_bulk_sync,
+        CronTrigger(hour="6", minute="30", timezone="UTC"),
+        id="epss_bulk_sync",
+        max_instances=1,
+        misfire_grace_time=3600,
+    )
     scheduler.add_job(
         scheduled_model_retraining,
         CronTrigger(hour="3", minute="0", timezone="UTC"),
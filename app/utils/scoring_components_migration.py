@@ -0,0 +1,38 @@
+import reflex as rx
+
+SCORING_COMPONENTS_MIGRATION_SCRIPT = """
+-- === Phase 1: Persisted Scoring Components ===
+
+-- Normalized (0-100) per-framework inputs to the universal risk score. Persisting them
+-- lets a weight change re-rank a whole portfolio without refetching framework data.
+ALTER TABLE public.framework_scores ADD COLUMN IF NOT EXISTS cvss_component NUMERIC(6,3);
+ALTER TABLE public.framework_scores ADD COLUMN IF NOT EXISTS epss_component NUMERIC(6,3);
+ALTER TABLE public.framework_scores ADD COLUMN IF NOT EXISTS ssvc_component NUMERIC(6,3);
+
+-- Backfill components for rows scored before this migration
+UPDATE public.framework_scores
+SET
+    cvss_component = COALESCE(cvss_v3_score, 0) * 10,
+    epss_component = COALESCE(epss_score, 0) * 100,
+    ssvc_component = CASE ssvc_decision
+        WHEN 'Act' THEN 100
+        WHEN 'Attend' THEN 70
+        WHEN 'Track*' THEN 50
+        WHEN 'Track' THEN 20
+        ELSE 0
+    END
+WHERE cvss_component IS NULL;
+
+
+-- === Phase 2: Indexes ===
+
+CREATE INDEX IF NOT EXISTS idx_framework_scores_org_id ON public.framework_scores(organization_id, id);
+
+SELECT 'SUCCESS: Persisted scoring components schema has been applied.';
+
+"""
+
+
+def get_scoring_components_migration_script() -> str:
+    """Returns the SQL migration script for persisted scoring components."""
+    return SCORING_COMPONENTS_MIGRATION_SCRIPT
@@ -0,0 +1,107 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import count, repeat
+from typing import Optional, Sequence
+import numpy as np
+
+# Compound tokens keep identifiers like "cve-2024-1234" and "1.2.3" whole; their
+# alphanumeric parts are indexed too so "2024" or "1234" also match.
+COMPOUND_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-._][a-z0-9]+)*")
+PART_TOKEN_RE = re.compile(r"[a-z0-9]+")
+JOINED_TOKEN_RE = re.compile(r"[a-z0-9][-._][a-z0-9]")
+CVE_SEARCH_FIELDS = {"id": 4.0, "vendor": 2.0, "product": 2.0, "description": 1.0}
+
+
+def index_tokens(text: str) -> set[str]:
+    """Tokens stored for a field: compound tokens plus their alphanumeric parts."""
+    text = text.lower()
+    tokens = set(COMPOUND_TOKEN_RE.findall(text))
+    if JOINED_TOKEN_RE.search(text):
+        tokens.update(PART_TOKEN_RE.findall(text))
+    return tokens
+
+
+def query_terms(query: str) -> list[str]:
+    """Terms of a search query; each one is matched as a prefix."""
+    return list(dict.fromkeys(COMPOUND_TOKEN_RE.findall(query.lower())))
+
+
+class InvertedIndex:
+    """In-process full-text index over a fixed list of rows.
+
+    Each field's text is tokenized into postings (row ids with the best field
+    weight the token appears in). Postings are stored contiguously in token
+    order, so every token sharing a prefix is one slice. Query terms match any
+    token they are a prefix of, every term must match, and rows are ranked by
+    the sum of field weight times inverse document frequency over the matches.
+    """
+
+    def __init__(self, rows: Sequence[dict], fields: dict[str, float]):
+        self.size = len(rows)
+        token_ids: dict[str, int] = defaultdict(count().__next__)
+        posting_tokens = []
+        posting_rows = []
+        posting_weights = []
+        for row_id, row in enumerate(rows):
+            for field, weight in fields.items():
+                value = row.get(field)
+                if not value:
+                    continue
+                if isinstance(value, (list, tuple)):
+                    value = " ".join(str(v) for v in value)
+                tokens = index_tokens(str(value))
+                posting_tokens.extend(map(token_ids.__getitem__, tokens))
+                posting_rows.extend(repeat(row_id, len(tokens)))
+                posting_weights.extend(repeat(weight, len(tokens)))
+        self._vocab = sorted(token_ids)
+        rank = np.empty(len(token_ids), dtype=np.int64)
+        rank[[token_ids[token] for token in self._vocab]] = np.arange(len(self._vocab))
+        tokens = rank[np.asarray(posting_tokens, dtype=np.int64)]
+        row_ids = np.asarray(posting_rows, dtype=np.int64)
+        weights = np.asarray(posting_weights, dtype=np.float64)
+        # One posting per (token, row), keeping the best field weight.
+        order = np.lexsort((-weights, row_ids, tokens))
+        tokens, row_ids, weights = tokens[order], row_ids[order], weights[order]
+        first = np.ones(len(tokens), dtype=bool)
+        first[1:] = (tokens[1:] != tokens[:-1]) | (row_ids[1:] != row_ids[:-1])
+        tokens, row_ids, weights = tokens[first], row_ids[first], weights[first]
+        document_frequency = np.bincount(tokens, minlength=len(self._vocab))
+        self._offsets = np.concatenate(([0], np.cumsum(document_frequency)))
+        self._row_ids = row_ids
+        self._weights = weights * np.log1p(self.size / document_frequency[tokens])
+
+    def _expand(self, term: str) -> tuple[int, int]:
+        """Postings range of every token starting with term."""
+        start = bisect_left(self._vocab, term)
+        end = bisect_left(self._vocab, term + "\uffff", lo=start)
+        return int(self._offsets[start]), int(self._offsets[end])
+
+    def scores(self, query: str) -> Optional[np.ndarray]:
+        """Relevance per row (0 where a term does not match), or None for an empty query."""
+        terms = query_terms(query)
+        if not terms:
+            return None
+        total = np.zeros(self.size)
+        matched = np.ones(self.size, dtype=bool)
+        for term in terms:
+            start, end = self._expand(term)
+            if start == end:
+                return np.zeros(self.size)
+            term_scores = np.bincount(
+                self._row_ids[start:end],
+                weights=self._weights[start:end],
+                minlength=self.size,
+            )
+            matched &= term_scores > 0
+            total += term_scores
+        return np.where(matched, total, 0.0)
+
+    def search(self, query: str, limit: Optional[int] = None) -> np.ndarray:
+        """Matching row ids, best first; ties keep row order."""
+        scores = self.scores(query)
+        if scores is None:
+            return np.arange(self.size)[:limit]
+        hits = np.flatnonzero(scores)
+        ranked = hits[np.argsort(-scores[hits], kind="stable")]
+        return ranked[:limit]
@@ -0,0 +1,99 @@
+"""Query benchmark for InvertedIndex against a per-row substring scan.
+
+    python -m app.utils.search_index_benchmark --rows 250000
+
+Builds synthetic CVE rows (IDs, vendors, products and descriptions drawn from
+a fixed vocabulary), indexes them with CVE_SEARCH_FIELDS as the dashboard
+does, and times each query through the index and through the lowercase
+substring scan the searches used before. Checks that every row the index
+returns contains each query term in a searched field, and exits non-zero if
+one does not.
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+
+from app.utils.search_index import CVE_SEARCH_FIELDS, InvertedIndex, index_tokens, query_terms
+
+QUERIES = ["apache", "remote code", "CVE-2024-1", "buffer overflow heap", "xq", "a"]
+
+
+def synthetic_rows(size: int, vocabulary: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    words = list(
+        dict.fromkeys(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+            for _ in range(vocabulary * 2)
+        )
+    )[:vocabulary]
+    words[:8] = ["apache", "remote", "code", "execution", "buffer", "overflow", "heap", "kernel"]
+    vendors = words[:200]
+    return [
+        {
+            "id": f"CVE-{2015 + i % 10}-{i:06}",
+            "vendor": rng.choice(vendors),
+            "product": rng.choice(words),
+            "description": " ".join(rng.choices(words, k=rng.randint(8, 30))),
+        }
+        for i in range(size)
+    ]
+
+
+def substring_scan(rows: list[dict], query: str) -> list[int]:
+    """The previous search: every row, every field, lowercase substring match."""
+    term = query.lower()
+    return [
+        i
+        for i, row in enumerate(rows)
+        if any(term in str(row.get(field, "")).lower() for field in CVE_SEARCH_FIELDS)
+    ]
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    result = None
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=250000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows, args.vocabulary, args.seed)
+    started = time.perf_counter()
+    index = InvertedIndex(rows, CVE_SEARCH_FIELDS)
+    build_seconds = time.perf_counter() - started
+    print(
+        f"rows: {args.rows}, vocabulary: {len(index._vocab)} tokens, "
+        f"postings: {len(index._row_ids)}, index built in {build_seconds:.2f}s"
+    )
+
+    errors = []
+    for query in QUERIES:
+        index_seconds, hits = timed(lambda: index.search(query), args.repeat)
+        scan_seconds, scanned = timed(lambda: substring_scan(rows, query), max(1, args.repeat // 5))
+        print(
+            f"{query!r:>24}: index {index_seconds * 1000:7.1f}ms ({len(hits)} hits), "
+            f"scan {scan_seconds * 1000:7.1f}ms ({len(scanned)} hits)"
+        )
+        for row_id in hits[:1000].tolist():
+            tokens = set().union(*(index_tokens(str(rows[row_id][f])) for f in CVE_SEARCH_FIELDS))
+            if not all(any(t.startswith(term) for t in tokens) for term in query_terms(query)):
+                errors.append(f"{query!r}: row {row_id} does not match every term")
+                break
+    for error in errors:
+        print(f"FAIL {error}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent identical lookups into one upstream call.
+
+    Callers asking for the same (source, key) while a call is in flight await
+    the same task instead of issuing their own request. The shared task is
+    shielded, so one caller being cancelled does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _source_stats(self, source: str) -> dict[str, int]:
+        return self._stats.setdefault(source, {"upstream_calls": 0, "coalesced": 0})
+
+    def _on_done(self, flight_key: tuple[str, str], task: asyncio.Task):
+        if self._inflight.get(flight_key) is task:
+            del self._inflight[flight_key]
+        if not task.cancelled() and task.exception() is not None:
+            logging.debug(f"Single-flight call {flight_key} failed: {task.exception()}")
+
+    async def do(self, source: str, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn once per in-flight (source, key) and share its result."""
+        flight_key = (source, key)
+        stats = self._source_stats(source)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            stats["upstream_calls"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda t: self._on_done(flight_key, t))
+        else:
+            stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def metrics(self) -> dict[str, Any]:
+        """Per-source upstream calls, calls saved by coalescing, and current in-flight count."""
+        in_flight: dict[str, int] = {}
+        for source, _ in self._inflight:
+            in_flight[source] = in_flight.get(source, 0) + 1
+        return {
+            source: {**stats, "in_flight": in_flight.get(source, 0)}
+            for source, stats in self._stats.items()
+        }
+
+
+single_flight = SingleFlight()
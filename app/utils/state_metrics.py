@@ -0,0 +1,57 @@
+import json
+import logging
+import threading
+from typing import Any
+
+from reflex.middleware import Middleware
+
+
+class StateDeltaMonitor:
+    """Per-event counts and sizes of the state deltas sent to the browser."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: dict[str, dict[str, int]] = {}
+
+    def record(self, event_name: str, delta: dict):
+        try:
+            size = len(json.dumps(delta, default=str))
+        except Exception as e:
+            logging.debug(f"Could not size state delta for {event_name}: {e}")
+            return
+        with self._lock:
+            stats = self._events.setdefault(
+                event_name, {"count": 0, "total_bytes": 0, "max_bytes": 0}
+            )
+            stats["count"] += 1
+            stats["total_bytes"] += size
+            stats["max_bytes"] = max(stats["max_bytes"], size)
+
+    def metrics(self) -> list[dict[str, Any]]:
+        """Per-event delta stats, largest average first."""
+        with self._lock:
+            rows = [
+                {
+                    "event": event_name,
+                    "count": stats["count"],
+                    "avg_bytes": stats["total_bytes"] // stats["count"],
+                    "max_bytes": stats["max_bytes"],
+                }
+                for event_name, stats in self._events.items()
+            ]
+        return sorted(rows, key=lambda r: r["avg_bytes"], reverse=True)
+
+
+state_delta_monitor = StateDeltaMonitor()
+
+
+class StateDeltaMiddleware(Middleware):
+    """Records the size of every event's state delta in state_delta_monitor."""
+
+    async def preprocess(self, app, state, event):
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        if update is not None and getattr(update, "delta", None):
+            state_delta_monitor.record(event.name, update.delta)
+        return update
@@ -2,14 +2,92 @@ import os
 import reflex as rx
 import os
 import reflex as rx
+import asyncio
+import atexit
 from supabase import create_client, Client, PostgrestAPIResponse
-from typing import Optional
+from typing import Any, Awaitable, Callable, Optional
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from app.utils.bulk_writer import BulkWriter
+from app.utils.credit_ledger import CreditLedger
+from app.utils.telemetry_writer import TelemetryWriter
+from app.utils.single_flight import single_flight
+from app.utils.usage_meter import UsageMeter
+from app.utils.ttl_cache import api_key_cache, org_context_cache
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 supabase_client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+bulk_writer = BulkWriter(
+    supabase_client,
+    max_chunk_bytes=int(os.getenv("BULK_WRITE_MAX_CHUNK_BYTES", str(512 * 1024))),
+    concurrency=int(os.getenv("BULK_WRITE_CONCURRENCY", "4")),
+)
+telemetry_writer = TelemetryWriter(
+    supabase_client,
+    flush_rows=int(os.getenv("TELEMETRY_FLUSH_ROWS", "200")),
+    flush_interval=int(os.getenv("TELEMETRY_FLUSH_MS", "2000")) / 1000,
+    spill_path=os.getenv(
+        "TELEMETRY_SPILL_PATH", os.path.join(".states", "telemetry_spill.jsonl")
+    ),
+)
+atexit.register(telemetry_writer.close)
+usage_meter = UsageMeter(
+    telemetry_writer,
+    bucket_seconds=int(os.getenv("API_USAGE_BUCKET_SECONDS", "60")),
+)
+atexit.register(usage_meter.close)
+
+
+def _cache_credit_balance(org_id: str, balance: int):
+    """Keep the cached balance current with what the ledger RPC reported."""
+    org_context_cache.invalidate("organization", org_id)
+    org_context_cache.set("credits", org_id, balance)
+
+
+credit_ledger = CreditLedger(
+    supabase_client,
+    block_multiplier=int(os.getenv("CREDIT_BLOCK_MULTIPLIER", "20")),
+    hot_threshold=int(os.getenv("CREDIT_HOT_THRESHOLD", "5")),
+    max_block_share=float(os.getenv("CREDIT_MAX_BLOCK_SHARE", "0.1")),
+    on_balance=_cache_credit_balance,
+)
+atexit.register(credit_ledger.close)
+
+
+async def _read_through(
+    source: str, key: str, fetch: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Serve tenant context from the org context cache, fetching it once on a miss.
+
+    Concurrent misses for the same key share one query. Empty results are not
+    cached, so a row created later is picked up on the next read.
+    """
+    cached = org_context_cache.get(source, key)
+    if cached is not None:
+        return cached
+    value = await single_flight.do(f"org_context:{source}", key, fetch)
+    if value is not None:
+        org_context_cache.set(source, key, value)
+    return value
+
+
+def invalidate_org_context(org_id: str):
+    """Drop cached context for an organization after it changes.
+
+    Memberships embed the organization row, so they are dropped as well.
+    """
+    for source in ("organization", "white_label", "credits"):
+        org_context_cache.invalidate(source, org_id)
+    org_context_cache.invalidate_source("memberships")
+
+
+def _current_user_id() -> Optional[str]:
+    """The signed-in user's id from the locally stored session."""
+    session = supabase_client.auth.get_session()
+    if not session or not session.user:
+        return None
+    return session.user.id
 
 
 async def sign_up(email: str, password: str) -> Optional[dict]:
@@ -68,23 +146,17 @@ async def reset_password_for_email(email: str) -> bool:
 
 
 async def log_api_health(log_data: dict):
-    from postgrest.exceptions import APIError
+    """Queue an API health row; it is written in the next telemetry flush."""
+    telemetry_writer.enqueue("api_health_log", log_data)
 
-    try:
-        supabase_client.table("api_health_log").insert(log_data).execute()
-    except APIError as e:
-        if hasattr(e, "code") and e.code == "PGRST002":
-            logging.warning(
-                "API health logging skipped: 'api_health_log' table not found. Please run the required SQL migration to enable API monitoring."
-            )
-        else:
-            logging.exception(
-                f"Failed to log API health due to unexpected Supabase error: {e}"
-            )
-    except Exception as e:
-        logging.exception(
-            f"An unexpected error occurred during API health logging: {e}"
-        )
+
+async def log_api_usage(usage_data: dict):
+    """Queue a public API request row for api_usage_log.
+
+    Routine request metering goes through usage_meter, which writes
+    aggregated rows; this is for one-off rows that need their own detail.
+    """
+    telemetry_writer.enqueue("api_usage_log", usage_data)
 
 
 async def check_user_is_admin() -> bool:
@@ -117,71 +189,47 @@ async def check_user_is_admin() -> bool:
         return False
 
 
-async def get_total_active_customers() -> int:
-    """Query the organizations table for the count of active customers."""
+async def get_admin_kpis() -> dict:
+    """Fetch every admin console KPI from the materialized rollup in one call."""
     from postgrest.exceptions import APIError
 
     try:
-        response = (
-            supabase_client.table("organizations")
-            .select("id", count="exact")
-            .eq("status", "active")
-            .execute()
-        )
-        return response.count
+        response = supabase_client.rpc("get_admin_kpis").execute()
+        return response.data or {}
     except APIError as e:
-        if e.code == "42P01":
-            logging.warning(
-                "get_total_active_customers: 'organizations' table not found."
-            )
+        if "function public.get_admin_kpis() does not exist" in str(e.message):
+            logging.warning("get_admin_kpis: RPC function not found.")
         else:
-            logging.exception(f"Supabase error fetching active customers: {e}")
-        return 0
+            logging.exception(f"Supabase error fetching admin KPIs: {e}")
+        return {}
     except Exception as e:
-        logging.exception(f"Unexpected error fetching active customers: {e}")
-        return 0
-
+        logging.exception(f"Unexpected error fetching admin KPIs: {e}")
+        return {}
 
-async def get_average_tech_stack_size() -> float:
-    """Calculate the average tech stack size across all active organizations."""
-    from postgrest.exceptions import APIError
 
+async def refresh_admin_metrics() -> Optional[str]:
+    """Recompute the admin rollups; returns the new refreshed_at timestamp."""
     try:
-        response = supabase_client.rpc("get_average_tech_stack_size").execute()
-        return round(float(response.data), 2) if response.data else 0.0
-    except APIError as e:
-        if "function public.get_average_tech_stack_size() does not exist" in str(
-            e.message
-        ):
-            logging.warning("get_average_tech_stack_size: RPC function not found.")
-        else:
-            logging.exception(f"Supabase error fetching average tech stack size: {e}")
-        return 0.0
+        response = supabase_client.rpc("refresh_admin_metrics").execute()
+        return response.data
     except Exception as e:
-        logging.exception(f"Unexpected error fetching average tech stack size: {e}")
-        return 0.0
+        logging.exception(f"Failed to refresh admin metrics: {e}")
+        return None
 
 
-async def get_total_tracked_cves() -> int:
-    """Count the total number of unique CVEs tracked across all customers."""
-    from postgrest.exceptions import APIError
+async def get_total_active_customers() -> int:
+    """Count of active customers, from the admin KPI rollup."""
+    return int((await get_admin_kpis()).get("active_customers", 0))
+
+
+async def get_average_tech_stack_size() -> float:
+    """Average tech stack size across active organizations, from the admin KPI rollup."""
+    return round(float((await get_admin_kpis()).get("average_tech_stack_size", 0)), 2)
 
-    try:
-        response = (
-            supabase_client.table("tracked_cves")
-            .select("cve_id", count="exact")
-            .execute()
-        )
-        return response.count
-    except APIError as e:
-        if e.code == "42P01":
-            logging.warning("get_total_tracked_cves: 'tracked_cves' table not found.")
-        else:
-            logging.exception(f"Supabase error fetching total CVEs: {e}")
-        return 0
-    except Exception as e:
-        logging.exception(f"Unexpected error fetching total CVEs: {e}")
-        return 0
+
+async def get_total_tracked_cves() -> int:
+    """Total CVEs tracked across all customers, from the admin KPI rollup."""
+    return int((await get_admin_kpis()).get("total_tracked_cves", 0))
 
 
 async def get_all_active_organizations() -> list[dict]:
@@ -210,35 +258,40 @@ async def get_all_active_organizations() -> list[dict]:
 
 
 async def get_organization_details(organization_id: str) -> Optional[dict]:
-    """Fetches details for a single organization."""
-    try:
-        response = (
-            supabase_client.table("organizations")
-            .select("*")
-            .eq("id", organization_id)
-            .single()
-            .execute()
-        )
-        return response.data
-    except Exception as e:
-        logging.exception(
-            f"Error fetching organization details for {organization_id}: {e}"
-        )
-        return None
+    """Fetches details for a single organization, read through the org context cache."""
+
+    async def fetch() -> Optional[dict]:
+        try:
+            response = (
+                supabase_client.table("organizations")
+                .select("*")
+                .eq("id", organization_id)
+                .single()
+                .execute()
+            )
+            return response.data
+        except Exception as e:
+            logging.exception(
+                f"Error fetching organization details for {organization_id}: {e}"
+            )
+            return None
 
+    return await _read_through("organization", organization_id, fetch)
 
-async def get_all_customers_list() -> list[dict]:
-    """Fetch a list of all organizations with their metadata."""
+
+async def get_all_customers_list(limit: int = 1000, offset: int = 0) -> list[dict]:
+    """Fetch a page of organizations with their metadata from the admin summary."""
     from postgrest.exceptions import APIError
 
     try:
-        response = (
-            supabase_client.table("organizations").select("*").order("name").execute()
-        )
+        response = supabase_client.rpc(
+            "get_admin_customer_summary",
+            {"page_limit": limit, "page_offset": offset},
+        ).execute()
         return response.data
     except APIError as e:
-        if e.code == "42P01":
-            logging.warning("get_all_customers_list: 'organizations' table not found.")
+        if "get_admin_customer_summary" in str(e.message):
+            logging.warning("get_all_customers_list: RPC function not found.")
         else:
             logging.exception(f"Supabase error fetching customer list: {e}")
         return []
@@ -248,39 +301,53 @@ async def get_all_customers_list() -> list[dict]:
 
 
 async def get_user_memberships() -> Optional[PostgrestAPIResponse]:
-    """Fetches the organizations a user is a member of."""
+    """Fetches the organizations a user is a member of, read through the org context cache."""
     try:
-        user_session = supabase_client.auth.get_user()
-        if not user_session or not user_session.user:
-            return None
-        user_id = user_session.user.id
-        return (
-            supabase_client.table("members")
-            .select("*, organization:organizations(*)")
-            .eq("user_id", user_id)
-            .execute()
-        )
+        user_id = _current_user_id()
     except Exception as e:
-        logging.exception(f"Error fetching user memberships: {e}")
+        logging.exception(f"Error reading user session for memberships: {e}")
+        return None
+    if not user_id:
         return None
 
+    async def fetch() -> Optional[PostgrestAPIResponse]:
+        try:
+            return (
+                supabase_client.table("members")
+                .select("*, organization:organizations(*)")
+                .eq("user_id", user_id)
+                .execute()
+            )
+        except Exception as e:
+            logging.exception(f"Error fetching user memberships: {e}")
+            return None
+
+    return await _read_through("memberships", user_id, fetch)
+
 
 async def get_current_user_with_profile() -> Optional[PostgrestAPIResponse]:
-    """Fetches the current user's data joined with their profile."""
+    """Fetches the current user's profile, read through the org context cache."""
     try:
-        user_session = supabase_client.auth.get_user()
-        if not user_session or not user_session.user:
-            return None
-        user_id = user_session.user.id
-        return (
-            supabase_client.table("user_profiles")
-            .select("*")
-            .eq("user_id", user_id)
-            .execute()
-        )
+        user_id = _current_user_id()
     except Exception as e:
-        logging.exception(f"Error fetching user profile: {e}")
+        logging.exception(f"Error reading user session for profile: {e}")
         return None
+    if not user_id:
+        return None
+
+    async def fetch() -> Optional[PostgrestAPIResponse]:
+        try:
+            return (
+                supabase_client.table("user_profiles")
+                .select("*")
+                .eq("user_id", user_id)
+                .execute()
+            )
+        except Exception as e:
+            logging.exception(f"Error fetching user profile: {e}")
+            return None
+
+    return await _read_through("user_profile", user_id, fetch)
 
 
 async def create_organization(name: str) -> Optional[str]:
@@ -301,11 +368,12 @@ async def create_organization(name: str) -> Optional[str]:
 
 async def create_membership(user_id: str, org_id: str, role: str) -> bool:
     try:
-        await (
+        (
             supabase_client.table("members")
             .insert({"user_id": user_id, "organization_id": org_id, "role": role})
             .execute()
         )
+        org_context_cache.invalidate("memberships", user_id)
         return True
     except Exception as e:
         logging.exception(f"Failed to create membership: {e}")
@@ -314,12 +382,13 @@ async def create_membership(user_id: str, org_id: str, role: str) -> bool:
 
 async def update_user_profile(user_id: str, full_name: str, job_title: str) -> bool:
     try:
-        await (
+        (
             supabase_client.table("user_profiles")
             .update({"full_name": full_name, "job_title": job_title})
             .eq("user_id", user_id)
             .execute()
         )
+        org_context_cache.invalidate("user_profile", user_id)
         return True
     except Exception as e:
         logging.exception(f"Failed to update user profile: {e}")
@@ -341,17 +410,16 @@ async def upsert_organization_context(context_data: dict) -> bool:
 
 async def update_organization_tech_stack(org_id: str, tech_stack: list[str]) -> bool:
     try:
-        await (
+        (
             supabase_client.table("organizations")
             .update({"tech_stack": tech_stack})
             .eq("id", org_id)
             .execute()
         )
+        invalidate_org_context(org_id)
         return True
     except Exception as e:
-        logging.exception(
-            f"Failed to update validation status for proof {proof_id}: {e}"
-        )
+        logging.exception(f"Failed to update tech stack for org {org_id}: {e}")
         return False
 
 
@@ -485,15 +553,15 @@ async def get_last_completed_run(organization_id: str) -> Optional[dict]:
         return None
 
 
-async def upsert_vulnerabilities(gaps: list[dict]):
+async def upsert_vulnerabilities(gaps: list[dict]) -> bool:
     try:
-        await (
-            supabase_client.table("framework_scores")
-            .upsert(gaps, on_conflict="cve_id, organization_id")
-            .execute()
+        result = await bulk_writer.upsert(
+            "framework_scores", gaps, on_conflict="cve_id, organization_id"
         )
+        return result["failed"] == 0
     except Exception as e:
         logging.exception(f"Failed to upsert vulnerabilities: {e}")
+        return False
 
 
 async def insert_vulnerabilities(records: list[dict]):
@@ -628,25 +696,18 @@ async def get_export_history(report_id: int) -> list[dict]:
 async def log_report_audit(
     report_id: int, user_id: str, action: str, details: dict, ip: str, user_agent: str
 ) -> bool:
-    try:
-        await (
-            supabase_client.table("report_audit_log")
-            .insert(
-                {
-                    "report_id": report_id,
-                    "user_id": user_id,
-                    "action": action,
-                    "action_details": details,
-                    "ip_address": ip,
-                    "user_agent": user_agent,
-                }
-            )
-            .execute()
-        )
-        return True
-    except Exception as e:
-        logging.exception(f"Failed to log audit for report {report_id}: {e}")
-        return False
+    telemetry_writer.enqueue(
+        "report_audit_log",
+        {
+            "report_id": report_id,
+            "user_id": user_id,
+            "action": action,
+            "action_details": details,
+            "ip_address": ip,
+            "user_agent": user_agent,
+        },
+    )
+    return True
 
 
 async def store_encrypted_api_key(
@@ -688,84 +749,113 @@ async def get_encrypted_api_key(org_id: str, provider: str) -> Optional[dict]:
         return None
 
 
-async def get_org_credit_balance(org_id: str) -> Optional[int]:
-    try:
-        response = (
-            supabase_client.table("organizations")
-            .select("ai_credits")
-            .eq("id", org_id)
-            .single()
-            .execute()
-        )
-        return response.data.get("ai_credits", 0)
-    except Exception as e:
-        logging.exception(f"Failed to get credit balance for org {org_id}: {e}")
-        return None
+async def get_org_credit_balance(org_id: str, fresh: bool = False) -> Optional[int]:
+    """An organization's available credits (held credits excluded); fresh=True bypasses the cache."""
+
+    async def fetch() -> Optional[int]:
+        try:
+            response = (
+                supabase_client.table("organizations")
+                .select("ai_credits")
+                .eq("id", org_id)
+                .single()
+                .execute()
+            )
+            return response.data.get("ai_credits", 0)
+        except Exception as e:
+            logging.exception(f"Failed to get credit balance for org {org_id}: {e}")
+            return None
+
+    if fresh:
+        org_context_cache.invalidate("credits", org_id)
+    return await _read_through("credits", org_id, fetch)
 
 
 async def get_white_label_config(org_id: str) -> Optional[dict]:
-    try:
-        response = (
-            supabase_client.table("white_label_configs")
-            .select("*")
-            .eq("organization_id", org_id)
-            .single()
-            .execute()
-        )
-        return response.data
-    except Exception as e:
-        if "PGRST116" not in str(e):
-            logging.exception(f"Failed to get white label config for org {org_id}: {e}")
-        return None
+    async def fetch() -> Optional[dict]:
+        try:
+            response = (
+                supabase_client.table("white_label_configs")
+                .select("*")
+                .eq("organization_id", org_id)
+                .single()
+                .execute()
+            )
+            return response.data
+        except Exception as e:
+            if "PGRST116" not in str(e):
+                logging.exception(
+                    f"Failed to get white label config for org {org_id}: {e}"
+                )
+            return None
+
+    return await _read_through("white_label", org_id, fetch)
 
 
 async def save_white_label_config(org_id: str, config: dict) -> bool:
     try:
-        await (
+        (
             supabase_client.table("white_label_configs")
             .upsert(config, on_conflict="organization_id")
             .execute()
         )
+        org_context_cache.invalidate("white_label", org_id)
         return True
     except Exception as e:
         logging.exception(f"Failed to save white label config for org {org_id}: {e}")
         return False
 
 
-async def deduct_credits(org_id: str, amount: int) -> bool:
+async def reserve_credits(
+    org_id: str, amount: int, reference: Optional[str] = None
+) -> Optional[dict]:
+    """Hold credits for paid work; None if the balance does not cover it.
+
+    Settle the returned hold with commit_credits() or release_credits().
+    """
+    return await credit_ledger.reserve(org_id, amount, reference)
+
+
+async def commit_credits(hold: dict, amount: Optional[int] = None) -> bool:
+    """Spend a credit hold (all of it unless amount is given)."""
+    return await credit_ledger.commit(hold, amount)
+
+
+async def release_credits(hold: dict) -> bool:
+    """Return a credit hold's credits unspent."""
+    return await credit_ledger.release(hold)
+
+
+async def grant_credits(org_id: str, amount: int, reference: str) -> Optional[int]:
+    """Add credits to an organization (platform admins only); returns the new balance."""
     try:
-        current_balance = await get_org_credit_balance(org_id)
-        if current_balance is None or current_balance < amount:
-            return False
-        new_balance = current_balance - amount
-        await (
-            supabase_client.table("organizations")
-            .update({"ai_credits": new_balance})
-            .eq("id", org_id)
-            .execute()
-        )
-        return True
+        response = supabase_client.rpc(
+            "credit_transaction",
+            {
+                "p_action": "grant",
+                "p_organization_id": org_id,
+                "p_amount": amount,
+                "p_reference": reference,
+            },
+        ).execute()
+        balance = (response.data or {}).get("balance")
+        if balance is not None:
+            _cache_credit_balance(org_id, balance)
+        return balance
     except Exception as e:
-        logging.exception(f"Failed to deduct credits for org {org_id}: {e}")
-        return False
+        logging.exception(f"Failed to grant credits to org {org_id}: {e}")
+        return None
 
 
-async def refund_credits(org_id: str, amount: int) -> bool:
+async def settle_credit_reservations() -> int:
+    """Settle idle local credit blocks and expire abandoned holds; returns holds expired."""
+    await credit_ledger.settle_idle()
     try:
-        current_balance = await get_org_credit_balance(org_id)
-        if current_balance is None:
-            return False
-        new_balance = current_balance + amount
-        await (
-            supabase_client.table("organizations")
-            .update({"ai_credits": new_balance})
-            .eq("id", org_id)
-            .execute()
-        )
-        return True
+        response = supabase_client.rpc("expire_credit_reservations").execute()
+        return response.data or 0
     except Exception as e:
-        logging.exception(f"Failed to refund credits for org {org_id}: {e}")
-        return False
+        logging.exception(f"Failed to expire credit reservations: {e}")
+        return 0
 
 
 async def store_analysis_cache(
@@ -822,8 +912,9 @@ async def log_llm_usage(
     duration: int,
     cached: bool,
 ) -> bool:
-    try:
-        record = {
+    telemetry_writer.enqueue(
+        "llm_usage_log",
+        {
             "organization_id": org_id,
             "user_id": user_id,
             "cve_id": cve_id,
@@ -833,39 +924,64 @@ async def log_llm_usage(
             "credits_charged": credits,
             "analysis_duration_ms": duration,
             "was_cached": cached,
-        }
-        await supabase_client.table("llm_usage_log").insert(record).execute()
-        return True
-    except Exception as e:
-        logging.exception(f"Failed to log LLM usage for org {org_id}: {e}")
-        return False
-
-
-async def get_org_id_from_api_key(api_key: str) -> Optional[str]:
+        },
+    )
+    return True
+
+
+API_KEY_COLUMNS = "id, organization_id, permissions, rate_limit, expires_at"
+
+
+async def get_api_key_record(api_key: str, key_hash: str) -> Optional[dict]:
+    """The active api_keys row for a key, or None if the key is unknown.
+
+    Keys stored before hashing (hash_version 0) are matched on their raw body
+    and rewritten with key_hash on first use. Database errors are raised so the
+    caller can tell a failed lookup from an invalid key.
+    """
+    response = (
+        supabase_client.table("api_keys")
+        .select(API_KEY_COLUMNS)
+        .eq("key_hash", key_hash)
+        .eq("is_active", True)
+        .limit(1)
+        .execute()
+    )
+    if response.data:
+        return response.data[0]
+    key_prefix, _, key_body = api_key.partition("_")
+    if not key_body:
+        return None
+    legacy = (
+        supabase_client.table("api_keys")
+        .select(API_KEY_COLUMNS)
+        .eq("key_prefix", key_prefix)
+        .eq("key_hash", key_body)
+        .eq("hash_version", 0)
+        .eq("is_active", True)
+        .limit(1)
+        .execute()
+    )
+    if not legacy.data:
+        return None
+    record = legacy.data[0]
     try:
-        key_prefix, key_hash = api_key.split("_", 1)
-        response = (
+        (
             supabase_client.table("api_keys")
-            .select("organization_id")
-            .eq("key_prefix", key_prefix)
-            .eq("key_hash", key_hash)
-            .eq("is_active", True)
-            .single()
+            .update({"key_hash": key_hash, "hash_version": 1})
+            .eq("id", record["id"])
             .execute()
         )
-        if response.data:
-            return response.data["organization_id"]
-        return None
     except Exception as e:
-        logging.exception(f"API key validation failed: {e}")
-        return None
+        logging.exception(f"Failed to rehash legacy api key {record['id']}: {e}")
+    return record
 
 
 async def get_api_keys_for_org(org_id: str) -> list[dict]:
     try:
         response = (
             supabase_client.table("api_keys")
-            .select("id, key_name, key_prefix, key_hash, created_at")
+            .select("id, key_name, key_prefix, key_hint, created_at")
             .eq("organization_id", org_id)
             .eq("is_active", True)
             .order("created_at", desc=True)
@@ -878,7 +994,7 @@ async def get_api_keys_for_org(org_id: str) -> list[dict]:
 
 
 async def create_api_key(
-    org_id: str, key_name: str, key_prefix: str, key_hash: str
+    org_id: str, key_name: str, key_prefix: str, key_hash: str, key_hint: str
 ) -> Optional[dict]:
     try:
         response = (
@@ -889,9 +1005,11 @@ async def create_api_key(
                     "key_name": key_name,
                     "key_prefix": key_prefix,
                     "key_hash": key_hash,
+                    "key_hint": key_hint,
+                    "hash_version": 1,
                 }
             )
-            .select("*")
+            .select("id, key_name, key_prefix, key_hint, created_at")
             .single()
             .execute()
         )
@@ -902,13 +1020,16 @@ async def create_api_key(
 
 
 async def revoke_api_key(key_id: str) -> bool:
+    """Deactivate a key and drop it from this process's API key cache at once."""
     try:
-        await (
+        response = (
             supabase_client.table("api_keys")
             .update({"is_active": False})
             .eq("id", key_id)
             .execute()
         )
+        for row in response.data or []:
+            api_key_cache.invalidate("api_key", row["key_hash"])
         return True
     except Exception as e:
         logging.exception(f"Failed to revoke api key {key_id}: {e}")
@@ -1182,6 +1303,17 @@ async def upsert_exploit_proof(proof_data: dict) -> bool:
         return False
 
 
+async def upsert_exploit_proofs(proofs: list[dict]) -> bool:
+    try:
+        result = await bulk_writer.upsert(
+            "exploit_proofs", proofs, on_conflict="cve_id, title"
+        )
+        return result["failed"] == 0
+    except Exception as e:
+        logging.exception(f"Failed to upsert {len(proofs)} exploit proofs: {e}")
+        return False
+
+
 async def get_exploit_proofs_for_cve(
     cve_id: str, org_id: Optional[str] = None, validation_status: Optional[str] = None
 ) -> list[dict]:
@@ -1280,4 +1412,423 @@ async def delete_feedback(feedback_id: int, user_id: str) -> bool:
         return True
     except Exception as e:
         logging.exception(f"Failed to delete feedback {feedback_id}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+async def upsert_backlog_index_entries(entries: list[dict]) -> bool:
+    try:
+        supabase_client.table("cve_backlog_index").upsert(
+            entries, on_conflict="cve_id"
+        ).execute()
+        return True
+    except Exception as e:
+        logging.exception(f"Failed to upsert {len(entries)} backlog index entries: {e}")
+        return False
+
+
+async def refresh_backlog_monthly_counts() -> Optional[int]:
+    """Rebuild the precomputed monthly backlog rollup from the backlog index."""
+    try:
+        response = supabase_client.rpc("refresh_cve_backlog_monthly_counts").execute()
+        return response.data
+    except Exception as e:
+        logging.exception(f"Failed to refresh backlog monthly counts: {e}")
+        return None
+
+
+async def get_backlog_monthly_counts(
+    vuln_status: str = "Awaiting Analysis",
+) -> list[dict]:
+    """Fetch the precomputed monthly backlog counts for a given NVD status."""
+    from postgrest.exceptions import APIError
+
+    try:
+        response = (
+            supabase_client.table("cve_backlog_monthly_counts")
+            .select(
+                "published_month, cve_count, kev_count, avg_published_epoch, kev_avg_published_epoch"
+            )
+            .eq("vuln_status", vuln_status)
+            .order("published_month", desc=True)
+            .execute()
+        )
+        return response.data
+    except APIError as e:
+        if e.code == "42P01":
+            logging.warning(
+                "get_backlog_monthly_counts: 'cve_backlog_monthly_counts' table not found. Please run the backlog migration script."
+            )
+        else:
+            logging.exception(f"Supabase error fetching backlog monthly counts: {e}")
+        return []
+    except Exception as e:
+        logging.exception(f"Unexpected error fetching backlog monthly counts: {e}")
+        return []
+
+
+async def get_backlog_sync_cursor() -> Optional[datetime]:
+    try:
+        response = (
+            supabase_client.table("cve_backlog_sync_state")
+            .select("last_modified_cursor")
+            .eq("id", 1)
+            .single()
+            .execute()
+        )
+        cursor = response.data.get("last_modified_cursor")
+        return datetime.fromisoformat(cursor) if cursor else None
+    except Exception as e:
+        if "PGRST116" not in str(e):
+            logging.exception(f"Failed to get backlog sync cursor: {e}")
+        return None
+
+
+async def set_backlog_sync_cursor(cursor: datetime, records_processed: int) -> bool:
+    try:
+        supabase_client.table("cve_backlog_sync_state").upsert(
+            {
+                "id": 1,
+                "last_modified_cursor": cursor.isoformat(),
+                "last_run_at": datetime.now(timezone.utc).isoformat(),
+                "records_processed": records_processed,
+            },
+            on_conflict="id",
+        ).execute()
+        return True
+    except Exception as e:
+        logging.exception(f"Failed to set backlog sync cursor: {e}")
+        return False
+
+
+async def get_scoring_components(org_id: str, page_size: int = 1000) -> list[dict]:
+    """Fetch every finding's persisted scoring components for an organization."""
+    rows = []
+    try:
+        start = 0
+        while True:
+            response = (
+                supabase_client.table("framework_scores")
+                .select(
+                    "cve_id, cvss_v3_score, epss_score, is_kev, kev_date_added, ssvc_decision, lev_score, framework_agreement, conflict_flags, last_updated, cvss_component, epss_component, ssvc_component"
+                )
+                .eq("organization_id", org_id)
+                .order("id")
+                .range(start, start + page_size - 1)
+                .execute()
+            )
+            rows.extend(response.data)
+            if len(response.data) < page_size:
+                return rows
+            start += page_size
+    except Exception as e:
+        logging.exception(f"Failed to fetch scoring components for org {org_id}: {e}")
+        return rows
+
+
+async def insert_weight_history(
+    org_id: str,
+    weights: dict,
+    user_id: Optional[str],
+    change_reason: str = "manual_update",
+) -> bool:
+    try:
+        supabase_client.table("weight_history").insert(
+            {
+                "organization_id": org_id,
+                "weights": weights,
+                "changed_by_user_id": user_id,
+                "change_reason": change_reason,
+            }
+        ).execute()
+        return True
+    except Exception as e:
+        logging.exception(f"Failed to record weight history for org {org_id}: {e}")
+        return False
+
+
+async def get_feedback_for_org(org_id: str) -> list[dict]:
+    """Fetch every feedback label for an organization with its finding's CVE."""
+    try:
+        response = (
+            supabase_client.table("feedback_labels")
+            .select("label, confidence, created_at, finding:inference_findings(cve_id)")
+            .eq("organization_id", org_id)
+            .execute()
+        )
+        return response.data
+    except Exception as e:
+        logging.exception(f"Failed to fetch feedback labels for org {org_id}: {e}")
+        return []
+
+
+async def upsert_nvd_mirror_entries(entries: list[dict]) -> bool:
+    try:
+        supabase_client.table("nvd_cve_mirror").upsert(
+            entries, on_conflict="cve_id"
+        ).execute()
+        return True
+    except Exception as e:
+        logging.exception(f"Failed to upsert {len(entries)} NVD mirror entries: {e}")
+        return False
+
+
+async def upsert_epss_scores(entries: list[dict]) -> bool:
+    try:
+        supabase_client.table("epss_scores").upsert(
+            entries, on_conflict="cve_id"
+        ).execute()
+        return True
+    except Exception as e:
+        logging.exception(f"Failed to upsert {len(entries)} EPSS scores: {e}")
+        return False
+
+
+async def _select_by_cve_ids(
+    table: str, columns: str, cve_ids: list[str], chunk_size: int = 200
+) -> list[dict]:
+    """Fetch rows for many CVE IDs, chunked to keep request URLs bounded."""
+    rows = []
+    for start in range(0, len(cve_ids), chunk_size):
+        response = (
+            supabase_client.table(table)
+            .select(columns)
+            .in_("cve_id", cve_ids[start : start + chunk_size])
+            .execute()
+        )
+        rows.extend(response.data)
+    return rows
+
+
+async def get_nvd_mirror_batch(cve_ids: list[str]) -> dict[str, dict]:
+    """Fetch mirrored CVSS data for many CVEs, keyed by CVE ID."""
+    try:
+        rows = await _select_by_cve_ids(
+            "nvd_cve_mirror",
+            "cve_id, cvss_score, severity, vector, cvss_version",
+            cve_ids,
+        )
+        return {row["cve_id"]: row for row in rows}
+    except Exception as e:
+        logging.exception(f"Failed to fetch NVD mirror batch: {e}")
+        return {}
+
+
+async def get_epss_scores_batch(cve_ids: list[str]) -> dict[str, dict]:
+    """Fetch stored EPSS scores for many CVEs, keyed by CVE ID."""
+    try:
+        rows = await _select_by_cve_ids(
+            "epss_scores", "cve_id, epss_score, percentile, score_date", cve_ids
+        )
+        return {row["cve_id"]: row for row in rows}
+    except Exception as e:
+        logging.exception(f"Failed to fetch EPSS score batch: {e}")
+        return {}
+
+
+async def insert_epss_history(entries: list[dict]) -> bool:
+    try:
+        supabase_client.table("epss_history").upsert(
+            entries, on_conflict="cve_id, score_date", ignore_duplicates=True
+        ).execute()
+        return True
+    except Exception as e:
+        logging.exception(f"Failed to insert {len(entries)} EPSS history rows: {e}")
+        return False
+
+
+async def get_epss_history(cve_id: str) -> list[dict]:
+    try:
+        response = (
+            supabase_client.table("epss_history")
+            .select("score_date, epss_score")
+            .eq("cve_id", cve_id)
+            .order("score_date")
+            .execute()
+        )
+        return response.data
+    except Exception as e:
+        logging.exception(f"Failed to fetch EPSS history for {cve_id}: {e}")
+        return []
+
+
+async def get_all_lev_states(page_size: int = 1000) -> list[dict]:
+    """Fetch every CVE's LEV accumulator for the daily incremental refresh."""
+    rows = []
+    start = 0
+    while True:
+        response = (
+            supabase_client.table("lev_scores")
+            .select("cve_id, log_survival, days_observed, first_score_date, last_score_date")
+            .order("cve_id")
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        rows.extend(response.data)
+        if len(response.data) < page_size:
+            return rows
+        start += page_size
+
+
+async def upsert_lev_scores(entries: list[dict]) -> bool:
+    try:
+        supabase_client.table("lev_scores").upsert(
+            entries, on_conflict="cve_id"
+        ).execute()
+        return True
+    except Exception as e:
+        logging.exception(f"Failed to upsert {len(entries)} LEV scores: {e}")
+        return False
+
+
+async def get_lev_scores_batch(cve_ids: list[str]) -> dict[str, float]:
+    """Fetch stored LEV scores for many CVEs, keyed by CVE ID."""
+    try:
+        rows = await _select_by_cve_ids("lev_scores", "cve_id, lev_score", cve_ids)
+        return {row["cve_id"]: float(row["lev_score"]) for row in rows}
+    except Exception as e:
+        logging.exception(f"Failed to fetch LEV score batch: {e}")
+        return {}
+
+
+async def sync_framework_lev_scores() -> Optional[int]:
+    """Propagate refreshed LEV scores onto every organization's framework scores."""
+    try:
+        response = supabase_client.rpc("sync_framework_lev_scores").execute()
+        return response.data
+    except Exception as e:
+        logging.exception(f"Failed to sync framework LEV scores: {e}")
+        return None
+
+
+async def upsert_inference_findings(findings: list[dict]) -> bool:
+    try:
+        result = await bulk_writer.upsert(
+            "inference_findings", findings, on_conflict="cve_id, organization_id"
+        )
+        return result["failed"] == 0
+    except Exception as e:
+        logging.exception(f"Failed to upsert {len(findings)} inference findings: {e}")
+        return False
+
+
+async def maintain_log_partitions() -> dict:
+    """Premake upcoming log partitions and drop expired ones; returns per-table counts."""
+    try:
+        response = supabase_client.rpc("maintain_log_partitions").execute()
+        return response.data or {}
+    except Exception as e:
+        logging.exception(f"Failed to maintain log partitions: {e}")
+        return {}
+
+
+async def refresh_log_rollups(hours: int = 2) -> Optional[str]:
+    """Recompute the hourly log rollups for the last few hours."""
+    try:
+        response = supabase_client.rpc("refresh_log_rollups", {"p_hours": hours}).execute()
+        return response.data
+    except Exception as e:
+        logging.exception(f"Failed to refresh log rollups: {e}")
+        return None
+
+
+async def get_api_health_rollups(hours: int = 24) -> list[dict]:
+    """Fetch hourly API health rollups for the last few hours, newest first."""
+    try:
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        response = (
+            supabase_client.table("api_health_hourly")
+            .select("hour, api_name, calls, failures, avg_duration_ms, p95_duration_ms, max_duration_ms")
+            .gte("hour", since.isoformat())
+            .order("hour", desc=True)
+            .execute()
+        )
+        return response.data
+    except Exception as e:
+        logging.exception(f"Failed to fetch API health rollups: {e}")
+        return []
+
+
+async def list_api_vulnerabilities(
+    org_id: str,
+    severity: Optional[str] = None,
+    is_kev: Optional[bool] = None,
+    cursor: Optional[tuple[float, str]] = None,
+    cve_id: Optional[str] = None,
+    limit: int = 100,
+) -> Optional[list[dict]]:
+    """One keyset page of an organization's findings for the public API; None on error.
+
+    Runs on a worker thread so slow queries do not stall other API requests.
+    """
+    params = {
+        "p_organization_id": org_id,
+        "p_severity": severity,
+        "p_is_kev": is_kev,
+        "p_cursor_score": cursor[0] if cursor else None,
+        "p_cursor_cve": cursor[1] if cursor else None,
+        "p_cve_id": cve_id,
+        "p_limit": limit,
+    }
+    try:
+        query = supabase_client.rpc("api_list_vulnerabilities", params)
+        response = await asyncio.to_thread(query.execute)
+        return response.data or []
+    except Exception as e:
+        logging.exception(f"Failed to list API vulnerabilities for org {org_id}: {e}")
+        return None
+
+
+async def export_findings_batch(
+    org_id: str,
+    since: Optional[str] = None,
+    cursor: Optional[tuple[str, str]] = None,
+    batch_size: int = 1000,
+) -> list[dict]:
+    """One batch of an organization's findings in change order for bulk export.
+
+    Raises on error: a stream that is already under way cannot report a
+    failure any other way than stopping.
+    """
+    params = {
+        "p_organization_id": org_id,
+        "p_since": since,
+        "p_cursor_updated": cursor[0] if cursor else None,
+        "p_cursor_cve": cursor[1] if cursor else None,
+        "p_limit": batch_size,
+    }
+    query = supabase_client.rpc("api_export_findings", params)
+    response = await asyncio.to_thread(query.execute)
+    return response.data or []
+
+
+async def get_api_vulnerabilities_batch(
+    org_id: str, cve_ids: list[str], chunk_size: int = 1000
+) -> Optional[list[dict]]:
+    """Scores, shared CVSS/EPSS data and inference results for many CVEs.
+
+    The function returns at most one row per distinct CVE, so the IDs are
+    sent in concurrent chunks of chunk_size to keep each response under
+    PostgREST's max-rows cap. Returns None if any chunk fails.
+    """
+
+    async def lookup(chunk: list[str]) -> list[dict]:
+        query = supabase_client.rpc(
+            "api_batch_vulnerabilities",
+            {"p_organization_id": org_id, "p_cve_ids": chunk},
+        )
+        response = await asyncio.to_thread(query.execute)
+        return response.data or []
+
+    unique_ids = list(dict.fromkeys(cve_ids))
+    try:
+        chunks = await asyncio.gather(
+            *(
+                lookup(unique_ids[start : start + chunk_size])
+                for start in range(0, len(unique_ids), chunk_size)
+            )
+        )
+        return [row for chunk in chunks for row in chunk]
+    except Exception as e:
+        logging.exception(
+            f"Failed batch vulnerability lookup of {len(cve_ids)} CVEs for org {org_id}: {e}"
+        )
+        return None
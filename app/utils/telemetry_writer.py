@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE classes for errors caused by individual rows (bad data, constraint
+# violations); retrying the same rows cannot succeed, but the other rows in the
+# batch can. Class 42 (missing table or column, permission denied) and
+# PostgREST's schema-cache misses fail every row alike, so those batches are
+# spilled whole like a connection failure rather than split row by row.
+DATA_ERROR_CLASSES = {"22", "23"}
+DATA_ERROR_CODES = {"PGRST102"}
+
+
+def is_data_error(error: Exception) -> bool:
+    """True if an insert failed because of the rows rather than the connection."""
+    code = str(getattr(error, "code", "") or "")
+    return code in DATA_ERROR_CODES or code[:2] in DATA_ERROR_CLASSES
+
+
+class TelemetryWriter:
+    """Write-behind buffer for append-only telemetry rows.
+
+    Callers enqueue rows and return immediately. Rows are buffered per table
+    and written with one bulk insert per table when a table reaches
+    flush_rows or every flush_interval seconds, whichever comes first. If an
+    insert fails because the database is unreachable the rows are appended to
+    a local JSONL spill file, which is replayed after the next successful
+    flush; a missing table, column or grant is handled the same way, so
+    rows survive until the migration is applied. If it fails because of the
+    data, the batch is split in halves until the offending rows are
+    isolated; those are logged and dropped and the rest are written. close() writes whatever is still buffered
+    synchronously, so it can run from shutdown hooks.
+    """
+
+    def __init__(
+        self,
+        client,
+        flush_rows: int = 200,
+        flush_interval: float = 2.0,
+        spill_path: str = os.path.join(".states", "telemetry_spill.jsonl"),
+        replay_batch_rows: int = 1000,
+        max_replays: int = 5,
+    ):
+        self.client = client
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.replay_batch_rows = replay_batch_rows
+        self.max_replays = max_replays
+        self._buffers: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "rejected": 0,
+            "dropped": 0,
+            "flushes": 0,
+        }
+
+    def enqueue(self, table: str, row: dict):
+        """Buffer one row for table; never blocks on the database."""
+        if self._closed:
+            self._write_sync(table, [row])
+            return
+        with self._lock:
+            buffer = self._buffers.setdefault(table, [])
+            buffer.append(row)
+            self._stats["enqueued"] += 1
+            full = len(buffer) >= self.flush_rows
+        self._ensure_flusher()
+        if full and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and not self._flusher.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wakeup = asyncio.Event()
+        self._flusher = loop.create_task(self._run())
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception(f"Telemetry flush failed: {e}")
+
+    def _drain(self) -> dict[str, list[dict]]:
+        with self._lock:
+            buffers, self._buffers = self._buffers, {}
+        return {table: rows for table, rows in buffers.items() if rows}
+
+    def _insert(self, table: str, rows: list[dict]):
+        self.client.table(table).insert(rows).execute()
+
+    def _write_sync(self, table: str, rows: list[dict], replays: int = 0) -> bool:
+        """Insert rows now, spilling them to disk if the database is unavailable.
+
+        Returns False if any rows were spilled or dropped after max_replays.
+        """
+        try:
+            self._insert(table, rows)
+            self._stats["written"] += len(rows)
+            return True
+        except Exception as e:
+            if is_data_error(e):
+                return self._isolate_rejected(table, rows, replays, e)
+            if replays >= self.max_replays:
+                logger.error(
+                    f"Dropping {len(rows)} telemetry rows for {table} after {replays} replays: {e}"
+                )
+                self._stats["dropped"] += len(rows)
+                return False
+            logger.warning(f"Telemetry insert of {len(rows)} rows into {table} failed, spilling: {e}")
+            self._spill(table, rows, replays)
+            return False
+
+    def _isolate_rejected(self, table: str, rows: list[dict], replays: int, error: Exception) -> bool:
+        """Write the good rows of a batch the database rejected, dropping the bad ones."""
+        if len(rows) == 1:
+            logger.error(f"Dropping telemetry row for {table} rejected by the database: {error}; row: {rows[0]}")
+            self._stats["rejected"] += 1
+            return True
+        middle = len(rows) // 2
+        first = self._write_sync(table, rows[:middle], replays)
+        second = self._write_sync(table, rows[middle:], replays)
+        return first and second
+
+    async def flush(self):
+        """Write every buffered row, one bulk insert per table."""
+        buffers = self._drain()
+        if not buffers:
+            return
+        self._stats["flushes"] += 1
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._write_sync, table, rows)
+                for table, rows in buffers.items()
+            )
+        )
+        if all(results):
+            await asyncio.to_thread(self.replay_spill)
+
+    def _spill(self, table: str, rows: list[dict], replays: int = 0):
+        try:
+            with self._spill_lock:
+                os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+                with open(self.spill_path, "a", encoding="utf-8") as spill:
+                    for row in rows:
+                        spill.write(json.dumps({"table": table, "row": row, "replays": replays}, default=str) + "\n")
+            if replays == 0:
+                self._stats["spilled"] += len(rows)
+        except OSError as e:
+            logger.error(f"Could not spill {len(rows)} telemetry rows for {table}; they are lost: {e}")
+
+    def replay_spill(self):
+        """Re-insert spilled rows; failures are spilled again until max_replays."""
+        replay_path = self.spill_path + ".replaying"
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path):
+                return
+            os.replace(self.spill_path, replay_path)
+        pending: dict[tuple[str, int], list[dict]] = {}
+        with open(replay_path, encoding="utf-8") as spill:
+            for line in spill:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = (entry["table"], entry.get("replays", 0) + 1)
+                pending.setdefault(key, []).append(entry["row"])
+        os.remove(replay_path)
+        for (table, replays), rows in pending.items():
+            for start in range(0, len(rows), self.replay_batch_rows):
+                batch = rows[start : start + self.replay_batch_rows]
+                if self._write_sync(table, batch, replays):
+                    self._stats["replayed"] += len(batch)
+        logger.info(f"Replayed {sum(map(len, pending.values()))} spilled telemetry rows.")
+
+    def close(self):
+        """Stop the flusher and write remaining rows synchronously. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        for table, rows in self._drain().items():
+            self._write_sync(table, rows)
+
+    def metrics(self) -> dict[str, Any]:
+        """Rows enqueued, written, spilled, replayed, rejected and dropped, plus rows still buffered."""
+        with self._lock:
+            buffered = sum(len(rows) for rows in self._buffers.values())
+        return {**self._stats, "buffered": buffered}
@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DISK_PRUNE_INTERVAL = 500
+
+FRAMEWORK_CACHE_TTLS = {
+    "cvss": 24 * 3600,
+    "epss": 24 * 3600,
+    "lev": 24 * 3600,
+    "ms_ei": 30 * 24 * 3600,
+    "kev": 24 * 3600,
+}
+
+ORG_CONTEXT_TTLS = {
+    "organization": 300,
+    "memberships": 120,
+    "user_profile": 300,
+    "white_label": 600,
+    "credits": 30,
+}
+
+API_KEY_CACHE_TTLS = {
+    "api_key": 300,
+    "api_key_invalid": 30,
+}
+
+
+class TTLLRUCache:
+    """Process-wide cache with per-source TTLs, LRU eviction and hit/miss metrics.
+
+    Entries are keyed by (source, key). When disk_path is set, entries are also
+    written to a SQLite file so they survive restarts and are shared by worker
+    processes on the same host; the in-memory layer is checked first.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+        ttls: Optional[dict[str, float]] = None,
+        disk_path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._source_stats: dict[str, dict[str, int]] = {}
+        self._disk = None
+        self._disk_writes = 0
+        if disk_path:
+            try:
+                self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+                self._disk.execute(
+                    "CREATE TABLE IF NOT EXISTS cache (source TEXT, key TEXT, value TEXT, expires_at REAL, PRIMARY KEY (source, key))"
+                )
+                self._disk.commit()
+            except Exception as e:
+                logging.exception(f"Failed to open disk cache at {disk_path}: {e}")
+                self._disk = None
+
+    def _record(self, source: str, outcome: str):
+        self._stats[outcome] += 1
+        stats = self._source_stats.setdefault(source, {"hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+    def _store(self, entry_key: tuple[str, str], expires_at: float, value: Any):
+        self._entries[entry_key] = (expires_at, value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_get(self, source: str, key: str) -> Optional[tuple[float, Any]]:
+        try:
+            row = self._disk.execute(
+                "SELECT expires_at, value FROM cache WHERE source = ? AND key = ?",
+                (source, key),
+            ).fetchone()
+        except Exception as e:
+            logging.exception(f"Disk cache read failed for {source}:{key}: {e}")
+            return None
+        if row is None or row[0] <= time.time():
+            return None
+        return row[0], json.loads(row[1])
+
+    def _disk_set(self, source: str, key: str, expires_at: float, value: Any):
+        try:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO cache (source, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (source, key, json.dumps(value, default=str), expires_at),
+            )
+            self._disk_writes += 1
+            if self._disk_writes % DISK_PRUNE_INTERVAL == 0:
+                self._disk.execute(
+                    "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+                )
+            self._disk.commit()
+        except Exception as e:
+            logging.exception(f"Disk cache write failed for {source}:{key}: {e}")
+
+    def get(self, source: str, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or None on a miss or expiry."""
+        entry_key = (source, key)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(entry_key)
+                    self._record(source, "hits")
+                    return entry[1]
+                del self._entries[entry_key]
+                self._stats["expirations"] += 1
+            if self._disk is not None:
+                disk_entry = self._disk_get(source, key)
+                if disk_entry is not None:
+                    self._store(entry_key, *disk_entry)
+                    self._record(source, "hits")
+                    return disk_entry[1]
+            self._record(source, "misses")
+            return None
+
+    def set(self, source: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Cache a value using the source's TTL unless one is given."""
+        expires_at = time.time() + (
+            ttl if ttl is not None else self.ttls.get(source, self.default_ttl)
+        )
+        with self._lock:
+            self._store((source, key), expires_at, value)
+            if self._disk is not None:
+                self._disk_set(source, key, expires_at, value)
+
+    def invalidate(self, source: str, key: str):
+        """Drop one entry from memory and disk."""
+        with self._lock:
+            self._entries.pop((source, key), None)
+            if self._disk is not None:
+                try:
+                    self._disk.execute(
+                        "DELETE FROM cache WHERE source = ? AND key = ?", (source, key)
+                    )
+                    self._disk.commit()
+                except Exception as e:
+                    logging.exception(f"Disk cache delete failed for {source}:{key}: {e}")
+
+    def invalidate_source(self, source: str):
+        """Drop every in-memory entry for a source, e.g. when a shared row changes."""
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == source]:
+                del self._entries[entry_key]
+            if self._disk is not None:
+                try:
+                    self._disk.execute("DELETE FROM cache WHERE source = ?", (source,))
+                    self._disk.commit()
+                except Exception as e:
+                    logging.exception(f"Disk cache delete failed for {source}: {e}")
+
+    def metrics(self) -> dict[str, Any]:
+        """Snapshot of size, hit rate and per-source hit/miss counts and sizes."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            sizes: dict[str, int] = {}
+            for source, _ in self._entries:
+                sizes[source] = sizes.get(source, 0) + 1
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "sources": {
+                    k: {**v, "size": sizes.get(k, 0)}
+                    for k, v in self._source_stats.items()
+                },
+            }
+
+
+framework_cache = TTLLRUCache(
+    max_entries=int(os.getenv("FRAMEWORK_CACHE_MAX_ENTRIES", "20000")),
+    ttls=FRAMEWORK_CACHE_TTLS,
+    disk_path=os.getenv("FRAMEWORK_CACHE_PATH"),
+)
+
+# Tenant context is per-process only: it is small, changes on explicit writes
+# that invalidate it, and should never be shared through a disk file.
+org_context_cache = TTLLRUCache(
+    max_entries=int(os.getenv("ORG_CONTEXT_CACHE_MAX_ENTRIES", "5000")),
+    ttls=ORG_CONTEXT_TTLS,
+)
+
+# Verified API keys, keyed by key hash (never the raw key). Memory-only so a
+# revoked key cannot be revived from disk.
+api_key_cache = TTLLRUCache(
+    max_entries=int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", "10000")),
+    ttls=API_KEY_CACHE_TTLS,
+)
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+UsageKey = tuple[str, Optional[int], str, str, int, int]
+
+
+class UsageMeter:
+    """In-memory public API usage counters, flushed as aggregated api_usage_log rows.
+
+    record() only bumps a counter for (organization, key, endpoint, method,
+    status, bucket) under a lock. flush() hands every closed bucket to the
+    telemetry writer as one row carrying request_count, total and max
+    response time, so a busy key costs one row per endpoint and status per
+    bucket instead of one write per request. close() flushes the open bucket
+    too, for shutdown hooks.
+    """
+
+    def __init__(self, writer, table: str = "api_usage_log", bucket_seconds: int = 60):
+        self.writer = writer
+        self.table = table
+        self.bucket_seconds = bucket_seconds
+        self._counters: dict[UsageKey, list[int]] = {}
+        self._lock = threading.Lock()
+        self._open_bucket = 0
+        self._stats = {"requests": 0, "rows_flushed": 0, "flushes": 0}
+
+    def record(
+        self,
+        organization_id: str,
+        api_key_id: Optional[int],
+        endpoint: str,
+        http_method: str,
+        status_code: int,
+        response_time_ms: int,
+        now: Optional[float] = None,
+    ):
+        """Count one request; closed buckets are flushed when a new one opens."""
+        now = time.time() if now is None else now
+        bucket = int(now - now % self.bucket_seconds)
+        key = (organization_id, api_key_id, endpoint, http_method, status_code, bucket)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = [0, 0, 0]
+            counter[0] += 1
+            counter[1] += response_time_ms
+            counter[2] = max(counter[2], response_time_ms)
+            self._stats["requests"] += 1
+            rolled = bucket > self._open_bucket
+            self._open_bucket = max(self._open_bucket, bucket)
+        if rolled:
+            self.flush(now=now)
+
+    def _drain(self, before: Optional[int]) -> dict[UsageKey, list[int]]:
+        with self._lock:
+            if before is None:
+                drained, self._counters = self._counters, {}
+            else:
+                drained = {k: v for k, v in self._counters.items() if k[5] < before}
+                for k in drained:
+                    del self._counters[k]
+        return drained
+
+    def flush(self, force: bool = False, now: Optional[float] = None) -> int:
+        """Queue one api_usage_log row per counter in a closed bucket (every bucket if force)."""
+        now = time.time() if now is None else now
+        drained = self._drain(None if force else int(now - now % self.bucket_seconds))
+        for (org_id, api_key_id, endpoint, method, status_code, bucket), (count, total_ms, max_ms) in drained.items():
+            self.writer.enqueue(
+                self.table,
+                {
+                    "organization_id": org_id,
+                    "api_key_id": api_key_id,
+                    "endpoint": endpoint,
+                    "http_method": method,
+                    "status_code": status_code,
+                    "request_count": count,
+                    "response_time_ms": round(total_ms / count),
+                    "total_response_time_ms": total_ms,
+                    "max_response_time_ms": max_ms,
+                    "timestamp": datetime.fromtimestamp(bucket, timezone.utc).isoformat(),
+                },
+            )
+        if drained:
+            self._stats["flushes"] += 1
+            self._stats["rows_flushed"] += len(drained)
+        return len(drained)
+
+    def close(self):
+        """Flush every counter, including the open bucket. Safe to call twice."""
+        try:
+            self.flush(force=True)
+        except Exception as e:
+            logger.exception(f"Final API usage flush failed: {e}")
+
+    def metrics(self) -> dict[str, Any]:
+        """Requests metered, rows flushed and counters still held in memory."""
+        with self._lock:
+            pending = len(self._counters)
+        return {**self._stats, "pending_rows": pending}
@@ -0,0 +1,139 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.utils import dataset_aggregates
+from app.utils.dataset_store import DatasetStore
+
+SCOPE = "session:test"
+
+
+def _unenriched(n: int) -> list[dict]:
+    vendors = ["Microsoft", "N/A", "Apple"]
+    return [
+        {
+            "CVE ID": f"CVE-2024-{i:04}",
+            "Vendor": vendors[i % 3],
+            "Product Description": "linux kernel" if i % 3 == 1 else "nginx server",
+        }
+        for i in range(n)
+    ]
+
+
+def _gaps(n: int) -> list[dict]:
+    published = datetime(2024, 6, 30)
+    return [
+        {
+            "cve_id": f"CVE-2024-{i:04}",
+            "published_date": (published - timedelta(days=i * 7)).isoformat(),
+            "time_gap_days": i,
+            "cvss_gap_score": i % 11,
+            "cpe_gap_score": (i * 3) % 11,
+        }
+        for i in range(n)
+    ]
+
+
+def _risk_cves(n: int) -> list[dict]:
+    return [{"cve_id": f"CVE-2024-{i:04}", "universal_risk_score": i % 100} for i in range(n)]
+
+
+# (state var, stored dataset name, rows, builder patched to count builds, read through the state's reader)
+AGGREGATES = [
+    ("cves_by_vendor", "unenriched_cves", _unenriched, "_top_vendors", lambda h, s: dataset_aggregates.cves_by_vendor(h, s)),
+    (
+        "my_stack_gaps_count",
+        "unenriched_cves",
+        _unenriched,
+        "_count_stack_gaps",
+        lambda h, s: dataset_aggregates.stack_gaps_count(h, ["Linux", "NGINX"], s),
+    ),
+    ("score_distribution", "risk_intelligence_cves", _risk_cves, "_risk_score_distribution", lambda h, s: dataset_aggregates.risk_score_distribution(h, s)),
+    ("worst_offenders", "gap_analysis_gaps", _gaps, "_worst_offenders", lambda h, s: dataset_aggregates.worst_offenders(h, s)),
+    ("avg_enrichment_time", "gap_analysis_view", _gaps, "_avg_enrichment_time", lambda h, s: dataset_aggregates.avg_enrichment_time(h, s)),
+    (
+        "cvss_gap_distribution",
+        "gap_analysis_view",
+        _gaps,
+        "_gap_score_distribution",
+        lambda h, s: dataset_aggregates.gap_score_distribution(h, "cvss_gap_score", s),
+    ),
+    ("monthly_backlog_growth", "gap_analysis_gaps", _gaps, "_monthly_backlog_growth", lambda h, s: dataset_aggregates.monthly_backlog_growth(h, s)),
+]
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    counts = Counter()
+
+    def patch(builder_name):
+        builder = getattr(dataset_aggregates, builder_name)
+
+        def counting(rows, *args):
+            # Readers also build their empty default eagerly; only scans of stored rows count.
+            if rows:
+                counts[builder_name] += 1
+            return builder(rows, *args)
+
+        monkeypatch.setattr(dataset_aggregates, builder_name, counting)
+
+    counts.patch = patch
+    return counts
+
+
+@pytest.mark.parametrize("var, name, rows, builder, read", AGGREGATES, ids=[a[0] for a in AGGREGATES])
+def test_unrelated_changes_do_not_rebuild(builds, var, name, rows, builder, read):
+    store = DatasetStore()
+    builds.patch(builder)
+    handle = store.put(SCOPE, name, rows(300))
+    first = read(handle, store)
+    # An unrelated event re-reads the var with the handle unchanged, possibly
+    # after another dataset in the same session was replaced.
+    for i in range(3):
+        store.put(SCOPE, "unrelated_dataset", rows(i + 1))
+        assert read(handle, store) == first
+    assert builds[builder] == 1
+
+
+@pytest.mark.parametrize("var, name, rows, builder, read", AGGREGATES, ids=[a[0] for a in AGGREGATES])
+def test_new_put_rebuilds_once(builds, var, name, rows, builder, read):
+    store = DatasetStore()
+    builds.patch(builder)
+    read(store.put(SCOPE, name, rows(300)), store)
+    handle = store.put(SCOPE, name, rows(30))
+    fresh = read(handle, store)
+    read(handle, store)
+    assert builds[builder] == 2
+    assert fresh == read(store.put("session:other", name, rows(30)), store)
+
+
+@pytest.mark.parametrize("var, name, rows, builder, read", AGGREGATES, ids=[a[0] for a in AGGREGATES])
+def test_missing_dataset_returns_default_without_building(builds, var, name, rows, builder, read):
+    store = DatasetStore()
+    builds.patch(builder)
+    handle = store.put(SCOPE, name, rows(10))
+    store.drop_scope(SCOPE)
+    assert read(handle, store) == read("", store)
+    assert builds[builder] == 0
+
+
+def test_aggregate_values():
+    store = DatasetStore()
+    unenriched = store.put(SCOPE, "unenriched_cves", _unenriched(300))
+    assert dataset_aggregates.cves_by_vendor(unenriched, store) == [
+        {"name": "Microsoft", "count": 100},
+        {"name": "Linux", "count": 100},
+        {"name": "Apple", "count": 100},
+    ]
+    assert dataset_aggregates.stack_gaps_count(unenriched, ["Linux"], store) == 100
+    assert dataset_aggregates.stack_gaps_count(unenriched, ["Linux", "nginx"], store) == 300
+
+    gaps = store.put(SCOPE, "gap_analysis_gaps", _gaps(100))
+    assert dataset_aggregates.avg_enrichment_time(gaps, store) == 50
+    assert [g["time_gap_days"] for g in dataset_aggregates.worst_offenders(gaps, store)] == [99, 98, 97, 96, 95]
+    assert sum(b["count"] for b in dataset_aggregates.gap_score_distribution(gaps, "cpe_gap_score", store)) == 100
+    assert len(dataset_aggregates.monthly_backlog_growth(gaps, store)) == 12
+
+    cves = store.put(SCOPE, "risk_intelligence_cves", _risk_cves(200))
+    assert all(b["count"] == 20 for b in dataset_aggregates.risk_score_distribution(cves, store)[:10])
@@ -0,0 +1,28 @@
+from app.services.risk_scoring_benchmark import mismatches, random_portfolio, random_weights
+from app.services.risk_scoring_engine import portfolio_risk_scorer, universal_score
+
+DEFAULT_WEIGHTS = {"cvss": 0.4, "epss": 0.3, "kev": 0.2, "ssvc": 0.1, "lev": 0.0}
+
+
+def test_batch_matches_scalar_with_default_weights():
+    assert mismatches(random_portfolio(20000), DEFAULT_WEIGHTS) == 0
+
+
+def test_batch_matches_scalar_with_adjusted_weights():
+    for seed in range(1, 6):
+        assert mismatches(random_portfolio(5000, seed), random_weights(seed)) == 0
+
+
+def test_edge_cases_match_scalar():
+    portfolio = [
+        {"cve_id": "CVE-A"},
+        {"cve_id": "CVE-B", "cvss_score": 10.0, "epss_score": 1.0, "is_kev": True, "decision": "Act", "lev_score": 1.0},
+        {"cve_id": "CVE-C", "cvss_score": 7.0, "epss_score": 0.0199, "decision": "Unknown"},
+        {"cve_id": "CVE-D", "cvss_score": 4.9, "epss_score": 0.5001, "is_kev": True},
+        {"cve_id": "CVE-E", "cvss_score": 0.0, "epss_score": None, "percentile": None},
+    ]
+    weights = {"cvss": 0.5, "epss": 0.5, "kev": 0.0, "ssvc": 0.5, "lev": 0.5}
+    batch = portfolio_risk_scorer.to_results(portfolio_risk_scorer.score_records(portfolio, weights))
+    assert batch == [universal_score(record, weights) for record in portfolio]
+    assert batch[1]["universal_risk_score"] == 100
+    assert batch[3]["conflict_flags"] == ["Low CVSS, High EPSS", "KEV with non-High CVSS"]